@@ -10,3 +10,8 @@ class WagtailBlocksConfig(AppConfig):
     name = "wagtail_blocks"
     label = "wagtail_tw_blocks"
     default_auto_field = "django.db.models.BigAutoField"
+
+    def ready(self) -> None:
+        from wagtail_blocks.signal_handlers import register_signal_handlers
+
+        register_signal_handlers()
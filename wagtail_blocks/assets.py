@@ -0,0 +1,242 @@
+"""Page-level registry of the scripts and styles used by blocks and components"""
+
+import functools
+from typing import Any, Dict, Iterable, List, Literal, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.utils.html import format_html_join
+from django.utils.safestring import SafeString, mark_safe
+
+from wagtail_blocks import streams
+
+REGISTRY_ATTR = "_wagtail_blocks_assets"
+
+# Set on a request to collect its assets regardless of `WAGTAIL_BLOCKS_ASSETS`
+COLLECT_ATTR = "_wagtail_blocks_collect_assets"
+
+
+class Asset(NamedTuple):
+    """A script or a style, or only connection hints"""
+
+    template: Optional[str]
+    position: Literal["head", "body"] = "body"
+    origins: Tuple[str, ...] = ()
+
+
+ASSETS: Dict[str, Asset] = {
+    "codepen": Asset(
+        "wagtail/assets/codepen.html",
+        origins=("https://public.codepenassets.com", "https://codepen.io"),
+    ),
+    "codepen-style": Asset("wagtail/assets/codepen_style.html", position="head"),
+    "codesandbox": Asset(None, origins=("https://codesandbox.io",)),
+    "facade": Asset("wagtail/assets/facade.html"),
+    "form": Asset("wagtail/assets/form.html"),
+    "snack": Asset("wagtail/assets/snack.html", origins=("https://snack.expo.dev",)),
+    "stackblitz": Asset(None, origins=("https://stackblitz.com",)),
+}
+
+
+def is_collected(context: Optional[Dict[str, Any]] = None) -> bool:
+    """
+    Whether assets are collected and rendered by `render_assets` tag.
+
+    Args:
+        context (dict | None): Template context.
+
+    Returns:
+        bool: `True` if `WAGTAIL_BLOCKS_ASSETS` setting is `"collect"`,
+        or if the request of the context collects its assets.
+    """
+
+    request = (context or {}).get("request")
+    if getattr(request, COLLECT_ATTR, False):
+        return True
+
+    return getattr(settings, "WAGTAIL_BLOCKS_ASSETS", "inline") == "collect"
+
+
+def get_registry(context: Optional[Dict[str, Any]]) -> Optional[Dict[str, bool]]:
+    """
+    Get the assets used while rendering the current page.
+
+    The registry is stored on the request, so it is shared by every block
+    rendered in the same request regardless of how the context is copied.
+
+    Args:
+        context (dict | None): Template context.
+
+    Returns:
+        dict[str, bool] | None: Whether each used asset was rendered,
+        or `None` if there is no request in the context.
+    """
+
+    request = (context or {}).get("request")
+    if request is None:
+        return None
+
+    registry = getattr(request, REGISTRY_ATTR, None)
+    if registry is None:
+        registry = {}
+        setattr(request, REGISTRY_ATTR, registry)
+
+    return registry
+
+
+@functools.lru_cache(maxsize=None)
+def render_asset(name: str) -> SafeString:
+    """
+    Render an asset, once per process.
+
+    Args:
+        name (str): Asset name.
+
+    Returns:
+        SafeString: HTML, empty for assets made of connection hints only.
+    """
+
+    asset = ASSETS[name]
+    return mark_safe(render_to_string(asset.template) if asset.template else "")
+
+
+def render(names: Iterable[str]) -> SafeString:
+    """
+    Render assets, without registering them.
+
+    Args:
+        names (Iterable[str]): Asset names.
+
+    Returns:
+        SafeString: HTML.
+    """
+
+    return mark_safe("".join(render_asset(name) for name in names))
+
+
+def use(context: Optional[Dict[str, Any]], names: Iterable[str]) -> SafeString:
+    """
+    Register assets used by a block or a component.
+
+    When assets are collected, they are rendered by `render_assets` tag.
+    Otherwise, they are rendered inline the first time they are used in a page.
+
+    Args:
+        context (dict | None): Template context.
+        names (Iterable[str]): Asset names.
+
+    Returns:
+        SafeString: HTML to render in place.
+    """
+
+    registry = get_registry(context)
+    if registry is None:
+        return render(names)
+
+    pending = []
+    for name in names:
+        if name not in registry:
+            registry[name] = False
+            pending.append(name)
+
+    if is_collected(context):
+        return mark_safe("")
+
+    for name in pending:
+        registry[name] = True
+
+    return render(pending)
+
+
+def render_pending(
+    context: Optional[Dict[str, Any]],
+    position: Optional[str] = None,
+) -> SafeString:
+    """
+    Render the registered assets that were not rendered yet.
+
+    Args:
+        context (dict | None): Template context.
+        position (str | None): Only render `"head"` or `"body"` assets.
+
+    Returns:
+        SafeString: HTML.
+    """
+
+    registry = get_registry(context) or {}
+    pending = [
+        name
+        for name, rendered in registry.items()
+        if not rendered and (position is None or ASSETS[name].position == position)
+    ]
+
+    for name in pending:
+        registry[name] = True
+
+    return render(pending)
+
+
+def get_stream_assets(stream_value: Any) -> List[str]:
+    """
+    Get the assets used by the blocks of a stream.
+
+    Args:
+        stream_value (StreamValue): Stream value.
+
+    Returns:
+        list[str]: Asset names, in order of first use.
+    """
+
+    names: Dict[str, None] = {}
+    for node in streams.walk_stream(stream_value):
+        if isinstance(node.block, AssetMixin):
+            names.update(dict.fromkeys(node.block.get_assets(node.value)))
+
+    return list(names)
+
+
+def render_hints(names: Iterable[str]) -> SafeString:
+    """
+    Render `preconnect` hints for the origins of some assets.
+
+    Args:
+        names (Iterable[str]): Asset names.
+
+    Returns:
+        SafeString: HTML.
+    """
+
+    origins = dict.fromkeys(origin for name in names for origin in ASSETS[name].origins)
+    return format_html_join(
+        "", '<link rel="preconnect" href="{}" crossorigin />', ((o,) for o in origins)
+    )
+
+
+class AssetMixin:
+    """
+    A mixin for blocks using scripts or styles, listed in `assets` `Meta` option.
+
+    Assets are registered every time the block is rendered,
+    even when its HTML comes from the fragment cache.
+    """
+
+    meta: Any
+
+    def get_assets(self, value: Any) -> List[str]:
+        """
+        Get the assets used to render a value.
+
+        Args:
+            value (Any): Block value.
+
+        Returns:
+            list[str]: Asset names.
+        """
+
+        return list(getattr(self.meta, "assets", []))
+
+    def render(
+        self, value: Any, context: Optional[Dict[str, Any]] = None
+    ) -> SafeString:
+        html = super().render(value, context=context)  # type: ignore
+        return mark_safe(html + use(context, self.get_assets(value)))
@@ -0,0 +1,470 @@
+"""Synthetic StreamFields and measurements used by `benchmark_blocks` command"""
+
+import io
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple
+
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+from wagtail import blocks as wagtail_blocks
+from wagtail.documents import get_document_model
+from wagtail.embeds.finders.base import EmbedFinder
+from wagtail.images import get_image_model
+
+from wagtail_blocks import blocks, constants
+
+# Lines of code repeated to build large code blocks
+CODE_SAMPLE = {
+    "python": 'def greet(name: str) -> str:\n    return f"Hello, {name}!"\n',
+    "javascript": "const greet = (name) => {\n  return `Hello, ${name}!`;\n};\n",
+    "css": ".greeting {\n  color: oklch(70% 0.2 250);\n}\n",
+    "bash": 'greet() {\n  echo "Hello, $1!"\n}\n',
+}
+
+# Number of images in a full `HoverGalleryBlock`
+GALLERY_SIZE = 10
+
+# Embed URLs answered by `SlowEmbedFinder`
+SLOW_EMBED_URL = "https://slow-embeds.example.com/"
+
+
+class Fixtures(NamedTuple):
+    """Images and documents referenced by synthetic blocks"""
+
+    images: List[Any]
+    documents: List[Any]
+
+
+class Result(NamedTuple):
+    """Measurements of a scenario"""
+
+    time_ms: float
+    queries: int
+    peak_kb: float
+    bytes: int
+
+
+class SlowEmbedFinder(EmbedFinder):
+    """An embed finder answering after a delay, like a slow oEmbed provider"""
+
+    def __init__(self, delay: float = 0.2, **options: Any) -> None:
+        self.delay = delay
+
+    def accept(self, url: str) -> bool:
+        return url.startswith(SLOW_EMBED_URL)
+
+    def find_embed(self, url: str, max_width=None, max_height=None) -> Dict[str, Any]:
+        time.sleep(self.delay)
+
+        return {
+            "title": url,
+            "author_name": "benchmark",
+            "provider_name": "Slow embeds",
+            "type": "video",
+            "thumbnail_url": "",
+            "width": 640,
+            "height": 360,
+            "html": f'<iframe src="{url}" width="640" height="360"></iframe>',
+        }
+
+
+def get_stream_block() -> wagtail_blocks.StreamBlock:
+    """
+    Get a stream block with every block of `blocks.py`.
+
+    Returns:
+        StreamBlock: Stream block.
+    """
+
+    return wagtail_blocks.StreamBlock(
+        [
+            ("accordion", blocks.AccordionBlock()),
+            ("alert", blocks.AlertBlock()),
+            ("carousel", blocks.CarouselBlock()),
+            ("code", blocks.CodeBlock()),
+            ("diff", blocks.DiffBlock()),
+            ("document", blocks.DocumentBlock()),
+            ("hover_gallery", blocks.HoverGalleryBlock()),
+            ("tabs", blocks.TabsBlock()),
+            ("code_pen", blocks.CodePenBlock()),
+            ("code_sandbox", blocks.CodeSandboxBlock()),
+            ("stack_blitz", blocks.StackBlitzBlock()),
+            ("expo_snack", blocks.ExpoSnackBlock()),
+        ]
+    )
+
+
+def create_fixtures(count: int) -> Fixtures:
+    """
+    Create images and documents, to be deleted by `delete_fixtures`.
+
+    Args:
+        count (int): Number of images and documents.
+
+    Returns:
+        Fixtures: Created images and documents.
+    """
+
+    image_model = get_image_model()
+    document_model = get_document_model()
+
+    images = []
+    for i in range(count):
+        buffer = io.BytesIO()
+        Image.new("RGB", (1600, 900), (i * 20 % 256, 96, 160)).save(buffer, "PNG")
+        images.append(
+            image_model.objects.create(
+                title=f"Benchmark image {i}",
+                file=ContentFile(buffer.getvalue(), name=f"benchmark-{i}.png"),
+            )
+        )
+
+    documents = [
+        document_model.objects.create(
+            title=f"Benchmark document {i}",
+            file=ContentFile(b"%PDF-1.4\n" * 1024, name=f"benchmark-{i}.pdf"),
+        )
+        for i in range(count)
+    ]
+
+    return Fixtures(images, documents)
+
+
+def delete_fixtures(fixtures: Fixtures) -> None:
+    """
+    Delete the files of fixtures and of their renditions, which are not rolled back.
+
+    Args:
+        fixtures (Fixtures): Images and documents.
+    """
+
+    for image in fixtures.images:
+        for rendition in image.renditions.all():
+            rendition.file.delete(save=False)
+
+        image.file.delete(save=False)
+
+    for document in fixtures.documents:
+        document.file.delete(save=False)
+
+
+def image_value(fixtures: Fixtures, index: int) -> Dict[str, Any]:
+    """
+    Build the raw value of an `ImageBlock`.
+
+    Args:
+        fixtures (Fixtures): Images and documents.
+        index (int): Image index, wrapped around.
+
+    Returns:
+        dict: Raw value.
+    """
+
+    image = fixtures.images[index % len(fixtures.images)]
+    return {"image": image.pk, "alt_text": image.title, "decorative": False}
+
+
+def code_value(language: str, lines: int) -> Dict[str, Any]:
+    """
+    Build the raw value of a `CodeBlock`.
+
+    Args:
+        language (str): Language, one of `CODE_SAMPLE`.
+        lines (int): Approximate number of lines.
+
+    Returns:
+        dict: Raw value.
+    """
+
+    sample = CODE_SAMPLE[language]
+    return {"language": language, "code": sample * max(1, lines // sample.count("\n"))}
+
+
+def alert_value(index: int) -> Dict[str, Any]:
+    """
+    Build the raw value of an `AlertBlock`, cycling through levels and styles.
+
+    Args:
+        index (int): Alert index.
+
+    Returns:
+        dict: Raw value.
+    """
+
+    return {
+        "level": constants.ALERT_LEVELS[index % len(constants.ALERT_LEVELS)][0],
+        "style": constants.ALERT_STYLES[index % len(constants.ALERT_STYLES)][0],
+        "message": f"<p>Alert <b>{index}</b>, with <a href='#'>a link</a>.</p>",
+    }
+
+
+def ide_value(index: int) -> Dict[str, Any]:
+    """
+    Build the common raw value of IDE blocks.
+
+    Args:
+        index (int): Block index.
+
+    Returns:
+        dict: Raw value.
+    """
+
+    return {
+        "title": f"Project {index}",
+        "url": f"https://example.com/projects/{index}",
+        "slug_hash": f"pen{index}",
+        "user": "benchmark",
+        "id": f"@benchmark/project-{index}",
+        "name": f"Project {index}",
+        "code": CODE_SAMPLE["javascript"],
+    }
+
+
+def build_accordion(fixtures: Fixtures, size: int) -> List[Dict[str, Any]]:
+    """One accordion with `size` items"""
+
+    items = [
+        {"title": f"Question {i}", "content": f"<p>Answer <i>{i}</i>.</p>"}
+        for i in range(size)
+    ]
+    return [{"type": "accordion", "value": {"style": "plus", "items": items}}]
+
+
+def build_alert(fixtures: Fixtures, size: int) -> List[Dict[str, Any]]:
+    """`size` alerts"""
+
+    return [{"type": "alert", "value": alert_value(i)} for i in range(size)]
+
+
+def build_carousel(fixtures: Fixtures, size: int) -> List[Dict[str, Any]]:
+    """One carousel with `size` images"""
+
+    items = [image_value(fixtures, i) for i in range(size)]
+    return [{"type": "carousel", "value": {"items": items}}]
+
+
+def build_code(fixtures: Fixtures, size: int) -> List[Dict[str, Any]]:
+    """One code block of `size * 10` lines per language"""
+
+    return [
+        {"type": "code", "value": code_value(language, size * 10)}
+        for language in CODE_SAMPLE
+    ]
+
+
+def build_diff(fixtures: Fixtures, size: int) -> List[Dict[str, Any]]:
+    """`size` diffs"""
+
+    return [
+        {
+            "type": "diff",
+            "value": {
+                "item_1": image_value(fixtures, i),
+                "item_2": image_value(fixtures, i + 1),
+            },
+        }
+        for i in range(size)
+    ]
+
+
+def build_document(fixtures: Fixtures, size: int) -> List[Dict[str, Any]]:
+    """`size` documents"""
+
+    return [
+        {
+            "type": "document",
+            "value": {"document": fixtures.documents[i % len(fixtures.documents)].pk},
+        }
+        for i in range(size)
+    ]
+
+
+def build_hover_gallery(fixtures: Fixtures, size: int) -> List[Dict[str, Any]]:
+    """`size` full galleries"""
+
+    return [
+        {
+            "type": "hover_gallery",
+            "value": {
+                "items": [image_value(fixtures, i + j) for j in range(GALLERY_SIZE)]
+            },
+        }
+        for i in range(size)
+    ]
+
+
+def build_tabs(fixtures: Fixtures, size: int) -> List[Dict[str, Any]]:
+    """One tabs block with `size` tabs, each with a nested stream of every kind"""
+
+    items = [
+        {
+            "title": f"Tab {i}",
+            "content": [
+                {"type": "text", "value": f"<p>Tab <b>{i}</b> content.</p>"},
+                {"type": "alert", "value": alert_value(i)},
+                {"type": "code", "value": code_value("python", 20)},
+                {"type": "image", "value": image_value(fixtures, i)},
+            ],
+        }
+        for i in range(size)
+    ]
+    return [{"type": "tabs", "value": {"style": "lift", "items": items}}]
+
+
+def build_embeds(size: int) -> List[Dict[str, Any]]:
+    """
+    Build one tabs block with `size` tabs, each with an embed answered by `SlowEmbedFinder`.
+
+    Args:
+        size (int): Number of tabs and embeds.
+
+    Returns:
+        list[dict]: Raw stream data.
+    """
+
+    items = [
+        {
+            "title": f"Video {i}",
+            "content": [
+                {"type": "video", "value": f"{SLOW_EMBED_URL}{i}"},
+                {"type": "alert", "value": alert_value(i)},
+            ],
+        }
+        for i in range(size)
+    ]
+    return [{"type": "tabs", "value": {"style": "lift", "items": items}}]
+
+
+def build_ide(block_type: str) -> Callable[[Fixtures, int], List[Dict[str, Any]]]:
+    """
+    Get the builder of `size` IDE blocks of a type.
+
+    Args:
+        block_type (str): Stream block type.
+
+    Returns:
+        Callable: Builder.
+    """
+
+    def build(fixtures: Fixtures, size: int) -> List[Dict[str, Any]]:
+        return [{"type": block_type, "value": ide_value(i)} for i in range(size)]
+
+    build.__doc__ = f"`size` {block_type} blocks"
+    return build
+
+
+BLOCK_SCENARIOS: Dict[str, Callable[[Fixtures, int], List[Dict[str, Any]]]] = {
+    "accordion": build_accordion,
+    "alert": build_alert,
+    "carousel": build_carousel,
+    "code": build_code,
+    "diff": build_diff,
+    "document": build_document,
+    "hover_gallery": build_hover_gallery,
+    "tabs": build_tabs,
+    "code_pen": build_ide("code_pen"),
+    "code_sandbox": build_ide("code_sandbox"),
+    "stack_blitz": build_ide("stack_blitz"),
+    "expo_snack": build_ide("expo_snack"),
+}
+
+
+def build_mixed(fixtures: Fixtures, size: int) -> List[Dict[str, Any]]:
+    """Every block scenario, in a single stream"""
+
+    return [
+        data for build in BLOCK_SCENARIOS.values() for data in build(fixtures, size)
+    ]
+
+
+SCENARIOS = {**BLOCK_SCENARIOS, "mixed": build_mixed}
+
+
+def assign_ids(
+    stream_block: wagtail_blocks.StreamBlock, data: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Assign ids to every stream child and list item, so renders are reproducible.
+
+    Ids are used to build input names and cache keys, they are random otherwise.
+
+    Args:
+        stream_block (StreamBlock): Stream block.
+        data (list[dict]): Raw stream data.
+
+    Returns:
+        list[dict]: Raw stream data with ids.
+    """
+
+    value = stream_block.to_python(data)
+
+    # Children are converted lazily, unconverted ones are prepared from raw data
+    list(value)
+
+    return stream_block.get_prep_value(value)
+
+
+def render(stream_block: wagtail_blocks.StreamBlock, data: List[Dict[str, Any]]) -> str:
+    """
+    Render raw stream data, as a page would.
+
+    Args:
+        stream_block (StreamBlock): Stream block.
+        data (list[dict]): Raw stream data.
+
+    Returns:
+        str: HTML.
+    """
+
+    value = stream_block.to_python(data)
+    return stream_block.render(value, context={"request": RequestFactory().get("/")})
+
+
+def measure(
+    stream_block: wagtail_blocks.StreamBlock,
+    data: List[Dict[str, Any]],
+    repeat: int,
+) -> Result:
+    """
+    Measure the rendering of raw stream data.
+
+    A first render warms up template loaders and creates missing renditions.
+    Time is the median of `repeat` renders, including value loading.
+    Peak memory is measured by an extra render, as tracing slows rendering down.
+
+    Args:
+        stream_block (StreamBlock): Stream block.
+        data (list[dict]): Raw stream data.
+        repeat (int): Number of timed renders.
+
+    Returns:
+        Result: Measurements.
+    """
+
+    render(stream_block, data)
+
+    timings = []
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            html = render(stream_block, data)
+            timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        render(stream_block, data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Result(
+        time_ms=round(statistics.median(timings) * 1000, 3),
+        queries=len(queries),
+        peak_kb=round(peak / 1024, 1),
+        bytes=len(html.encode()),
+    )
@@ -1,5 +1,7 @@
 """Block definitions"""
 
+from typing import Any, Optional
+
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.utils.translation import gettext_lazy as _
 from wagtail import blocks
@@ -7,7 +9,18 @@ from wagtail.documents.blocks import DocumentChooserBlock
 from wagtail.embeds.blocks import EmbedBlock
 from wagtail.images.blocks import ImageBlock
 
-from wagtail_blocks import constants, values
+from wagtail_blocks import (
+    assets,
+    cache,
+    compiled,
+    constants,
+    embeds,
+    highlight,
+    images,
+    instrumentation,
+    search,
+    values,
+)
 
 
 class AccordionItem(blocks.StructBlock):
@@ -17,7 +30,13 @@ class AccordionItem(blocks.StructBlock):
     content = blocks.RichTextBlock(help_text=_("Item content"))
 
 
-class AccordionBlock(values.NameMixin, blocks.StructBlock):
+class AccordionBlock(
+    instrumentation.TimingMixin,
+    search.SearchMixin,
+    cache.CacheMixin,
+    values.NameMixin,
+    blocks.StructBlock,
+):
     """
     Accordion is used for showing and hiding content
     but only one item can stay open at a time.
@@ -40,7 +59,13 @@ class AccordionBlock(values.NameMixin, blocks.StructBlock):
         template = "wagtail/blocks/accordion.html"
 
 
-class AlertBlock(blocks.StructBlock):
+class AlertBlock(
+    instrumentation.TimingMixin,
+    search.SearchMixin,
+    cache.CacheMixin,
+    compiled.CompiledMixin,
+    blocks.StructBlock,
+):
     """Alert informs users about important events."""
 
     level = blocks.ChoiceBlock(
@@ -63,7 +88,13 @@ class AlertBlock(blocks.StructBlock):
         template = "wagtail/blocks/alert.html"
 
 
-class CarouselBlock(blocks.StructBlock):
+class CarouselBlock(
+    instrumentation.TimingMixin,
+    search.SearchMixin,
+    cache.CacheMixin,
+    images.ImageMixin,
+    blocks.StructBlock,
+):
     """Carousel show images or content in a scrollable area."""
 
     items = blocks.ListBlock(ImageBlock(), help_text=_("Carousel items"))
@@ -77,7 +108,13 @@ class CarouselBlock(blocks.StructBlock):
         template = "wagtail/blocks/carousel.html"
 
 
-class CodeBlock(blocks.StructBlock):
+class CodeBlock(
+    instrumentation.TimingMixin,
+    search.SearchMixin,
+    cache.CacheMixin,
+    compiled.CompiledMixin,
+    blocks.StructBlock,
+):
     """Code block is used to show a block of code in a box that looks like a code editor."""
 
     language = blocks.ChoiceBlock(
@@ -86,15 +123,44 @@ class CodeBlock(blocks.StructBlock):
     )
     code = blocks.TextBlock(help_text=_("Code content"))
 
+    def clean(self, value: Any) -> Any:
+        """
+        Validate the value and highlight its code, so the first visitor gets a cached result.
+
+        Args:
+            value (CodeValue): Block value.
+
+        Returns:
+            CodeValue: Cleaned value.
+
+        Raises:
+            StructBlockValidationError: If a child block is invalid.
+        """
+
+        value = super().clean(value)
+
+        # Highlight at save time, so the first visitor gets a cached result
+        highlight.highlight(value.get("language"), value.get("code") or "")
+
+        return value
+
     class Meta:
         """Meta data"""
 
         icon = "code"
         label = _("Code")
+        value_class = values.CodeValue
         template = "wagtail/blocks/code.html"
 
 
-class DiffBlock(blocks.StructBlock):
+class DiffBlock(
+    instrumentation.TimingMixin,
+    search.SearchMixin,
+    cache.CacheMixin,
+    compiled.CompiledMixin,
+    images.ImageMixin,
+    blocks.StructBlock,
+):
     """Diff block shows a side-by-side comparison of two items."""
 
     item_1 = ImageBlock(help_text=_("Diff Item 1"))
@@ -108,7 +174,12 @@ class DiffBlock(blocks.StructBlock):
         template = "wagtail/blocks/diff.html"
 
 
-class DocumentBlock(blocks.StructBlock):
+class DocumentBlock(
+    instrumentation.TimingMixin,
+    search.SearchMixin,
+    cache.CacheMixin,
+    blocks.StructBlock,
+):
     """Document block shows a document card with a download button"""
 
     document = DocumentChooserBlock()
@@ -122,7 +193,13 @@ class DocumentBlock(blocks.StructBlock):
         template = "wagtail/blocks/document.html"
 
 
-class HoverGalleryBlock(blocks.StructBlock):
+class HoverGalleryBlock(
+    instrumentation.TimingMixin,
+    search.SearchMixin,
+    cache.CacheMixin,
+    images.ImageMixin,
+    blocks.StructBlock,
+):
     """
     Hover Gallery is container of images.
     The first image is visible be default and when we hover it horizontally,
@@ -164,7 +241,13 @@ class TabItem(blocks.StructBlock):
     )
 
 
-class TabsBlock(values.NameMixin, blocks.StructBlock):
+class TabsBlock(
+    instrumentation.TimingMixin,
+    search.SearchMixin,
+    cache.CacheMixin,
+    values.NameMixin,
+    blocks.StructBlock,
+):
     """Tabs can be used to show a list of links in a tabbed format."""
 
     prefix = "tabs"
@@ -186,7 +269,15 @@ class TabsBlock(values.NameMixin, blocks.StructBlock):
         template = "wagtail/blocks/tabs.html"
 
 
-class IDEBlock(blocks.StructBlock):
+class IDEBlock(
+    instrumentation.TimingMixin,
+    search.SearchMixin,
+    embeds.FacadeMixin,
+    assets.AssetMixin,
+    cache.CacheMixin,
+    compiled.CompiledMixin,
+    blocks.StructBlock,
+):
     """Embed online code editor like StackBlitz using a url"""
 
     title = blocks.CharBlock(
@@ -272,6 +363,27 @@ class CodePenBlock(IDEBlock):
         ),
     )
 
+    def get_facade_url(self, value: Any) -> Optional[str]:
+        """
+        Get the URL of the pen, from `url` or from `user` and `slug_hash`.
+
+        Args:
+            value (CodePenValue): Block value.
+
+        Returns:
+            str | None: Pen URL.
+        """
+
+        if value.get("url"):
+            return value.get("url")
+
+        if value.get("user") and value.get("slug_hash"):
+            return (
+                f"https://codepen.io/{value.get('user')}/pen/{value.get('slug_hash')}"
+            )
+
+        return None
+
     class Meta:
         """Meta data"""
 
@@ -279,6 +391,8 @@ class CodePenBlock(IDEBlock):
         label = _("CodePen embeds")
         value_class = values.CodePenValue
         template = "wagtail/blocks/code/pen.html"
+        provider = "CodePen"
+        assets = ["codepen-style", "codepen"]
 
 
 class CodeSandboxBlock(IDEBlock):
@@ -290,6 +404,8 @@ class CodeSandboxBlock(IDEBlock):
         icon = "code"
         label = _("CodeSandbox embeds")
         template = "wagtail/blocks/code/sandbox.html"
+        provider = "CodeSandbox"
+        assets = ["codesandbox"]
 
 
 class StackBlitzBlock(IDEBlock):
@@ -367,9 +483,19 @@ class StackBlitzBlock(IDEBlock):
         label = _("StackBlitz embeds")
         value_class = values.StackBlitzValue
         template = "wagtail/blocks/code/stack_blitz.html"
-
-
-class ExpoSnackBlock(blocks.StructBlock):
+        provider = "StackBlitz"
+        assets = ["stackblitz"]
+
+
+class ExpoSnackBlock(
+    instrumentation.TimingMixin,
+    search.SearchMixin,
+    embeds.FacadeMixin,
+    assets.AssetMixin,
+    cache.CacheMixin,
+    compiled.CompiledMixin,
+    blocks.StructBlock,
+):
     """Embed Expo snacks in your wagtail-powered sites"""
 
     id = blocks.CharBlock(
@@ -456,6 +582,32 @@ class ExpoSnackBlock(blocks.StructBlock):
         ),
     )
 
+    def get_facade_url(self, value: Any) -> Optional[str]:
+        """
+        Get the URL of the snack.
+
+        Args:
+            value (ExpoSnackValue): Block value.
+
+        Returns:
+            str | None: Snack URL, `None` without a snack id.
+        """
+
+        return f"https://snack.expo.dev/{value.get('id')}" if value.get("id") else None
+
+    def get_facade_title(self, value: Any) -> str:
+        """
+        Get the title shown by the placeholder.
+
+        Args:
+            value (ExpoSnackValue): Block value.
+
+        Returns:
+            str: Snack name.
+        """
+
+        return value.get("name") or ""
+
     class Meta:
         """Meta data"""
 
@@ -463,3 +615,5 @@ class ExpoSnackBlock(blocks.StructBlock):
         label = _("Expo snack embeds")
         value_class = values.ExpoSnackValue
         template = "wagtail/blocks/code/expo_snack.html"
+        provider = "Expo Snack"
+        assets = ["snack"]
@@ -0,0 +1,321 @@
+"""Rendered fragment cache for blocks"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.utils.safestring import SafeString, mark_safe
+from django.utils.translation import get_language
+
+from wagtail_blocks import references
+from wagtail_blocks.values import content_hash, get_name_registry, register_name
+
+KEY_PREFIX = "wagtail_blocks:fragment"
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_TIMEOUT = 60 * 60 * 24
+
+
+def get_backend() -> Optional[BaseCache]:
+    """
+    Get the Django cache backend used by wagtail_blocks.
+
+    Returns:
+        BaseCache | None: Cache backend or `None` if `WAGTAIL_BLOCKS_CACHE_ALIAS` is `None`.
+    """
+
+    alias = getattr(settings, "WAGTAIL_BLOCKS_CACHE_ALIAS", "default")
+    return caches[alias] if alias else None
+
+
+def get_timeout() -> Optional[int]:
+    """
+    Get the timeout of entries stored in the cache backend.
+
+    Returns:
+        int | None: `WAGTAIL_BLOCKS_CACHE_TIMEOUT` setting.
+    """
+
+    return getattr(settings, "WAGTAIL_BLOCKS_CACHE_TIMEOUT", DEFAULT_TIMEOUT)
+
+
+def new_version() -> int:
+    """
+    Get the version a missing version key is seeded with.
+
+    Version keys don't expire but can be evicted, a new version
+    must differ from every version used before the eviction.
+
+    Returns:
+        int: Current time in nanoseconds.
+    """
+
+    return time.time_ns()
+
+
+class Fragment(NamedTuple):
+    """Rendered HTML of a block and the input names registered while rendering it"""
+
+    html: str
+    names: List[Tuple[str, str]]
+
+
+def replay_names(fragment: Fragment, registry: Optional[Dict[str, str]]) -> str:
+    """
+    Register the input names of a cached fragment again, like a render would.
+
+    Names already used on the page get a counter, and are renamed in the HTML.
+
+    Args:
+        fragment (Fragment): Cached fragment.
+        registry (dict[str, str] | None): Name registry of the current page.
+
+    Returns:
+        str: HTML using the registered names.
+    """
+
+    if registry is None or not fragment.names:
+        return fragment.html
+
+    renamed = {}
+    for used_name, name in fragment.names:
+        unique_name = register_name(registry, name)
+        if unique_name != used_name:
+            renamed[used_name] = unique_name
+
+    if not renamed:
+        return fragment.html
+
+    pattern = "|".join(
+        re.escape(name) for name in sorted(renamed, key=len, reverse=True)
+    )
+    return re.sub(
+        rf"(?<![\w-])(?:{pattern})(?![\w-])",
+        lambda match: renamed[match.group(0)],
+        fragment.html,
+    )
+
+
+class FragmentCache:
+    """
+    Two-tier cache for rendered block HTML.
+
+    The first tier is a bounded, in-process LRU. The second tier is a Django cache
+    backend, shared between processes. Both tiers keep hit/miss counters.
+    """
+
+    def __init__(self) -> None:
+        self._entries: "OrderedDict[str, Fragment]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {}
+        self.reset_stats()
+
+    @property
+    def max_entries(self) -> int:
+        """
+        Maximum number of entries kept in the in-process tier.
+
+        Returns:
+            int: `WAGTAIL_BLOCKS_CACHE_MAX_ENTRIES` setting.
+        """
+
+        return getattr(
+            settings, "WAGTAIL_BLOCKS_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES
+        )
+
+    @property
+    def backend(self) -> Optional[BaseCache]:
+        """
+        Django cache backend used as the second tier.
+
+        Returns:
+            BaseCache | None: Cache backend or `None` if disabled.
+        """
+
+        return get_backend()
+
+    def reset_stats(self) -> None:
+        """Reset hit/miss counters."""
+
+        self.stats = {"memory_hits": 0, "backend_hits": 0, "misses": 0}
+
+    def get(self, key: str) -> Optional[Fragment]:
+        """
+        Get a rendered fragment.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            Fragment | None: Cached fragment or `None` on miss.
+        """
+
+        with self._lock:
+            fragment = self._entries.get(key)
+            if fragment is not None:
+                self._entries.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return fragment
+
+        backend = self.backend
+        entry = backend.get(key) if backend is not None else None
+
+        with self._lock:
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+
+            self.stats["backend_hits"] += 1
+
+        fragment = Fragment(**entry)
+        self._remember(key, fragment)
+        return fragment
+
+    def set(self, key: str, fragment: Fragment) -> None:
+        """
+        Store a rendered fragment in both tiers.
+
+        Args:
+            key (str): Cache key.
+            fragment (Fragment): Rendered HTML and input names.
+        """
+
+        self._remember(key, fragment)
+
+        backend = self.backend
+        if backend is not None:
+            backend.set(key, fragment._asdict(), get_timeout())
+
+    def delete(self, key: str) -> None:
+        """
+        Remove a fragment from both tiers.
+
+        Args:
+            key (str): Cache key.
+        """
+
+        with self._lock:
+            self._entries.pop(key, None)
+
+        backend = self.backend
+        if backend is not None:
+            backend.delete(key)
+
+    def clear(self) -> None:
+        """Clear the in-process tier."""
+
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, key: str, fragment: Fragment) -> None:
+        with self._lock:
+            self._entries[key] = fragment
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+fragment_cache = FragmentCache()
+
+
+class CacheMixin:
+    """
+    A mixin that caches the rendered HTML of a block.
+
+    Caching is opt-in, either site-wide using `WAGTAIL_BLOCKS_CACHE` setting
+    or per block using `cache` `Meta` option. Blocks that depend on the request
+    context can opt out by setting `cache = False`, or by overriding `is_cacheable`.
+    Input names registered while rendering are stored with the HTML, and registered
+    again when the fragment is reused, so they stay unique on the page.
+    """
+
+    meta: Any
+
+    def is_cacheable(
+        self, value: Any, context: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Whether the rendered HTML of `value` can be cached.
+
+        Args:
+            value (Any): Block value.
+            context (dict | None): Parent template context.
+
+        Returns:
+            bool: `True` if the fragment can be cached, previews are always rendered.
+        """
+
+        request = (context or {}).get("request")
+        if getattr(request, "is_preview", False):
+            return False
+
+        cache = getattr(self.meta, "cache", None)
+        if cache is None:
+            return getattr(settings, "WAGTAIL_BLOCKS_CACHE", False)
+
+        return bool(cache)
+
+    def get_cache_key(
+        self,
+        value: Any,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Build the cache key of a rendered fragment.
+
+        The key is based on the block class, template, a hash of the value,
+        the versions of the images, documents and embeds it uses,
+        the active language and theme. The block id and the position in the stream
+        are included too, because they are used to build input names, and whether
+        names are registered, i.e. whether there is a request in the context.
+
+        Args:
+            value (Any): Block value.
+            context (dict | None): Parent template context.
+
+        Returns:
+            str: Cache key.
+        """
+
+        context = context or {}
+        forloop = context.get("forloop") or {}
+
+        parts = ":".join(
+            [
+                f"{type(self).__module__}.{type(self).__qualname__}",
+                str(self.get_template(value, context=context)),  # type: ignore
+                content_hash(self, value),  # type: ignore
+                references.get_versions(self, value),  # type: ignore
+                get_language() or "",
+                str(context.get("theme") or ""),
+                str(context.get("id") or ""),
+                str(forloop.get("counter0", "")),
+                str("request" in context),
+            ]
+        )
+
+        return f"{KEY_PREFIX}:{hashlib.blake2b(parts.encode()).hexdigest()}"
+
+    def render(
+        self, value: Any, context: Optional[Dict[str, Any]] = None
+    ) -> SafeString:
+        if not self.is_cacheable(value, context):
+            return super().render(value, context=context)  # type: ignore
+
+        key = self.get_cache_key(value, context)
+        registry = get_name_registry(context)
+        fragment = fragment_cache.get(key)
+
+        if fragment is None:
+            start = len(registry) if registry is not None else 0
+            html = super().render(value, context=context)  # type: ignore
+            names = list(registry.items())[start:] if registry is not None else []
+            fragment_cache.set(key, Fragment(str(html), names))
+            return mark_safe(html)
+
+        return mark_safe(replay_names(fragment, registry))
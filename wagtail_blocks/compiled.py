@@ -0,0 +1,312 @@
+"""Compiled render of simple blocks, building their HTML without templates"""
+
+import functools
+import os
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.template import TemplateDoesNotExist, defaultfilters
+from django.template.loader import get_template
+from django.utils import formats, timezone
+from django.utils.html import conditional_escape
+from django.utils.safestring import SafeString, mark_safe
+from django.utils.translation import gettext
+
+from wagtail_blocks import images
+
+# Templates of the package, compiled builders are only used when they are not overridden
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+EMBED_CLASS = (
+    "my-4 overflow-hidden size-full aspect-video bg-base-300 border border-base-300"
+    " rounded-field"
+)
+
+
+def is_enabled() -> bool:
+    """
+    Whether blocks are rendered by compiled builders.
+
+    Returns:
+        bool: `WAGTAIL_BLOCKS_COMPILED_RENDER` setting, `False` by default.
+    """
+
+    return getattr(settings, "WAGTAIL_BLOCKS_COMPILED_RENDER", False)
+
+
+def render_value(value: Any) -> str:
+    """
+    Render a variable like `{{ value }}` does in Django templates.
+
+    Args:
+        value (Any): Value.
+
+    Returns:
+        str: Localized and escaped value.
+    """
+
+    return conditional_escape(formats.localize(timezone.template_localtime(value)))
+
+
+def render_image(image: Any) -> str:
+    """
+    Render an image like `{% block_image image %}` does.
+
+    Args:
+        image (AbstractImage | None): Image.
+
+    Returns:
+        str: HTML.
+    """
+
+    return images.render_image(image) if image else ""
+
+
+def build_alert(value: Any) -> str:
+    """Build the HTML of `wagtail/blocks/alert.html`"""
+
+    # Template tags load the page model, which isn't ready when blocks are imported
+    from wagtail.templatetags.wagtailcore_tags import richtext
+
+    style = value.get("style")
+    return (
+        '\n\n<div class="my-4 not-prose">\n'
+        "  <div\n"
+        '    role="alert"\n'
+        f'    class="alert alert-vertical {f"alert-{render_value(style)}" if style else ""}'
+        f' alert-{render_value(value.get("level"))} md:alert-horizontal"\n'
+        "  >\n"
+        f'    <i data-lucide="{render_value(value.icon)}" class="size-4 lg:size-6"></i>\n'
+        "\n"
+        f"    <div>{render_value(richtext(value.get('message')))}</div>\n"
+        "  </div>\n"
+        "</div>\n"
+    )
+
+
+def build_diff(value: Any) -> str:
+    """Build the HTML of `wagtail/blocks/diff.html`"""
+
+    return (
+        '\n\n<div class="my-4 not-prose">\n'
+        '  <figure tabindex="0" class="diff aspect-video rounded-box overflow-hidden">\n'
+        '    <div class="diff-item-1" role="img" tabindex="0">\n'
+        f"      {render_image(value.get('item_1'))}\n"
+        "    </div>\n"
+        '    <div class="diff-item-2" role="img">\n'
+        f"      {render_image(value.get('item_2'))}\n"
+        "    </div>\n"
+        '    <div class="diff-resizer"></div>\n'
+        "  </figure>\n"
+        "</div>\n"
+    )
+
+
+def build_code(value: Any) -> str:
+    """Build the HTML of `wagtail/blocks/code.html`"""
+
+    language = value.get("language")
+    code = render_value(value.get("code"))
+    highlighted = value.highlighted
+
+    if highlighted:
+        pre = (
+            f'<code class="highlight language-{render_value(highlighted.language)}"'
+            f' data-highlighted="yes">{render_value(highlighted.html)}</code>'
+        )
+    else:
+        css_class = f"language-{render_value(language)}" if language != "auto" else ""
+        pre = f'<code class="{css_class}">{code}</code>'
+
+    return (
+        '\n\n<div dir="ltr" class="group relative my-4">\n'
+        "  <div\n"
+        '    class="card card-sm card-border border-base-300 md:card-md lg:card-lg xl:card-xl"\n'
+        "  >\n"
+        '    <div class="absolute inset-x-0 top-0 hidden group-hover:block">\n'
+        '      <div class="flex items-center justify-end gap-2 p-1 lg:gap-4">\n'
+        f'        <div class="tooltip" data-tip="{render_value(gettext("Language"))}">\n'
+        '          <span class="btn btn-sm btn-ghost lg:btn-md">\n'
+        '            <span class="sr-only">'
+        f"{render_value(gettext('Programming language'))}:</span>\n"
+        f"            {render_value(defaultfilters.title(language))}\n"
+        "          </span>\n"
+        "        </div>\n"
+        "\n"
+        f'        <div class="tooltip" data-tip="{render_value(gettext("Copy"))}">\n'
+        "          <button\n"
+        '            type="button"\n'
+        '            class="btn btn-sm btn-copy btn-ghost btn-square lg:btn-md"\n'
+        f'            data-clipboard-text="{code}"\n'
+        "          >\n"
+        f'            <span class="sr-only">{render_value(gettext("Copy"))}</span>\n'
+        '            <i data-lucide="copy" class="size-4 lg:size-5"></i>\n'
+        "          </button>\n"
+        "        </div>\n"
+        "      </div>\n"
+        "    </div>\n"
+        "\n"
+        "    \n"
+        "    <!---->\n"
+        "    \n"
+        "    <pre\n"
+        '      class="overflow-hidden rounded-box"\n'
+        f"    >{pre}</pre>\n"
+        "    \n"
+        "    <!---->\n"
+        "    \n"
+        "  </div>\n"
+        "</div>\n"
+    )
+
+
+def build_pen(value: Any) -> str:
+    """Build the HTML of `wagtail/blocks/code/pen.html`"""
+
+    user = render_value(value.get("user"))
+    return (
+        "<div\n"
+        f'  class="{EMBED_CLASS}"\n'
+        ">\n"
+        f'  <p {render_value(value.attributes)} data-version="2" class="codepen">\n'
+        '    <span class="sr-only">\n'
+        "      See the Pen\n"
+        f'      <a href="{render_value(value.get("url"))}">'
+        f"{render_value(value.get('title'))}</a>\n"
+        f"      by {user} (\n"
+        f'      <a href="https://codepen.io/{user}"> @{user} </a>\n'
+        '      ) on <a href="https://codepen.io">CodePen</a>.\n'
+        "    </span>\n"
+        "  </p>\n"
+        "</div>\n"
+    )
+
+
+def build_sandbox(value: Any) -> str:
+    """Build the HTML of `wagtail/blocks/code/sandbox.html`"""
+
+    return (
+        "<iframe\n"
+        f'  src="{render_value(value.get("url"))}?embed=1"\n'
+        f'  title="{render_value(value.get("title"))}"\n'
+        f'  class="{EMBED_CLASS}"\n'
+        '  allow="\n'
+        "    accelerometer;\n"
+        "    ambient-light-sensor;\n"
+        "    camera;\n"
+        "    encrypted-media;\n"
+        "    geolocation;\n"
+        "    gyroscope;\n"
+        "    hid;\n"
+        "    microphone;\n"
+        "    midi;\n"
+        "    payment;\n"
+        "    usb;\n"
+        "    vr;\n"
+        "    xr-spatial-tracking;\n"
+        '  "\n'
+        '  sandbox="allow-forms allow-modals allow-popups allow-presentation'
+        ' allow-same-origin allow-scripts"\n'
+        "></iframe>\n"
+    )
+
+
+def build_stack_blitz(value: Any) -> str:
+    """Build the HTML of `wagtail/blocks/code/stack_blitz.html`"""
+
+    return (
+        "<iframe\n"
+        f'  title="{render_value(value.get("title"))}"\n'
+        f'  src="{render_value(value.get("url"))}?{render_value(value.params)}"\n'
+        f'  class="{EMBED_CLASS}"\n'
+        "></iframe>\n"
+    )
+
+
+def build_expo_snack(value: Any) -> str:
+    """Build the HTML of `wagtail/blocks/code/expo_snack.html`"""
+
+    return (
+        "<div\n"
+        f"  {render_value(value.attributes)}\n"
+        f'  title="{render_value(value.get("name"))}"\n'
+        f'  class="{EMBED_CLASS}"\n'
+        "></div>\n"
+    )
+
+
+# Builders by template name, each one must render exactly like its template
+BUILDERS: Dict[str, Callable[[Any], str]] = {
+    "wagtail/blocks/alert.html": build_alert,
+    "wagtail/blocks/diff.html": build_diff,
+    "wagtail/blocks/code.html": build_code,
+    "wagtail/blocks/code/pen.html": build_pen,
+    "wagtail/blocks/code/sandbox.html": build_sandbox,
+    "wagtail/blocks/code/stack_blitz.html": build_stack_blitz,
+    "wagtail/blocks/code/expo_snack.html": build_expo_snack,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def is_package_template(template_name: str) -> bool:
+    """
+    Whether a template name resolves to the Django template of this package, once per process.
+
+    A template overridden by the project, or resolved by another engine,
+    e.g. Jinja2, is rendered by its engine instead of a builder.
+
+    Args:
+        template_name (str): Template name.
+
+    Returns:
+        bool: Whether the template is the one of this package.
+    """
+
+    try:
+        origin = get_template(template_name).origin
+    except TemplateDoesNotExist:
+        return False
+
+    path = os.path.abspath(str(getattr(origin, "name", "")))
+    return path == os.path.join(TEMPLATES_DIR, template_name)
+
+
+def get_builder(template_name: Optional[str]) -> Optional[Callable[[Any], str]]:
+    """
+    Get the compiled builder of a template.
+
+    Args:
+        template_name (str | None): Template name.
+
+    Returns:
+        Callable | None: Builder or `None` if the template must be rendered.
+    """
+
+    if not template_name or not is_enabled():
+        return None
+
+    builder = BUILDERS.get(template_name)
+    if builder is None or not is_package_template(template_name):
+        return None
+
+    return builder
+
+
+class CompiledMixin:
+    """
+    A mixin rendering blocks with compiled builders, when `WAGTAIL_BLOCKS_COMPILED_RENDER` is set.
+
+    Blocks fall back to their template when it has no builder,
+    e.g. in facade mode, or when the project overrides it.
+    """
+
+    def render(
+        self, value: Any, context: Optional[Dict[str, Any]] = None
+    ) -> SafeString:
+        template = self.get_template(value, context=context)  # type: ignore
+        builder = get_builder(template if isinstance(template, str) else None)
+
+        if builder is None:
+            return super().render(value, context=context)  # type: ignore
+
+        return mark_safe(builder(value))
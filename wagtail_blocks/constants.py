@@ -21,6 +21,46 @@ ALERT_LEVELS = [
     ("error", _("Error")),
 ]
 
+# daisyUI themes, in the order shown by the theme switcher
+THEMES = [
+    ("default", "Default"),
+    ("light", "Light"),
+    ("dark", "Dark"),
+    ("cupcake", "Cupcake"),
+    ("bumblebee", "Bumblebee"),
+    ("emerald", "Emerald"),
+    ("corporate", "Corporate"),
+    ("synthwave", "Synthwave"),
+    ("retro", "Retro"),
+    ("cyberpunk", "Cyberpunk"),
+    ("valentine", "Valentine"),
+    ("halloween", "Halloween"),
+    ("garden", "Garden"),
+    ("forest", "Forest"),
+    ("aqua", "Aqua"),
+    ("lofi", "Lofi"),
+    ("pastel", "Pastel"),
+    ("fantasy", "Fantasy"),
+    ("wireframe", "Wireframe"),
+    ("black", "Black"),
+    ("luxury", "Luxury"),
+    ("dracula", "Dracula"),
+    ("cmyk", "Cmyk"),
+    ("autumn", "Autumn"),
+    ("business", "Business"),
+    ("acid", "Acid"),
+    ("lemonade", "Lemonade"),
+    ("night", "Night"),
+    ("coffee", "Coffee"),
+    ("winter", "Winter"),
+    ("dim", "Dim"),
+    ("nord", "Nord"),
+    ("sunset", "Sunset"),
+    ("caramellatte", "Caramellatte"),
+    ("abyss", "Abyss"),
+    ("silk", "Silk"),
+]
+
 TAB_STYLES = [
     ("border", _("Border")),
     ("box", _("Box")),
@@ -0,0 +1,638 @@
+"""Per-page stylesheets containing only the CSS rules used by the blocks of a page"""
+
+import functools
+import hashlib
+import re
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.template import TemplateDoesNotExist, engines
+from django.template.backends.django import DjangoTemplates
+from django.utils.safestring import SafeString, mark_safe
+
+from wagtail_blocks import assets, cache, embeds, streams
+
+# Prebuilt bundle containing every class used by the templates
+DEFAULT_STYLESHEET = "wagtail_blocks/css/styles.css"
+
+# Directory of content-addressed stylesheets, in the default storage
+OUTPUT_DIR = "wagtail_blocks/css"
+
+KEY_PREFIX = "wagtail_blocks:css"
+
+# At-rules containing rules, purged recursively
+GROUPING_RULES = ["media", "supports", "layer", "container", "starting-style", "scope"]
+
+# Pseudo-classes matching if any of their selectors matches
+MATCHES_ANY = ["is", "where", "matches", "-webkit-any", "-moz-any"]
+
+AT_RULE_RE = re.compile(r"@([\w-]+)")
+CLASS_ATTR_RE = re.compile(r'\sclass="([^"]*)"', re.S)
+CLASS_LIST_RE = re.compile(r"classList\.(?:add|toggle|replace)\(([^)]*)\)", re.S)
+STRING_RE = re.compile(r"""["']([^"']+)["']""")
+INCLUDE_RE = re.compile(r"""\{%\s*include\s+["']([^"']+)["']""")
+USE_ASSET_RE = re.compile(r"\{%\s*use_asset\s+(.*?)%\}", re.S)
+TEMPLATE_TAG_RE = re.compile(r"\{%.*?%\}", re.S)
+SELF_VAR_RE = re.compile(r"\{\{\s*self\.(\w+)\s*\}\}")
+TEMPLATE_VAR_RE = re.compile(r"\{\{.*?\}\}", re.S)
+CLASS_RE = re.compile(r"\.((?:[\w-]|\\[0-9a-fA-F]{1,6}\s?|\\.)+)", re.S)
+ESCAPE_RE = re.compile(r"\\(?:([0-9a-fA-F]{1,6})\s?|(.))", re.S)
+
+
+class Rule(NamedTuple):
+    """
+    A CSS rule.
+
+    Style rules have a selector `prelude` and a declaration `body`.
+    Grouping at-rules have `children` instead, other at-rules are kept verbatim.
+    """
+
+    prelude: str
+    body: Optional[str] = None
+    children: Optional[List["Rule"]] = None
+
+
+class TemplateClasses(NamedTuple):
+    """Classes used by a template"""
+
+    static: FrozenSet[str]
+
+    # Patterns of classes built from child block values, by child block name
+    variants: Dict[str, FrozenSet[str]]
+
+
+def find_block_end(css: str, start: int) -> int:
+    """
+    Find the closing brace matching the opening brace at `start`.
+
+    Args:
+        css (str): Stylesheet.
+        start (int): Index of the opening brace.
+
+    Returns:
+        int: Index of the closing brace.
+    """
+
+    depth = 0
+    index = start
+
+    while index < len(css):
+        char = css[index]
+
+        if char in "\"'":
+            index = css.index(char, index + 1)
+        elif char == "\\":
+            index += 1
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return index
+
+        index += 1
+
+    raise ValueError("Unbalanced braces in stylesheet")
+
+
+def parse(css: str) -> List[Rule]:
+    """
+    Parse a stylesheet into a tree of rules.
+
+    This is not a complete CSS parser, it only splits rules,
+    which is enough for the minified output of Tailwind CSS.
+
+    Args:
+        css (str): Stylesheet.
+
+    Returns:
+        list[Rule]: Top-level rules.
+    """
+
+    css = re.sub(r"/\*(?!!).*?\*/", "", css, flags=re.S)
+    rules: List[Rule] = []
+    index = 0
+
+    while index < len(css):
+        if css[index].isspace():
+            index += 1
+            continue
+
+        brace = css.find("{", index)
+        semicolon = css.find(";", index)
+
+        # Statement at-rules, e.g. `@import` or `@layer theme, base;`
+        if css[index] == "@" and semicolon != -1 and (brace == -1 or semicolon < brace):
+            rules.append(Rule(css[index : semicolon + 1]))
+            index = semicolon + 1
+            continue
+
+        if brace == -1:
+            break
+
+        end = find_block_end(css, brace)
+        prelude = css[index:brace].strip()
+        body = css[brace + 1 : end]
+        match = AT_RULE_RE.match(prelude)
+        name = match.group(1) if match else ""
+
+        if name in GROUPING_RULES:
+            rules.append(Rule(prelude, children=parse(body)))
+        elif name:
+            rules.append(Rule(css[index : end + 1]))
+        else:
+            rules.append(Rule(prelude, body=body))
+
+        index = end + 1
+
+    return rules
+
+
+def serialize(rules: Iterable[Rule]) -> str:
+    """
+    Serialize a tree of rules.
+
+    Args:
+        rules (Iterable[Rule]): Rules.
+
+    Returns:
+        str: Stylesheet.
+    """
+
+    output = []
+    for rule in rules:
+        if rule.children is not None:
+            output.append(f"{rule.prelude}{{{serialize(rule.children)}}}")
+        elif rule.body is not None:
+            output.append(f"{rule.prelude}{{{rule.body}}}")
+        else:
+            output.append(rule.prelude)
+
+    return "".join(output)
+
+
+def split_selectors(selectors: str) -> List[str]:
+    """
+    Split a selector list on top-level commas.
+
+    Args:
+        selectors (str): Selector list.
+
+    Returns:
+        list[str]: Selectors.
+    """
+
+    parts = []
+    depth = 0
+    start = 0
+    index = 0
+
+    while index < len(selectors):
+        char = selectors[index]
+
+        if char == "\\":
+            index += 1
+        elif char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(selectors[start:index])
+            start = index + 1
+
+        index += 1
+
+    parts.append(selectors[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+def unescape(ident: str) -> str:
+    """
+    Unescape a CSS identifier, e.g. `\\32 xl\\:prose` to `2xl:prose`.
+
+    Args:
+        ident (str): Escaped identifier.
+
+    Returns:
+        str: Identifier.
+    """
+
+    def replace(match: re.Match) -> str:
+        code, char = match.groups()
+        return chr(int(code, 16)) if code else char
+
+    return ESCAPE_RE.sub(replace, ident)
+
+
+def is_selector_used(selector: str, classes: Set[str]) -> bool:
+    """
+    Whether a selector can match an element, given the classes used by a page.
+
+    Only classes are checked. Classes inside `:not()`, `:has()` and other
+    functional pseudo-classes are ignored, so the check never drops a rule
+    that could match.
+
+    Args:
+        selector (str): Selector.
+        classes (set[str]): Used classes.
+
+    Returns:
+        bool: `False` if the selector requires a class that is not used.
+    """
+
+    index = 0
+    while index < len(selector):
+        char = selector[index]
+
+        if char == ".":
+            match = CLASS_RE.match(selector, index)
+            if match:
+                if unescape(match.group(1)) not in classes:
+                    return False
+
+                index = match.end()
+                continue
+
+        if char == "[":
+            index = find_closing(selector, index, "[", "]") + 1
+            continue
+
+        if char == ":":
+            match = re.match(r"::?([\w-]+)\(", selector[index:])
+            if match:
+                start = index + match.end() - 1
+                end = find_closing(selector, start, "(", ")")
+
+                if match.group(1) in MATCHES_ANY and not any(
+                    is_selector_used(part, classes)
+                    for part in split_selectors(selector[start + 1 : end])
+                ):
+                    return False
+
+                index = end + 1
+                continue
+
+        if char == "\\":
+            index += 1
+
+        index += 1
+
+    return True
+
+
+def find_closing(text: str, start: int, opening: str, closing: str) -> int:
+    """
+    Find the bracket matching the bracket at `start`.
+
+    Args:
+        text (str): Text.
+        start (int): Index of the opening bracket.
+        opening (str): Opening bracket.
+        closing (str): Closing bracket.
+
+    Returns:
+        int: Index of the closing bracket, or the end of `text`.
+    """
+
+    depth = 0
+    index = start
+
+    while index < len(text):
+        char = text[index]
+
+        if char == "\\":
+            index += 1
+        elif char in "\"'":
+            end = text.find(char, index + 1)
+            index = end if end != -1 else len(text)
+        elif char == opening:
+            depth += 1
+        elif char == closing:
+            depth -= 1
+            if depth == 0:
+                return index
+
+        index += 1
+
+    return len(text)
+
+
+def purge(rules: Iterable[Rule], classes: Set[str]) -> List[Rule]:
+    """
+    Remove the style rules that require classes that are not used.
+
+    Rules without classes, e.g. resets, theme variables, keyframes,
+    and other at-rules are always kept.
+
+    Args:
+        rules (Iterable[Rule]): Rules.
+        classes (set[str]): Used classes.
+
+    Returns:
+        list[Rule]: Remaining rules.
+    """
+
+    kept = []
+    for rule in rules:
+        if rule.children is not None:
+            children = purge(rule.children, classes)
+            if children:
+                kept.append(rule._replace(children=children))
+
+        elif rule.body is not None:
+            selectors = [
+                selector
+                for selector in split_selectors(rule.prelude)
+                if is_selector_used(selector, classes)
+            ]
+            if selectors:
+                kept.append(rule._replace(prelude=",".join(selectors)))
+
+        else:
+            kept.append(rule)
+
+    return kept
+
+
+def get_stylesheet_path() -> str:
+    """
+    Get the static path of the full stylesheet.
+
+    Returns:
+        str: `WAGTAIL_BLOCKS_STYLESHEET` setting.
+    """
+
+    return getattr(settings, "WAGTAIL_BLOCKS_STYLESHEET", DEFAULT_STYLESHEET)
+
+
+@functools.lru_cache(maxsize=None)
+def get_rules() -> List[Rule]:
+    """
+    Load and parse the full stylesheet, once per process.
+
+    Returns:
+        list[Rule]: Rules of `WAGTAIL_BLOCKS_STYLESHEET` static file.
+    """
+
+    path = get_stylesheet_path()
+    absolute_path = finders.find(path)
+    if not absolute_path:
+        raise ImproperlyConfigured(f"Stylesheet {path} was not found")
+
+    with open(absolute_path, encoding="utf-8") as file:
+        return parse(file.read())
+
+
+def get_template_source(template_name: str) -> str:
+    """
+    Get the source of a Django template.
+
+    Jinja2 templates of the Jinja2 template set use the same classes,
+    so the Django version is read even if a Jinja2 engine comes first.
+
+    Args:
+        template_name (str): Template name.
+
+    Returns:
+        str: Template source.
+
+    Raises:
+        TemplateDoesNotExist: If no Django template engine has this template.
+    """
+
+    for engine in engines.all():
+        if isinstance(engine, DjangoTemplates):
+            try:
+                return engine.get_template(template_name).template.source
+            except TemplateDoesNotExist:
+                continue
+
+    raise TemplateDoesNotExist(template_name)
+
+
+@functools.lru_cache(maxsize=None)
+def get_template_classes(template_name: str) -> TemplateClasses:
+    """
+    Extract the classes used by a template, the templates it includes and its assets.
+
+    Classes are read from `class` attributes and `classList` calls.
+    Classes built from a child block value, e.g. `alert-{{ self.style }}`,
+    are returned as patterns, e.g. `{"style": {"alert-{}"}}`.
+    Classes built from other variables are ignored.
+
+    Args:
+        template_name (str): Template name.
+
+    Returns:
+        TemplateClasses: Static classes and patterns.
+    """
+
+    try:
+        source = get_template_source(template_name)
+    except TemplateDoesNotExist:
+        return TemplateClasses(frozenset(), {})
+
+    tokens: List[str] = []
+    for attribute in CLASS_ATTR_RE.findall(source):
+        attribute = TEMPLATE_TAG_RE.sub(" ", attribute)
+        attribute = SELF_VAR_RE.sub(lambda match: f"\0{match.group(1)}\0", attribute)
+        tokens.extend(TEMPLATE_VAR_RE.sub("\1", attribute).split())
+
+    for arguments in CLASS_LIST_RE.findall(source):
+        tokens.extend(STRING_RE.findall(arguments))
+
+    static: Set[str] = set()
+    variants: Dict[str, Set[str]] = {}
+
+    for token in tokens:
+        if "\1" in token:
+            continue
+
+        parts = token.split("\0")
+        if len(parts) == 1:
+            static.add(token)
+        elif len(parts) == 3:
+            variants.setdefault(parts[1], set()).add(f"{parts[0]}{{}}{parts[2]}")
+
+    includes = INCLUDE_RE.findall(source)
+    for names in USE_ASSET_RE.findall(source):
+        includes.extend(
+            assets.ASSETS[name].template
+            for name in STRING_RE.findall(names)
+            if name in assets.ASSETS and assets.ASSETS[name].template
+        )
+
+    for include in includes:
+        included = get_template_classes(include)
+        static.update(included.static)
+
+        for name, patterns in included.variants.items():
+            variants.setdefault(name, set()).update(patterns)
+
+    return TemplateClasses(
+        frozenset(static),
+        {name: frozenset(patterns) for name, patterns in variants.items()},
+    )
+
+
+def get_block_classes(block: Any, value: Any) -> Set[str]:
+    """
+    Get the classes used to render a block value, excluding nested blocks.
+
+    The classes of the embed a facade placeholder loads are included,
+    since its template is included by a variable.
+
+    Args:
+        block (Block): Block definition.
+        value (Any): Block value.
+
+    Returns:
+        set[str]: Used classes.
+    """
+
+    template = getattr(block.meta, "template", None)
+    if not template:
+        return set()
+
+    template_names = {block.get_template(value)}
+    if isinstance(block, embeds.FacadeMixin):
+        template_names.add(block.get_embed_template(value))
+
+    classes: Set[str] = set()
+    for template_name in filter(None, template_names):
+        template_classes = get_template_classes(template_name)
+        classes.update(template_classes.static)
+
+        for name, patterns in template_classes.variants.items():
+            choice = value.get(name) if hasattr(value, "get") else None
+            if choice:
+                classes.update(pattern.format(choice) for pattern in patterns)
+
+    return classes
+
+
+def get_stream_classes(stream_value: Any) -> Set[str]:
+    """
+    Get the classes used to render every block of a stream.
+
+    Args:
+        stream_value (StreamValue): Stream value.
+
+    Returns:
+        set[str]: Used classes.
+    """
+
+    classes: Set[str] = set()
+    for node in streams.walk_stream(stream_value):
+        classes.update(get_block_classes(node.block, node.value))
+
+    return classes
+
+
+def get_templates_classes(template_names: Iterable[str]) -> Set[str]:
+    """
+    Get the static classes used by templates, e.g. the page layout and components.
+
+    Args:
+        template_names (Iterable[str]): Template names.
+
+    Returns:
+        set[str]: Used classes.
+    """
+
+    classes: Set[str] = set()
+    for template_name in template_names:
+        classes.update(get_template_classes(template_name).static)
+
+    return classes
+
+
+@functools.lru_cache(maxsize=128)
+def build_stylesheet(classes: FrozenSet[str]) -> str:
+    """
+    Build a stylesheet containing only the rules needed by some classes.
+
+    Args:
+        classes (frozenset[str]): Used classes.
+
+    Returns:
+        str: Stylesheet.
+    """
+
+    from wagtail_blocks import themes
+
+    # Theme rules are loaded by the theme switcher when themes are split
+    rules = themes.get_split_rules()[0] if themes.is_lazy() else get_rules()
+    return serialize(purge(rules, set(classes)))
+
+
+def get_stylesheet_name(css: str) -> str:
+    """
+    Get the content-addressed file name of a stylesheet.
+
+    Args:
+        css (str): Stylesheet.
+
+    Returns:
+        str: File name, in the default storage.
+    """
+
+    digest = hashlib.blake2b(css.encode(), digest_size=8).hexdigest()
+    return f"{OUTPUT_DIR}/{digest}.css"
+
+
+def save_stylesheet(css: str) -> str:
+    """
+    Save a stylesheet to the default storage, unless it was already saved.
+
+    Args:
+        css (str): Stylesheet.
+
+    Returns:
+        str: Stylesheet URL.
+    """
+
+    name = get_stylesheet_name(css)
+    backend = cache.get_backend()
+    key = f"{KEY_PREFIX}:{name}"
+
+    url = backend.get(key) if backend is not None else None
+    if url is None:
+        if not default_storage.exists(name):
+            name = default_storage.save(name, ContentFile(css.encode()))
+
+        url = default_storage.url(name)
+        if backend is not None:
+            backend.set(key, url, None)
+
+    return url
+
+
+def render_styles(classes: Iterable[str]) -> SafeString:
+    """
+    Render a minimal stylesheet for some classes.
+
+    The stylesheet is inlined by default. When `WAGTAIL_BLOCKS_PURGE_CSS` is `"file"`,
+    it's saved under a content-addressed name and linked instead.
+
+    Args:
+        classes (Iterable[str]): Used classes.
+
+    Returns:
+        SafeString: `<style>` or `<link>` tag.
+    """
+
+    classes = set(classes)
+    classes.update(
+        get_templates_classes(getattr(settings, "WAGTAIL_BLOCKS_PURGE_TEMPLATES", []))
+    )
+    css = build_stylesheet(frozenset(classes))
+
+    if getattr(settings, "WAGTAIL_BLOCKS_PURGE_CSS", "inline") == "file":
+        return mark_safe(f'<link rel="stylesheet" href="{save_stylesheet(css)}">')
+
+    return mark_safe(f"<style>{css}</style>")
@@ -0,0 +1,123 @@
+"""Document metadata helpers for document blocks"""
+
+import logging
+from typing import Any, Dict, List
+
+from wagtail import blocks
+from wagtail.documents import get_document_model
+from wagtail.documents.blocks import DocumentChooserBlock
+from wagtail.documents.models import AbstractDocument
+
+from wagtail_blocks import streams
+
+logger = logging.getLogger(__name__)
+
+
+def is_document_block(block: blocks.Block) -> bool:
+    """
+    Whether the value of a block is a document.
+
+    Args:
+        block (Block): Block definition.
+
+    Returns:
+        bool: `True` for `DocumentChooserBlock`.
+    """
+
+    return isinstance(block, DocumentChooserBlock)
+
+
+def iter_documents(stream_value: Any) -> List[AbstractDocument]:
+    """
+    Find every document in a stream.
+
+    Args:
+        stream_value (StreamValue): Stream value.
+
+    Returns:
+        list[AbstractDocument]: Documents, in stream order.
+    """
+
+    return [
+        node.value
+        for node in streams.walk_stream(stream_value)
+        if is_document_block(node.block) and node.value is not None
+    ]
+
+
+def backfill_file_sizes(documents: List[AbstractDocument]) -> int:
+    """
+    Store the file size of documents uploaded before Wagtail stored it, in one query.
+
+    This is called by `prefetch_documents`, so it runs a `bulk_update` while
+    rendering GET requests, once per document missing its size. Files that can't
+    be read are logged and skipped, their size is shown as 0 B.
+
+    Args:
+        documents (list[AbstractDocument]): Documents, possibly with a `file_size`.
+
+    Returns:
+        int: Number of documents updated.
+    """
+
+    instances: Dict[int, List[AbstractDocument]] = {}
+    for document in documents:
+        instances.setdefault(document.pk, []).append(document)
+
+    missing: List[AbstractDocument] = []
+    for same in instances.values():
+        if same[0].file_size is not None:
+            continue
+
+        try:
+            file_size = same[0].file.size
+        except OSError:
+            logger.warning(
+                "Can't read the file size of document %s", same[0].pk, exc_info=True
+            )
+            continue
+
+        for document in same:
+            document.file_size = file_size
+
+        missing.append(same[0])
+
+    if missing:
+        get_document_model().objects.bulk_update(missing, ["file_size"])
+
+    return len(missing)
+
+
+def prefetch_documents(stream_value: Any) -> List[AbstractDocument]:
+    """
+    Load the metadata of every document in a stream, in bulk.
+
+    Uploaders are loaded with a single query and attached to the document
+    instances of the stream. Missing file sizes are backfilled, so the templates
+    don't query the database nor the storage backend.
+
+    Args:
+        stream_value (StreamValue): Stream value, e.g. the value of a page's `StreamField`.
+
+    Returns:
+        list[AbstractDocument]: Documents found in the stream.
+    """
+
+    documents = iter_documents(stream_value)
+    if not documents:
+        return documents
+
+    loaded = (
+        get_document_model()
+        .objects.select_related("uploaded_by_user")
+        .in_bulk({document.pk for document in documents})
+    )
+
+    for document in documents:
+        match = loaded.get(document.pk)
+        if match is not None:
+            document.uploaded_by_user = match.uploaded_by_user
+            document.file_size = match.file_size
+
+    backfill_file_sizes(documents)
+    return documents
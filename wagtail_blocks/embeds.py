@@ -0,0 +1,138 @@
+"""Click-to-load facades for third-party embeds"""
+
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from wagtail.embeds.embeds import get_embed
+from wagtail.embeds.exceptions import EmbedException
+
+from wagtail_blocks import assets
+
+FACADE_TEMPLATE = "wagtail/blocks/code/facade.html"
+
+# Load the embed on click, or when it scrolls into view
+FACADE_MODES = ["click", "visible"]
+
+
+def get_thumbnail(url: Optional[str]) -> Optional[str]:
+    """
+    Get the thumbnail of an embed, using Wagtail's embed finders.
+
+    Embeds are stored in the database by Wagtail, so providers are only queried once.
+
+    Args:
+        url (str | None): Embed URL.
+
+    Returns:
+        str | None: Thumbnail URL or `None` if disabled or not available.
+    """
+
+    if not url or not getattr(settings, "WAGTAIL_BLOCKS_FACADE_THUMBNAILS", False):
+        return None
+
+    try:
+        return get_embed(url).thumbnail_url or None
+    except EmbedException:
+        return None
+
+
+class FacadeMixin:
+    """
+    A mixin that renders a lightweight placeholder instead of a third-party embed.
+
+    The embed is created in the browser, on click or when it scrolls into view,
+    along with its assets. Must be used with `AssetMixin`.
+    Facades are opt-in, either site-wide using `WAGTAIL_BLOCKS_FACADE` setting
+    or per block using `facade` `Meta` option, set to `"click"` or `"visible"`.
+    Blocks can opt out by setting `facade = False`.
+    """
+
+    meta: Any
+
+    def get_facade_mode(self) -> Optional[str]:
+        """
+        Get the facade mode of this block.
+
+        Returns:
+            str | None: `"click"`, `"visible"` or `None` if the embed is rendered directly.
+        """
+
+        mode = getattr(self.meta, "facade", None)
+        if mode is None:
+            mode = getattr(settings, "WAGTAIL_BLOCKS_FACADE", None)
+
+        return mode if mode in FACADE_MODES else None
+
+    def get_facade_url(self, value: Any) -> Optional[str]:
+        """
+        Get the URL of the embedded project, used to find its thumbnail.
+
+        Args:
+            value (Any): Block value.
+
+        Returns:
+            str | None: Project URL.
+        """
+
+        return value.get("url") or None
+
+    def get_facade_title(self, value: Any) -> str:
+        """
+        Get the title shown by the placeholder.
+
+        Args:
+            value (Any): Block value.
+
+        Returns:
+            str: Title.
+        """
+
+        return value.get("title") or ""
+
+    def get_embed_template(
+        self, value: Any = None, context: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        Get the template of the embed, included by the placeholder once loaded.
+
+        Args:
+            value (Any): Block value.
+            context (dict | None): Parent template context.
+
+        Returns:
+            str | None: Template name.
+        """
+
+        return super().get_template(value, context=context)  # type: ignore
+
+    def get_assets(self, value: Any) -> List[str]:
+        if self.get_facade_mode():
+            return ["facade"]
+
+        return super().get_assets(value)  # type: ignore
+
+    def get_template(
+        self, value: Any = None, context: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        if self.get_facade_mode():
+            return FACADE_TEMPLATE
+
+        return super().get_template(value, context=context)  # type: ignore
+
+    def get_context(
+        self, value: Any, parent_context: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        context = super().get_context(value, parent_context=parent_context)  # type: ignore
+
+        mode = self.get_facade_mode()
+        if mode:
+            context["facade"] = {
+                "mode": mode,
+                "provider": getattr(self.meta, "provider", ""),
+                "title": self.get_facade_title(value),
+                "thumbnail": get_thumbnail(self.get_facade_url(value)),
+                "template": self.get_embed_template(value, context=parent_context),
+                "assets": assets.render(super().get_assets(value)),  # type: ignore
+            }
+
+        return context
@@ -0,0 +1,368 @@
+"""Server-side syntax highlighting for `CodeBlock`"""
+
+import hashlib
+import json
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.utils.safestring import SafeString, mark_safe
+
+from wagtail_blocks import cache
+
+try:
+    from pygments import highlight as pygments_highlight
+    from pygments.formatters import HtmlFormatter
+    from pygments.lexers import get_lexer_by_name
+except ImportError:  # pragma: no cover
+    pygments_highlight = None
+
+KEY_PREFIX = "wagtail_blocks:highlight"
+
+
+class Highlighted(NamedTuple):
+    """Highlighted code snippet"""
+
+    language: str
+    html: SafeString
+
+
+# Pygments lexer aliases of `constants.PROGRAMMING_LANGUAGES`
+LEXERS: Dict[str, str] = {
+    "bash": "bash",
+    "c": "c",
+    "cpp": "cpp",
+    "csharp": "csharp",
+    "css": "css",
+    "dart": "dart",
+    "dockerfile": "docker",
+    "go": "go",
+    "html": "html",
+    "java": "java",
+    "javascript": "javascript",
+    "json": "json",
+    "kotlin": "kotlin",
+    "lua": "lua",
+    "markdown": "markdown",
+    "php": "php",
+    "python": "python",
+    "ruby": "ruby",
+    "rust": "rust",
+    "scss": "scss",
+    "shell": "shell",
+    "sql": "sql",
+    "swift": "swift",
+    "typescript": "typescript",
+    "xml": "xml",
+    "yaml": "yaml",
+    "plaintext": "text",
+}
+
+# Weighted patterns used to detect the language of a snippet
+SIGNATURES: Dict[str, List[Tuple[str, int]]] = {
+    "bash": [
+        (r"^#!.*\b(ba)?sh\b", 10),
+        (r"^\s*(if|while) \[\[? .* \]\]?;? ?(then|do)?", 4),
+        (r"^\s*(fi|done|esac)\s*$", 4),
+        (r"\$\{?\w+\}?", 1),
+        (r"^\s*(export|echo|sudo|cd|apt|pip|npm) ", 2),
+    ],
+    "c": [
+        (r"^\s*#include\s*<\w+\.h>", 5),
+        (r"\bint\s+main\s*\(", 2),
+        (r"\b(printf|malloc|free|sizeof)\s*\(", 2),
+    ],
+    "cpp": [
+        (r"^\s*#include\s*<\w+>", 5),
+        (r"\bstd::", 5),
+        (r"\b(cout|cin)\s*(<<|>>)", 4),
+        (r"\b(template\s*<|namespace\s+\w+|nullptr)", 3),
+    ],
+    "csharp": [
+        (r"^\s*using\s+System(\.\w+)*;", 6),
+        (r"\bnamespace\s+[\w.]+\s*\{?", 2),
+        (r"\b(public|private|internal)\s+(static\s+)?(async\s+)?\w+\s+\w+\s*\(", 2),
+        (r"\bConsole\.Write(Line)?\(", 5),
+        (r"\{\s*get;\s*(set;)?\s*\}", 5),
+    ],
+    "css": [
+        (r"^\s*[.#]?[\w-]+(\s*[>,+~]?\s*[.#]?[\w:-]+)*\s*\{", 2),
+        (r"^\s*[\w-]+\s*:\s*[^;{}]+;\s*$", 2),
+        (r"^\s*@(media|import|font-face|keyframes)\b", 3),
+    ],
+    "dart": [
+        (r"^\s*import\s+'package:", 8),
+        (r"\bvoid\s+main\s*\(\s*\)", 2),
+        (r"\b(final|late)\s+\w+(<.*>)?\s+\w+\s*=", 3),
+        (r"\bWidget\s+build\s*\(", 6),
+    ],
+    "dockerfile": [
+        (r"^\s*FROM\s+[\w./:-]+(\s+AS\s+\w+)?\s*$", 8),
+        (r"^\s*(RUN|COPY|ADD|WORKDIR|EXPOSE|ENTRYPOINT|CMD|ENV|ARG)\s", 3),
+    ],
+    "go": [
+        (r"^\s*package\s+\w+\s*$", 5),
+        (r"^\s*func\s+(\(\w+\s+\*?\w+\)\s*)?\w+\s*\(", 5),
+        (r":=", 2),
+        (r"\bfmt\.\w+\(", 4),
+    ],
+    "html": [
+        (r"<!DOCTYPE\s+html", 10),
+        (r"<(html|head|body|div|span|p|a|ul|li|script|section)[\s>]", 3),
+        (r"</\w+>", 1),
+    ],
+    "java": [
+        (r"\bpublic\s+(final\s+)?class\s+\w+", 4),
+        (r"\bpublic\s+static\s+void\s+main\s*\(", 6),
+        (r"\bSystem\.out\.print", 6),
+        (r"^\s*import\s+java\.", 6),
+        (r"@Override\b", 3),
+    ],
+    "javascript": [
+        (r"\b(const|let|var)\s+\w+\s*=", 2),
+        (r"\bfunction\s*\w*\s*\(", 2),
+        (r"=>", 1),
+        (r"\bconsole\.\w+\(", 4),
+        (r"\b(document|window)\.\w+", 3),
+        (r"\brequire\(['\"]", 3),
+    ],
+    "json": [],
+    "kotlin": [
+        (r"^\s*fun\s+\w+\s*\(", 5),
+        (r"\b(val|var)\s+\w+\s*(:\s*\w+)?\s*=", 2),
+        (r"\bprintln\(", 2),
+        (r"^\s*data\s+class\b", 6),
+    ],
+    "lua": [
+        (r"\blocal\s+\w+\s*=", 4),
+        (r"^\s*function\s+[\w.:]+\s*\(", 2),
+        (r"^\s*end\s*$", 2),
+        (r"--\[\[|^\s*--", 1),
+        (r"\bthen\s*$", 2),
+    ],
+    "markdown": [
+        (r"^#{1,6}\s+\S", 3),
+        (r"^\s*[-*+]\s+\S", 1),
+        (r"\[[^\]]+\]\([^)]+\)", 3),
+        (r"^```", 4),
+        (r"\*\*[^*]+\*\*", 1),
+    ],
+    "php": [
+        (r"<\?php", 10),
+        (r"\$\w+\s*=", 2),
+        (r"\b(echo|function)\s", 1),
+        (r"->\w+\(", 1),
+    ],
+    "python": [
+        (r"^#!.*\bpython", 10),
+        (r"^\s*def\s+\w+\s*\(.*\)\s*(->\s*[\w\[\], .]+)?:\s*$", 5),
+        (r"^\s*(from\s+[\w.]+\s+)?import\s+[\w., ]+\s*$", 3),
+        (r"^\s*class\s+\w+(\(.*\))?:\s*$", 5),
+        (r"^\s*(elif|except|finally)\b.*:\s*$", 4),
+        (r"\bself\.", 2),
+        (r"\bprint\(", 1),
+    ],
+    "ruby": [
+        (r"^\s*def\s+\w+[?!]?(\(.*\))?\s*$", 4),
+        (r"^\s*end\s*$", 2),
+        (r"^\s*require\s+['\"]", 4),
+        (r"\bputs\s", 4),
+        (r"\.each\s+do\s*\|", 5),
+        (r"^\s*module\s+\w+\s*$", 3),
+    ],
+    "rust": [
+        (r"^\s*fn\s+\w+\s*(<.*>)?\s*\(", 5),
+        (r"\blet\s+mut\s+\w+", 6),
+        (r"\b(impl|pub\s+fn|use\s+std::)", 5),
+        (r"\w+!\(", 2),
+        (r"->\s*(Self|Result|Option|Vec)\b", 3),
+    ],
+    "scss": [
+        (r"^\s*\$[\w-]+\s*:", 5),
+        (r"^\s*@(mixin|include|extend|use)\b", 6),
+        (r"&(:|\.|-)\w+", 4),
+    ],
+    "shell": [
+        (r"^\s*\$\s+\w+", 5),
+        (r"^\s*(ls|cat|grep|chmod|mkdir)\s", 2),
+    ],
+    "sql": [
+        (r"\bSELECT\b.+\bFROM\b", 6),
+        (r"\b(INSERT\s+INTO|UPDATE\s+\w+\s+SET|DELETE\s+FROM)\b", 6),
+        (r"\bCREATE\s+(TABLE|INDEX|VIEW|DATABASE)\b", 6),
+        (r"\b(WHERE|JOIN|GROUP\s+BY|ORDER\s+BY)\b", 2),
+    ],
+    "swift": [
+        (r"^\s*import\s+(UIKit|SwiftUI|Foundation)\s*$", 8),
+        (r"^\s*func\s+\w+\s*\(.*\)\s*(->\s*\w+\s*)?\{", 4),
+        (r"\b(guard|let)\s+\w+\s*=", 1),
+        (r"\bvar\s+body\s*:\s*some\s+View", 8),
+    ],
+    "typescript": [
+        (r"\b(interface|type)\s+\w+\s*(=|\{)", 5),
+        (r"\b(const|let)\s+\w+\s*:\s*\w+", 5),
+        (r"\(\s*\w+\s*:\s*(string|number|boolean|any)\b", 6),
+        (r"^\s*import\s+.*\s+from\s+['\"]", 2),
+        (r"\bexport\s+(default\s+)?", 1),
+    ],
+    "xml": [
+        (r"^\s*<\?xml\s", 10),
+        (r"<(\w+:)?\w+(\s+[\w:]+=\"[^\"]*\")*\s*/?>", 1),
+    ],
+    "yaml": [
+        (r"^---\s*$", 3),
+        (r"^\s*[\w-]+:\s*(\S.*)?$", 1),
+        (r"^\s*-\s+[\w-]+:\s", 3),
+    ],
+}
+
+# SQL keywords are case-insensitive
+CASE_INSENSITIVE_LANGUAGES = ["sql"]
+
+COMPILED_SIGNATURES = {
+    language: [
+        (
+            re.compile(
+                pattern,
+                re.MULTILINE
+                | (re.IGNORECASE if language in CASE_INSENSITIVE_LANGUAGES else 0),
+            ),
+            weight,
+        )
+        for pattern, weight in patterns
+    ]
+    for language, patterns in SIGNATURES.items()
+}
+
+
+def detect_language(code: str) -> str:
+    """
+    Detect the programming language of a code snippet.
+
+    Each language in `LEXERS` has a set of weighted patterns,
+    the language with the highest score wins.
+
+    Args:
+        code (str): Code snippet.
+
+    Returns:
+        str: Detected language or `plaintext` if nothing matches.
+    """
+
+    stripped = code.strip()
+    if not stripped:
+        return "plaintext"
+
+    if stripped[0] in "[{":
+        try:
+            json.loads(stripped)
+            return "json"
+        except ValueError:
+            pass
+
+    scores = {
+        language: sum(
+            weight * len(pattern.findall(stripped)[:5]) for pattern, weight in patterns
+        )
+        for language, patterns in COMPILED_SIGNATURES.items()
+    }
+    language, score = max(scores.items(), key=lambda item: item[1])
+
+    return language if score > 0 else "plaintext"
+
+
+def is_enabled() -> bool:
+    """
+    Whether server-side highlighting is enabled and available.
+
+    Returns:
+        bool: `True` if `WAGTAIL_BLOCKS_HIGHLIGHT` is set and Pygments is installed.
+    """
+
+    return pygments_highlight is not None and getattr(
+        settings, "WAGTAIL_BLOCKS_HIGHLIGHT", False
+    )
+
+
+def get_cache_key(language: str, code: str) -> str:
+    """
+    Build the cache key of a highlighted snippet.
+
+    Args:
+        language (str): Programming language.
+        code (str): Code snippet.
+
+    Returns:
+        str: Cache key.
+    """
+
+    digest = hashlib.blake2b(f"{language}\0{code}".encode(), digest_size=16)
+    return f"{KEY_PREFIX}:{digest.hexdigest()}"
+
+
+def get_language(language: Optional[str], code: str) -> str:
+    """
+    Resolve the language of a snippet, detecting it when `auto` is selected.
+
+    Args:
+        language (str | None): Selected language.
+        code (str): Code snippet.
+
+    Returns:
+        str: One of `constants.PROGRAMMING_LANGUAGES` except `auto`.
+    """
+
+    if not language or language == "auto":
+        return detect_language(code)
+
+    return language if language in LEXERS else "plaintext"
+
+
+def render(language: str, code: str) -> SafeString:
+    """
+    Tokenize a snippet into highlighted HTML using Pygments.
+
+    Args:
+        language (str): Resolved programming language.
+        code (str): Code snippet.
+
+    Returns:
+        SafeString: Highlighted HTML, without the wrapping `<pre>`.
+    """
+
+    lexer = get_lexer_by_name(LEXERS[language], startinline=True, stripnl=False)
+    formatter = HtmlFormatter(nowrap=True)
+
+    return mark_safe(pygments_highlight(code, lexer, formatter))
+
+
+def highlight(language: Optional[str], code: str) -> Optional[Highlighted]:
+    """
+    Highlight a snippet, using the cache when the snippet was highlighted before.
+
+    Args:
+        language (str | None): Selected language.
+        code (str): Code snippet.
+
+    Returns:
+        Highlighted | None: Resolved language and highlighted HTML,
+        or `None` if highlighting is disabled.
+    """
+
+    if not is_enabled():
+        return None
+
+    backend = cache.get_backend()
+    key = get_cache_key(language or "auto", code)
+
+    cached = backend.get(key) if backend is not None else None
+    if cached is not None:
+        return Highlighted(cached[0], mark_safe(cached[1]))
+
+    resolved = get_language(language, code)
+    html = render(resolved, code)
+
+    if backend is not None:
+        backend.set(key, (resolved, str(html)), None)
+
+    return Highlighted(resolved, html)
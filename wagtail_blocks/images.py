@@ -0,0 +1,454 @@
+"""Image rendition helpers for image blocks"""
+
+import copy
+import functools
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import wagtail.images
+from django.conf import settings
+from django.db import models
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+from django.utils.safestring import SafeString, mark_safe
+from wagtail import blocks
+from wagtail.images import get_image_model
+from wagtail.images.blocks import ImageBlock, ImageChooserBlock
+from wagtail.images.models import AbstractImage, Filter, Picture, SourceImageIOError
+from wagtail.images.shortcuts import (
+    get_rendition_or_not_found,
+    get_renditions_or_not_found,
+)
+
+from wagtail_blocks import streams
+
+# Filter spec used by the templates of image blocks
+DEFAULT_FILTER = "fill-1920x1080"
+
+# Filter spec used by Wagtail to render images without a template
+ORIGINAL_FILTER = "original"
+
+# Filter specs of the templates Wagtail renders image blocks with
+WAGTAIL_TEMPLATE_FILTERS = {
+    "wagtailimages/widgets/image.html": ["fill-600x338"],
+}
+
+WAGTAIL_IMAGES_DIR = os.path.dirname(os.path.abspath(wagtail.images.__file__))
+
+# Size of `DEFAULT_FILTER`, responsive renditions keep the same aspect ratio
+DEFAULT_SIZE = (1920, 1080)
+
+DEFAULT_RESPONSIVE_IMAGES = {
+    "WIDTHS": [640, 960, 1280, 1920],
+    "FORMATS": ["avif", "webp", "jpeg"],
+    "SIZES": "100vw",
+}
+
+
+def get_responsive_settings() -> Optional[Dict[str, Any]]:
+    """
+    Get responsive image settings.
+
+    Returns:
+        dict | None: `WAGTAIL_BLOCKS_RESPONSIVE_IMAGES` merged with the defaults,
+        or `None` if responsive images are disabled.
+    """
+
+    options = getattr(settings, "WAGTAIL_BLOCKS_RESPONSIVE_IMAGES", None)
+    if not options:
+        return None
+
+    if options is True:
+        options = {}
+
+    return {**DEFAULT_RESPONSIVE_IMAGES, **options}
+
+
+def get_responsive_filters() -> List[str]:
+    """
+    Get the filter specs of responsive renditions, one per width and format.
+
+    Returns:
+        list[str]: Filter specs, empty if responsive images are disabled.
+    """
+
+    options = get_responsive_settings()
+    if options is None:
+        return []
+
+    width, height = DEFAULT_SIZE
+    return [
+        f"fill-{w}x{round(w * height / width)}|format-{fmt}"
+        for fmt in options["FORMATS"]
+        for w in sorted(options["WIDTHS"])
+    ]
+
+
+class ImageMixin:
+    """A mixin for blocks that render images using a known set of filter specs."""
+
+    image_filters: List[str] = [DEFAULT_FILTER]
+
+    def get_image_filters(self, value: Any) -> List[str]:
+        """
+        Get the filter specs used by the template of this block.
+
+        Args:
+            value (Any): Block value.
+
+        Returns:
+            list[str]: Filter specs.
+        """
+
+        return get_responsive_filters() or list(self.image_filters)
+
+
+@dataclass
+class PrefetchResult:
+    """Statistics of a rendition prefetch"""
+
+    images: int = 0
+    lookups: int = 0
+    created: int = 0
+    queries: int = 0
+
+    @property
+    def queries_saved(self) -> int:
+        """
+        Number of rendition queries saved compared to looking up renditions one by one.
+
+        Returns:
+            int: Saved queries.
+        """
+
+        return max(self.lookups - self.queries, 0)
+
+
+def is_image_block(block: blocks.Block) -> bool:
+    """
+    Whether the value of a block is an image.
+
+    Args:
+        block (Block): Block definition.
+
+    Returns:
+        bool: `True` for `ImageBlock` and `ImageChooserBlock`.
+    """
+
+    return isinstance(block, (ImageBlock, ImageChooserBlock))
+
+
+@functools.lru_cache(maxsize=None)
+def is_wagtail_template(template_name: str) -> bool:
+    """
+    Whether a template name resolves to the template of Wagtail, once per process.
+
+    Args:
+        template_name (str): Template name.
+
+    Returns:
+        bool: `False` when the project overrides the template.
+    """
+
+    try:
+        origin = get_template(template_name).origin
+    except TemplateDoesNotExist:
+        return False
+
+    path = os.path.abspath(str(getattr(origin, "name", "")))
+    return path.startswith(WAGTAIL_IMAGES_DIR + os.sep)
+
+
+def get_block_filters(block: blocks.Block, value: Any) -> Optional[List[str]]:
+    """
+    Get the filter specs Wagtail renders the image of an image block with.
+
+    Args:
+        block (Block): `ImageBlock` or `ImageChooserBlock`.
+        value (AbstractImage): Image.
+
+    Returns:
+        list[str] | None: Filter specs, `None` if the block is rendered
+        by a template whose filters are unknown.
+    """
+
+    template = block.get_template(value)
+    if not template:
+        return [ORIGINAL_FILTER]
+
+    specs = WAGTAIL_TEMPLATE_FILTERS.get(template)
+    if specs is None or not is_wagtail_template(template):
+        return None
+
+    return list(specs)
+
+
+def iter_images(
+    block: blocks.Block,
+    value: Any,
+    filters: Optional[List[str]] = None,
+) -> Iterator[Tuple[AbstractImage, List[str]]]:
+    """
+    Find every image in a block value, along with the filter specs used to render it.
+
+    Images rendered by an `ImageMixin` block use its filters, other images
+    use the filters of the Wagtail template or `render_basic` rendering them.
+    Images rendered by an unknown template are skipped.
+
+    Args:
+        block (Block): Block definition.
+        value (Any): Block value.
+        filters (list[str] | None): Filter specs inherited from the parent block.
+
+    Yields:
+        tuple[AbstractImage, list[str]]: Image and filter specs.
+    """
+
+    if value is None:
+        return
+
+    if is_image_block(block):
+        filters = filters or get_block_filters(block, value)
+        if filters:
+            yield value, filters
+        return
+
+    if isinstance(block, ImageMixin):
+        filters = block.get_image_filters(value)
+
+    for child in streams.iter_children(block, value):
+        yield from iter_images(child.block, child.value, filters)
+
+
+def collect_renditions(
+    instances: Iterable[models.Model],
+    fields: Optional[List[str]] = None,
+) -> Dict[int, Set[str]]:
+    """
+    Collect the renditions used by the image blocks of many objects.
+
+    Args:
+        instances (Iterable[Model]): Objects with `StreamField`s, e.g. pages.
+        fields (list[str] | None): Names of the `StreamField`s, all of them by default.
+
+    Returns:
+        dict[int, set[str]]: Filter specs by image id.
+    """
+
+    wanted: Dict[int, Set[str]] = {}
+
+    for instance in instances:
+        for name in fields or streams.get_stream_fields(type(instance)):
+            stream_value = getattr(instance, name)
+
+            for image, specs in iter_images(stream_value.stream_block, stream_value):
+                wanted.setdefault(image.pk, set()).update(specs)
+
+    return wanted
+
+
+def exclude_existing_renditions(wanted: Dict[int, Set[str]]) -> Dict[int, Set[str]]:
+    """
+    Remove the renditions that were already generated, using a single query.
+
+    Args:
+        wanted (dict[int, set[str]]): Filter specs by image id.
+
+    Returns:
+        dict[int, set[str]]: Missing filter specs by image id.
+    """
+
+    if not wanted:
+        return {}
+
+    Rendition = get_image_model().get_rendition_model()
+    missing = {pk: set(specs) for pk, specs in wanted.items()}
+
+    for image_id, spec in Rendition.objects.filter(
+        image_id__in=wanted.keys(),
+        filter_spec__in={spec for specs in wanted.values() for spec in specs},
+    ).values_list("image_id", "filter_spec"):
+        missing[image_id].discard(spec)
+
+    return {pk: specs for pk, specs in missing.items() if specs}
+
+
+def generate_renditions(image_id: int, specs: Iterable[str]) -> int:
+    """
+    Generate the missing renditions of an image.
+
+    Args:
+        image_id (int): Image id.
+        specs (Iterable[str]): Filter specs.
+
+    Returns:
+        int: Number of renditions generated, `0` if the image or its file is missing.
+    """
+
+    image = get_image_model().objects.filter(pk=image_id).first()
+    if image is None:
+        return 0
+
+    filters = [image.clean_filter_for_svg(Filter(spec=spec)) for spec in specs]
+    missing = [f for f in filters if f not in image.find_existing_renditions(*filters)]
+
+    if not missing:
+        return 0
+
+    try:
+        return len(image.create_renditions(*missing))
+    except SourceImageIOError:
+        return 0
+
+
+def prewarm_renditions(instances: Iterable[models.Model]) -> int:
+    """
+    Generate the missing renditions used by the image blocks of many objects, in-process.
+
+    Args:
+        instances (Iterable[Model]): Objects with `StreamField`s, e.g. pages.
+
+    Returns:
+        int: Number of renditions generated.
+    """
+
+    missing = exclude_existing_renditions(collect_renditions(instances))
+    return sum(generate_renditions(pk, specs) for pk, specs in missing.items())
+
+
+def prefetch_renditions(stream_value: Any) -> PrefetchResult:
+    """
+    Fetch or create every rendition used by the image blocks of a stream, in bulk.
+
+    Renditions are attached to the image instances of the stream,
+    so the `{% image %}` tag doesn't need to query them again.
+
+    Args:
+        stream_value (StreamValue): Stream value, e.g. the value of a page's `StreamField`.
+
+    Returns:
+        PrefetchResult: Prefetch statistics.
+    """
+
+    result = PrefetchResult()
+    wanted: Dict[int, Tuple[List[AbstractImage], Dict[str, Filter]]] = {}
+
+    for image, specs in iter_images(stream_value.stream_block, stream_value):
+        instances, filters = wanted.setdefault(image.pk, ([], {}))
+        instances.append(image)
+        result.lookups += len(specs)
+
+        for spec in specs:
+            filters.setdefault(spec, Filter(spec=spec))
+
+    if not wanted:
+        return result
+
+    result.images = len(wanted)
+    first_image = next(iter(wanted.values()))[0][0]
+    Rendition = first_image.get_rendition_model()
+
+    renditions: Dict[int, List[Any]] = {pk: [] for pk in wanted}
+    for rendition in Rendition.objects.filter(
+        image_id__in=wanted.keys(),
+        filter_spec__in={spec for _, filters in wanted.values() for spec in filters},
+    ):
+        renditions[rendition.image_id].append(rendition)
+
+    result.queries += 1
+
+    for pk, (instances, filters) in wanted.items():
+        image = instances[0]
+        image.prefetched_renditions = renditions[pk]
+
+        # Prefetched renditions are used, so this doesn't query the database
+        clean_filters = [image.clean_filter_for_svg(f) for f in filters.values()]
+        existing = image.find_existing_renditions(*clean_filters)
+        missing = [f for f in clean_filters if f not in existing]
+
+        if missing:
+            try:
+                created = image.create_renditions(*missing)
+            except SourceImageIOError:
+                # Missing files are rendered as not-found images by the templates
+                created = {}
+
+            renditions[pk].extend(created.values())
+            result.created += len(created)
+            result.queries += 1
+
+        # Each instance gets its own copies, so contextual alt text is respected
+        for instance in instances:
+            instance.prefetched_renditions = [
+                copy.copy(rendition) for rendition in renditions[pk]
+            ]
+
+            for rendition in instance.prefetched_renditions:
+                rendition.image = instance
+
+    return result
+
+
+def deduplicate_renditions(renditions: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Keep a single rendition per format and actual width.
+
+    Images smaller than the widths of `WAGTAIL_BLOCKS_RESPONSIVE_IMAGES` aren't
+    upscaled, so several filter specs give renditions of the same width,
+    and a `srcset` would repeat the same width descriptor.
+
+    Args:
+        renditions (dict[str, AbstractRendition]): Renditions by filter spec.
+
+    Returns:
+        dict[str, AbstractRendition]: First rendition of each format and width.
+    """
+
+    seen: Set[Tuple[str, int]] = set()
+    unique = {}
+    for spec, rendition in renditions.items():
+        key = (spec.partition("|format-")[2], rendition.width)
+        if key not in seen:
+            seen.add(key)
+            unique[spec] = rendition
+
+    return unique
+
+
+def render_image(
+    image: AbstractImage,
+    eager: bool = False,
+    attrs: Optional[Dict[str, Any]] = None,
+) -> SafeString:
+    """
+    Render an image of an image block.
+
+    When responsive images are enabled, a `<picture>` with a source per format
+    and a `srcset` per width is rendered. Images are lazy-loaded unless `eager`.
+    Otherwise, a single `DEFAULT_FILTER` rendition is rendered.
+
+    Args:
+        image (AbstractImage): Image.
+        eager (bool): Whether the image is above the fold, e.g. the first carousel slide.
+        attrs (dict | None): Extra HTML attributes of the `<img>` tag.
+
+    Returns:
+        SafeString: HTML.
+    """
+
+    attrs = dict(attrs or {})
+    options = get_responsive_settings()
+
+    if options is None:
+        return mark_safe(
+            get_rendition_or_not_found(image, DEFAULT_FILTER).img_tag(attrs)
+        )
+
+    attrs.setdefault("sizes", options["SIZES"])
+    if not eager:
+        attrs.setdefault("loading", "lazy")
+        attrs.setdefault("decoding", "async")
+
+    renditions = get_renditions_or_not_found(image, get_responsive_filters())
+    return mark_safe(Picture(deduplicate_renditions(renditions), attrs).__html__())
@@ -0,0 +1,177 @@
+"""Render instrumentation of blocks: timings, query counts and output sizes"""
+
+import contextvars
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from django.conf import settings
+from django.db import connection
+from django.utils.html import escape
+from django.utils.safestring import SafeString, mark_safe
+
+from wagtail_blocks.signals import block_rendered
+
+REGISTRY_ATTR = "_wagtail_blocks_timings"
+
+# Path of the block being rendered, used as the prefix of nested block paths
+current_path: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "wagtail_blocks_path", default=""
+)
+
+
+class Timing(NamedTuple):
+    """Measurements of a block render, including its children"""
+
+    block_type: str
+    path: str
+    duration: float
+    queries: int
+    size: int
+
+
+class QueryCounter:
+    """A database execute wrapper counting queries, which works without `DEBUG`"""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def is_enabled() -> bool:
+    """
+    Whether block renders are instrumented.
+
+    Returns:
+        bool: `WAGTAIL_BLOCKS_INSTRUMENTATION` setting, `False` by default.
+    """
+
+    return getattr(settings, "WAGTAIL_BLOCKS_INSTRUMENTATION", False)
+
+
+def get_timings(request: Any) -> List[Timing]:
+    """
+    Get the timings recorded while handling a request.
+
+    Args:
+        request (HttpRequest | None): Request.
+
+    Returns:
+        list[Timing]: Timings, in order of completion.
+    """
+
+    if request is None:
+        return []
+
+    timings = getattr(request, REGISTRY_ATTR, None)
+    if timings is None:
+        timings = []
+        setattr(request, REGISTRY_ATTR, timings)
+
+    return timings
+
+
+def get_server_timing(timings: List[Timing]) -> str:
+    """
+    Build a `Server-Timing` header value, with the total duration of each block type.
+
+    Nested blocks are included in the duration of their parents.
+
+    Args:
+        timings (list[Timing]): Timings.
+
+    Returns:
+        str: Header value.
+    """
+
+    totals: Dict[str, List[float]] = {}
+    for timing in timings:
+        total = totals.setdefault(timing.block_type, [0.0, 0])
+        total[0] += timing.duration
+        total[1] += 1
+
+    return ", ".join(
+        f'block-{name};dur={duration:.2f};desc="{name} x{count}"'
+        for name, (duration, count) in totals.items()
+    )
+
+
+def render_comment(timing: Timing) -> SafeString:
+    """
+    Render a timing as an HTML comment, shown in debug mode.
+
+    Args:
+        timing (Timing): Timing.
+
+    Returns:
+        SafeString: HTML comment.
+    """
+
+    return mark_safe(
+        f"<!-- {escape(timing.path)}: {timing.duration:.2f} ms, "
+        f"{timing.queries} queries, {timing.size} bytes -->"
+    )
+
+
+class TimingMixin:
+    """
+    A mixin recording how long a block takes to render, when instrumentation is enabled.
+
+    Timings are stored on the request, reported by `ServerTimingMiddleware`,
+    sent with `block_rendered` signal, and rendered as HTML comments in debug mode.
+    """
+
+    name: str
+
+    def get_block_path(self, context: Optional[Dict[str, Any]]) -> str:
+        """
+        Get the path of the block being rendered, e.g. `tabs.3f2a/alert.91bc`.
+
+        Args:
+            context (dict | None): Parent template context.
+
+        Returns:
+            str: Block path.
+        """
+
+        block_id = (context or {}).get("id")
+        name = self.name or type(self).__name__
+        segment = f"{name}.{block_id}" if block_id else name
+
+        parent = current_path.get()
+        return f"{parent}/{segment}" if parent else segment
+
+    def render(
+        self, value: Any, context: Optional[Dict[str, Any]] = None
+    ) -> SafeString:
+        if not is_enabled():
+            return super().render(value, context=context)  # type: ignore
+
+        path = self.get_block_path(context)
+        token = current_path.set(path)
+        counter = QueryCounter()
+
+        try:
+            with connection.execute_wrapper(counter):
+                start = time.perf_counter()
+                html = super().render(value, context=context)  # type: ignore
+                duration = (time.perf_counter() - start) * 1000
+        finally:
+            current_path.reset(token)
+
+        request = (context or {}).get("request")
+        timing = Timing(
+            type(self).__name__, path, duration, counter.count, len(html.encode())
+        )
+
+        get_timings(request).append(timing)
+        block_rendered.send(
+            sender=type(self), block=self, timing=timing, request=request
+        )
+
+        if settings.DEBUG:
+            return mark_safe(html + render_comment(timing))
+
+        return html
@@ -0,0 +1,147 @@
+"""Jinja2 extension exposing wagtail_blocks template tags"""
+
+import functools
+from typing import Any, Callable
+
+import jinja2
+from django.template import defaulttags
+from django.templatetags.static import static
+from django.urls import NoReverseMatch, reverse
+from django.utils import formats, timezone, translation
+from django.utils.html import json_script
+from jinja2.ext import Extension
+
+from wagtail_blocks import locales
+from wagtail_blocks.templatetags import wagtail_blocks_tags
+
+
+def with_context(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap a template tag taking the template context as first argument.
+
+    Args:
+        func (Callable): Template tag function.
+
+    Returns:
+        Callable: Jinja2 global receiving the template context.
+    """
+
+    @jinja2.pass_context
+    @functools.wraps(func)
+    def wrapper(context: jinja2.runtime.Context, *args: Any, **kwargs: Any) -> Any:
+        return func(context, *args, **kwargs)
+
+    return wrapper
+
+
+def querystring(query_dict: Any, **kwargs: Any) -> str:
+    """
+    Build a query string from a `QueryDict`, like `querystring` template tag.
+
+    Args:
+        query_dict (QueryDict): Initial parameters, e.g. `request.GET`.
+        kwargs (dict): Parameters to set, `None` to remove.
+
+    Returns:
+        str: Query string, starting with `?`.
+    """
+
+    return defaulttags.querystring(None, query_dict, **kwargs)
+
+
+def url(viewname: str, *args: Any, **kwargs: Any) -> str:
+    """
+    Reverse a URL, like `{% url viewname as var %}` template tag.
+
+    Args:
+        viewname (str): URL pattern name.
+        args (tuple): Positional URL arguments.
+        kwargs (dict): Named URL arguments.
+
+    Returns:
+        str: URL, empty if it doesn't resolve, e.g. when the project doesn't include
+        `django.conf.urls.i18n` for `set_language`.
+    """
+
+    try:
+        return reverse(viewname, args=args or None, kwargs=kwargs or None)
+    except NoReverseMatch:
+        return ""
+
+
+def localize(value: Any) -> Any:
+    """
+    Format a value like Django templates do, e.g. dates in the active locale and time zone.
+
+    Args:
+        value (Any): Value.
+
+    Returns:
+        Any: Localized value.
+    """
+
+    return formats.localize(timezone.template_localtime(value), use_l10n=True)
+
+
+class WagtailBlocksExtension(Extension):
+    """
+    Template tags of wagtail_blocks for Jinja2 templates, used by the Jinja2 template set.
+
+    Gettext functions are only added if they are not installed already,
+    e.g. by `jinja2.ext.i18n` extension.
+    """
+
+    def __init__(self, environment: jinja2.Environment) -> None:
+        super().__init__(environment)
+
+        self.environment.globals.update(
+            {
+                "page_tree": with_context(wagtail_blocks_tags.page_tree),
+                "sibling_navigation": with_context(
+                    wagtail_blocks_tags.sibling_navigation
+                ),
+                "page_translations": with_context(
+                    wagtail_blocks_tags.page_translations
+                ),
+                "language_options": wagtail_blocks_tags.language_options,
+                "breadcrumbs": with_context(wagtail_blocks_tags.breadcrumbs),
+                "load_breadcrumbs": with_context(wagtail_blocks_tags.load_breadcrumbs),
+                "prefetch_renditions": wagtail_blocks_tags.prefetch_renditions,
+                "prefetch_documents": wagtail_blocks_tags.prefetch_documents,
+                "prefetch_stream": wagtail_blocks_tags.prefetch_stream,
+                "block_image": wagtail_blocks_tags.block_image,
+                "block_styles": wagtail_blocks_tags.block_styles,
+                "get_themes": wagtail_blocks_tags.get_themes,
+                "theme_urls": wagtail_blocks_tags.theme_urls,
+                "theme_stylesheet": wagtail_blocks_tags.theme_stylesheet,
+                "use_asset": with_context(wagtail_blocks_tags.use_asset),
+                "render_assets": with_context(wagtail_blocks_tags.render_assets),
+                "asset_hints": with_context(wagtail_blocks_tags.asset_hints),
+                "stream_blocks": with_context(wagtail_blocks_tags.stream_blocks),
+                "prerendered_stream": with_context(
+                    wagtail_blocks_tags.prerendered_stream
+                ),
+                "get_language_info": locales.get_language_info,
+                "querystring": querystring,
+                "static": static,
+                "url": url,
+            }
+        )
+        self.environment.filters.update(
+            {
+                "json_script": json_script,
+                "localize": localize,
+            }
+        )
+
+        for name, func in [
+            ("_", translation.gettext),
+            ("gettext", translation.gettext),
+            ("ngettext", translation.ngettext),
+            ("pgettext", translation.pgettext),
+        ]:
+            self.environment.globals.setdefault(name, func)
+
+
+# Nicer import names
+blocks = WagtailBlocksExtension
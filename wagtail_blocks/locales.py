@@ -0,0 +1,188 @@
+"""Language switcher helpers used by `components/languages.html`"""
+
+import functools
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.http import HttpRequest
+from django.template.loader import render_to_string
+from django.utils import translation
+from django.utils.safestring import SafeString, mark_safe
+from wagtail.models import Page
+
+from wagtail_blocks import cache, navigation
+
+TRANSLATIONS_KEY_PREFIX = "wagtail_blocks:translations"
+VERSION_KEY_PREFIX = "wagtail_blocks:translations:version"
+
+
+@functools.lru_cache(maxsize=None)
+def get_language_info(language_code: str) -> Dict[str, Any]:
+    """
+    Get the information of a language, once per process.
+
+    Args:
+        language_code (str): Language code.
+
+    Returns:
+        dict[str, Any]: Language information, `name_translated` is translated lazily.
+
+    Raises:
+        KeyError: If the language is unknown.
+    """
+
+    return translation.get_language_info(language_code)
+
+
+@dataclass
+class TranslationLink:
+    """A live translation of a page"""
+
+    id: int
+    language_code: str
+    url: Optional[str]
+
+    @property
+    def info(self) -> Dict[str, Any]:
+        """
+        Information of the language of the translation.
+
+        Returns:
+            dict[str, Any]: Language information.
+        """
+
+        return get_language_info(self.language_code)
+
+
+def load_translations(
+    page: Page,
+    request: Optional[HttpRequest] = None,
+) -> List[TranslationLink]:
+    """
+    Load the live pages of the translation group of a page using a single query.
+
+    Args:
+        page (Page): Wagtail page.
+        request (HttpRequest | None): Current request, used to build page URLs.
+
+    Returns:
+        list[TranslationLink]: Live translations, including `page` if it is live.
+    """
+
+    pages = (
+        Page.objects.filter(translation_key=page.translation_key)
+        .live()
+        .select_related("locale")
+        .order_by("path")
+    )
+
+    return [
+        TranslationLink(
+            id=translation.pk,
+            language_code=translation.locale.language_code,
+            url=translation.get_url(request=request),
+        )
+        for translation in pages
+    ]
+
+
+def get_version(translation_key: Any) -> int:
+    """
+    Get the version of a translation group.
+
+    Args:
+        translation_key (UUID): Translation key of the group.
+
+    Returns:
+        int: Translation group version.
+    """
+
+    backend = cache.get_backend()
+    if backend is None:
+        return 0
+
+    return backend.get_or_set(
+        f"{VERSION_KEY_PREFIX}:{translation_key}", cache.new_version, None
+    )
+
+
+def bump_versions(translation_keys: Iterable[Any]) -> None:
+    """
+    Invalidate the cached translations of some translation groups.
+
+    Args:
+        translation_keys (Iterable[UUID]): Translation keys of the changed groups.
+    """
+
+    backend = cache.get_backend()
+    if backend is None:
+        return
+
+    for translation_key in set(translation_keys):
+        key = f"{VERSION_KEY_PREFIX}:{translation_key}"
+        try:
+            backend.incr(key)
+        except ValueError:
+            backend.set(key, cache.new_version(), None)
+
+
+def get_translations(
+    page: Page,
+    request: Optional[HttpRequest] = None,
+) -> List[TranslationLink]:
+    """
+    Get the live translations of a page from the cache of its translation group.
+
+    The group is shared by every page of the group and invalidated when any page
+    of the group is published, unpublished, moved or deleted, in any locale.
+
+    Args:
+        page (Page): Wagtail page.
+        request (HttpRequest | None): Current request, used to build page URLs.
+
+    Returns:
+        list[TranslationLink]: Live translations, excluding `page`.
+    """
+
+    backend = cache.get_backend()
+    if backend is None:
+        group = load_translations(page, request)
+    else:
+        site = navigation.get_site(request)
+        key = ":".join(
+            [
+                TRANSLATIONS_KEY_PREFIX,
+                str(page.translation_key),
+                str(get_version(page.translation_key)),
+                str(site.pk if site else ""),
+            ]
+        )
+
+        group = backend.get(key)
+        if group is None:
+            group = load_translations(page, request)
+            backend.set(key, group, cache.get_timeout())
+
+    return [link for link in group if link.id != page.pk]
+
+
+@functools.lru_cache(maxsize=None)
+def render_language_options(language_code: Optional[str]) -> SafeString:
+    """
+    Render the options of the `LANGUAGES` setting, once per process and active language.
+
+    Args:
+        language_code (str | None): Active language.
+
+    Returns:
+        SafeString: HTML.
+    """
+
+    with translation.override(language_code):
+        return mark_safe(
+            render_to_string(
+                "wagtail/components/language_options.html",
+                {"LANGUAGES": settings.LANGUAGES, "LANGUAGE_CODE": language_code},
+            )
+        )
@@ -0,0 +1,209 @@
+"""Measure the rendering of every block on synthetic StreamFields"""
+
+import json
+import platform
+from typing import Any, Dict, List
+
+import django
+import wagtail
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+from django.test.utils import override_settings
+
+from wagtail_blocks import benchmark
+
+# Measurements compared to the baseline, where lower is better
+COMPARED = ["time_ms", "queries", "peak_kb", "bytes"]
+
+
+class Command(BaseCommand):
+    """
+    Render synthetic `StreamField`s of every block and report, per scenario,
+    the median render time, database queries, peak memory and output size.
+
+    Images and documents are created in a transaction which is rolled back,
+    their files and renditions are deleted, so the database is left untouched.
+    Run it against a local SQLite project for reproducible results.
+    """
+
+    help = "Benchmark the rendering of every block"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            dest="scenarios",
+            choices=list(benchmark.SCENARIOS),
+            help="Only run this scenario, can be repeated. All scenarios by default.",
+        )
+        parser.add_argument(
+            "--size",
+            type=int,
+            default=20,
+            help="Number of blocks or items of each scenario.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of timed renders, the median is reported.",
+        )
+        parser.add_argument(
+            "--fixtures",
+            type=int,
+            default=10,
+            help="Number of images and documents referenced by blocks.",
+        )
+        parser.add_argument(
+            "--cache",
+            action="store_true",
+            help="Enable the fragment cache, which is disabled by default.",
+        )
+        parser.add_argument(
+            "--save",
+            metavar="PATH",
+            help="Save results as a baseline JSON file.",
+        )
+        parser.add_argument(
+            "--compare",
+            metavar="PATH",
+            help="Compare results to a baseline JSON file, fail on regressions.",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=10.0,
+            help="Relative increase, in percent, reported as a regression.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["size"] < 2 or options["repeat"] < 1 or options["fixtures"] < 2:
+            raise CommandError("--size and --fixtures must be at least 2, --repeat 1.")
+
+        baseline = None
+        if options["compare"]:
+            try:
+                with open(options["compare"], encoding="utf-8") as file:
+                    baseline = json.load(file)
+            except (OSError, ValueError) as error:
+                raise CommandError(f"Cannot read baseline: {error}") from error
+
+        names = options["scenarios"] or list(benchmark.SCENARIOS)
+        results = self.run(names, options)
+
+        self.stdout.write(
+            f"{'scenario':<16}{'time (ms)':>12}{'queries':>10}{'peak (KB)':>12}{'bytes':>10}"
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<16}{result['time_ms']:>12.2f}{result['queries']:>10}"
+                f"{result['peak_kb']:>12.1f}{result['bytes']:>10}"
+            )
+
+        report = {
+            "environment": {
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "wagtail": wagtail.__version__,
+                "size": options["size"],
+                "repeat": options["repeat"],
+                "cache": options["cache"],
+            },
+            "results": results,
+        }
+
+        if options["save"]:
+            with open(options["save"], "w", encoding="utf-8") as file:
+                json.dump(report, file, indent=2)
+
+            self.stdout.write(f"Saved baseline to {options['save']}.")
+
+        if baseline is not None:
+            self.compare(report, baseline, options["threshold"])
+
+    def run(self, names: List[str], options: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run scenarios on fixtures which are rolled back afterward.
+
+        Args:
+            names (list[str]): Scenario names.
+            options (dict): Command options.
+
+        Returns:
+            dict[str, dict]: Measurements by scenario.
+        """
+
+        stream_block = benchmark.get_stream_block()
+        results = {}
+
+        with (
+            override_settings(WAGTAIL_BLOCKS_CACHE=options["cache"]),
+            transaction.atomic(),
+        ):
+            fixtures = benchmark.create_fixtures(options["fixtures"])
+            try:
+                for name in names:
+                    data = benchmark.assign_ids(
+                        stream_block,
+                        benchmark.SCENARIOS[name](fixtures, options["size"]),
+                    )
+                    result = benchmark.measure(stream_block, data, options["repeat"])
+                    results[name] = result._asdict()
+
+                    if options["verbosity"] > 1:
+                        self.stdout.write(f"{name}: {result}")
+            finally:
+                benchmark.delete_fixtures(fixtures)
+                transaction.set_rollback(True)
+
+        return results
+
+    def compare(
+        self, report: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+    ) -> None:
+        """
+        Compare results to a baseline and fail if any measurement regressed.
+
+        Args:
+            report (dict): Current report.
+            baseline (dict): Baseline report.
+            threshold (float): Relative increase, in percent, reported as a regression.
+
+        Raises:
+            CommandError: If a measurement increased more than `threshold`.
+        """
+
+        if report["environment"] != baseline.get("environment"):
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Baseline environment differs: {baseline.get('environment')}"
+                )
+            )
+
+        regressions = []
+        for name, result in report["results"].items():
+            previous = baseline.get("results", {}).get(name)
+            if previous is None:
+                continue
+
+            for key in COMPARED:
+                before, after = previous.get(key), result[key]
+                if not before:
+                    continue
+
+                change = (after - before) / before * 100
+                if change > threshold:
+                    regressions.append(
+                        f"{name} {key}: {before} -> {after} (+{change:.1f}%)"
+                    )
+                elif change < -threshold:
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f"{name} {key}: {before} -> {after} ({change:.1f}%)"
+                        )
+                    )
+
+        if regressions:
+            raise CommandError("Regressions found:\n" + "\n".join(regressions))
+
+        self.stdout.write(self.style.SUCCESS("No regressions found."))
@@ -0,0 +1,156 @@
+"""Measure the latency of a page with many slow embeds, with and without prefetching"""
+
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from wagtail.embeds.finders import get_finders
+from wagtail.embeds.models import Embed
+
+from wagtail_blocks import benchmark, prefetch
+
+# Render modes compared, from the slowest
+MODES = ["render", "sync", "concurrent"]
+
+
+class Command(BaseCommand):
+    """
+    Render a tabs block whose tabs embed videos from a provider answering after a delay.
+
+    Embeds are fetched while rendering, by `prefetch_stream` one after the other,
+    then by `aprefetch_stream` concurrently. Embeds stored by Wagtail are deleted
+    before every render, so providers are always queried, and afterward.
+    """
+
+    help = "Benchmark the concurrent prefetch of embeds"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--embeds",
+            type=int,
+            default=20,
+            help="Number of embeds in the page.",
+        )
+        parser.add_argument(
+            "--delay",
+            type=float,
+            default=0.2,
+            help="Response time of the embed provider, in seconds.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Number of timed renders, the median is reported.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["embeds"] < 1 or options["repeat"] < 1:
+            raise CommandError("--embeds and --repeat must be at least 1.")
+
+        finders = [
+            {
+                "class": "wagtail_blocks.benchmark.SlowEmbedFinder",
+                "delay": options["delay"],
+            }
+        ]
+        stream_block = benchmark.get_stream_block()
+        data = benchmark.assign_ids(
+            stream_block, benchmark.build_embeds(options["embeds"])
+        )
+        renders: Dict[str, Callable[[Any], str]] = {
+            "render": lambda value: self.render(value),
+            "sync": lambda value: self.render(value, concurrent=False),
+            "concurrent": lambda value: self.render(value, concurrent=True),
+        }
+
+        timings: Dict[str, float] = {}
+        outputs: Dict[str, str] = {}
+
+        get_finders.cache_clear()
+        try:
+            with override_settings(
+                WAGTAILEMBEDS_FINDERS=finders, WAGTAIL_BLOCKS_CACHE=False
+            ):
+                for mode in MODES:
+                    timings[mode], outputs[mode] = self.measure(
+                        stream_block, data, renders[mode], options["repeat"]
+                    )
+        finally:
+            get_finders.cache_clear()
+            self.delete_embeds()
+
+        self.stdout.write(f"{'mode':<14}{'time (ms)':>12}{'speedup':>10}")
+        for mode in MODES:
+            speedup = timings["render"] / timings[mode] if timings[mode] else 0
+            self.stdout.write(f"{mode:<14}{timings[mode]:>12.1f}{speedup:>9.1f}x")
+
+        if len(set(outputs.values())) > 1:
+            raise CommandError("Outputs differ between modes.")
+
+        self.stdout.write(self.style.SUCCESS("Outputs are identical."))
+
+    def measure(
+        self,
+        stream_block: Any,
+        data: List[Dict[str, Any]],
+        render: Callable[[Any], str],
+        repeat: int,
+    ) -> Tuple[float, str]:
+        """
+        Render a page of embeds, without stored embeds.
+
+        Args:
+            stream_block (StreamBlock): Stream block.
+            data (list[dict]): Raw stream data.
+            render (Callable): Render function, taking a stream value.
+            repeat (int): Number of timed renders.
+
+        Returns:
+            tuple[float, str]: Median render time in milliseconds and output.
+        """
+
+        durations: List[float] = []
+        output = ""
+
+        for _ in range(repeat):
+            # Stored embeds are deleted, so providers are queried again
+            self.delete_embeds()
+            value = stream_block.to_python(data)
+
+            start = time.perf_counter()
+            output = render(value)
+            durations.append(time.perf_counter() - start)
+
+        return statistics.median(durations) * 1000, output
+
+    def render(self, stream_value: Any, concurrent: Any = None) -> str:
+        """
+        Render a stream, after prefetching it unless `concurrent` is `None`.
+
+        Args:
+            stream_value (StreamValue): Stream value.
+            concurrent (bool | None): Whether to prefetch concurrently.
+
+        Returns:
+            str: HTML.
+        """
+
+        context = {"request": RequestFactory().get("/")}
+
+        if concurrent:
+            return async_to_sync(prefetch.arender_stream)(stream_value, context)
+
+        if concurrent is not None:
+            prefetch.prefetch_stream(stream_value, concurrent=False)
+
+        return stream_value.render_as_block(context=context)
+
+    def delete_embeds(self) -> None:
+        """Delete the embeds stored by earlier renders."""
+
+        Embed.objects.filter(url__startswith=benchmark.SLOW_EMBED_URL).delete()
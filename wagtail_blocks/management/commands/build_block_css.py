@@ -0,0 +1,69 @@
+"""Build the per-page stylesheets of every object with a StreamField"""
+
+from typing import Any, Dict, Set
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from wagtail_blocks import css, streams
+
+
+class Command(BaseCommand):
+    """
+    Save the content-addressed stylesheet of every object with a `StreamField`.
+
+    Objects using the same blocks and choices share the same stylesheet,
+    which is only saved once.
+    """
+
+    help = "Build the minimal stylesheets used by StreamFields"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--model",
+            action="append",
+            dest="models",
+            metavar="APP_LABEL.MODEL",
+            help="Only scan this model, can be repeated. All models by default.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of objects loaded from the database at once.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            stream_models = streams.get_stream_models(options["models"])
+        except (LookupError, ValueError) as error:
+            raise CommandError(error) from error
+
+        base = css.get_templates_classes(
+            getattr(settings, "WAGTAIL_BLOCKS_PURGE_TEMPLATES", [])
+        )
+        stylesheets: Dict[str, int] = {}
+        objects = 0
+
+        for model, fields in stream_models.items():
+            for instance in model._default_manager.iterator(
+                chunk_size=options["chunk_size"]
+            ):
+                classes: Set[str] = set(base)
+                for name in fields:
+                    classes.update(css.get_stream_classes(getattr(instance, name)))
+
+                stylesheet = css.build_stylesheet(frozenset(classes))
+                url = css.save_stylesheet(stylesheet)
+                stylesheets[url] = len(stylesheet.encode())
+                objects += 1
+
+        full_size = len(css.serialize(css.get_rules()).encode())
+        average = sum(stylesheets.values()) / len(stylesheets) if stylesheets else 0
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Built {len(stylesheets)} stylesheets for {objects} objects, "
+                f"{average / 1024:.1f} KB on average instead of {full_size / 1024:.1f} KB."
+            )
+        )
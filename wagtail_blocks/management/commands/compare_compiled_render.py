@@ -0,0 +1,190 @@
+"""Compare the compiled render of blocks to their templates, byte for byte"""
+
+import difflib
+import functools
+import statistics
+import time
+from typing import Any, Dict, List, Tuple
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+from django.test.utils import override_settings
+
+from wagtail_blocks import benchmark, compiled
+
+Case = Tuple[str, List[Dict[str, Any]], Dict[str, Any]]
+
+
+class Command(BaseCommand):
+    """
+    Render blocks with their templates, then with compiled builders.
+
+    Outputs must be byte-identical, and the median render time of both modes
+    is reported. Blocks are rendered from the scenarios of `benchmark_blocks`
+    command, on fixtures which are rolled back afterward. Escaping is covered
+    by the tests of `wagtail_blocks.tests.test_compiled`.
+    """
+
+    help = "Check that compiled builders render exactly like templates and compare their speed"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--size",
+            type=int,
+            default=10,
+            help="Number of blocks of each scenario.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of timed renders, the median is reported.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        stream_block = benchmark.get_stream_block()
+
+        for name in compiled.BUILDERS:
+            if not compiled.is_package_template(name):
+                self.stdout.write(
+                    self.style.WARNING(f"{name} is overridden, it is not compiled.")
+                )
+
+        with transaction.atomic():
+            fixtures = benchmark.create_fixtures(3)
+            try:
+                results = [
+                    (name, self.compare(stream_block, data, overrides, options))
+                    for name, data, overrides in self.get_cases(
+                        stream_block, fixtures, options["size"]
+                    )
+                ]
+            finally:
+                benchmark.delete_fixtures(fixtures)
+                transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"{'case':<24}{'equal':>7}{'template (ms)':>16}{'compiled (ms)':>16}{'speedup':>10}"
+        )
+
+        mismatches = []
+        for name, (outputs, timings) in results:
+            equal = outputs[False] == outputs[True]
+            speedup = timings[False] / timings[True] if timings[True] else 0
+            self.stdout.write(
+                f"{name:<24}{'yes' if equal else 'NO':>7}{timings[False]:>16.2f}"
+                f"{timings[True]:>16.2f}{speedup:>9.1f}x"
+            )
+
+            if not equal:
+                mismatches.append(name)
+                if options["verbosity"] > 1:
+                    self.write_diff(outputs[False], outputs[True])
+
+        if mismatches:
+            raise CommandError(f"Outputs differ: {', '.join(mismatches)}")
+
+        self.stdout.write(self.style.SUCCESS("Outputs are identical."))
+
+    def get_cases(
+        self,
+        stream_block: Any,
+        fixtures: benchmark.Fixtures,
+        size: int,
+    ) -> List[Case]:
+        """
+        Get the streams to render.
+
+        Args:
+            stream_block (StreamBlock): Stream block.
+            fixtures (Fixtures): Images and documents.
+            size (int): Number of blocks of each scenario.
+
+        Returns:
+            list[tuple[str, list[dict], dict]]: Case names, raw stream data
+            and settings overridden while rendering.
+        """
+
+        scenarios = ["alert", "code", "diff", "code_pen", "code_sandbox"]
+        scenarios += ["stack_blitz", "expo_snack"]
+
+        cases: List[Case] = [
+            (name, benchmark.BLOCK_SCENARIOS[name](fixtures, size), {})
+            for name in scenarios
+        ]
+        cases += [
+            (
+                "code (highlighted)",
+                benchmark.build_code(fixtures, size),
+                {"WAGTAIL_BLOCKS_HIGHLIGHT": True},
+            ),
+            (
+                "diff (responsive)",
+                benchmark.build_diff(fixtures, size),
+                {"WAGTAIL_BLOCKS_RESPONSIVE_IMAGES": True},
+            ),
+        ]
+
+        return [
+            (name, benchmark.assign_ids(stream_block, data), overrides)
+            for name, data, overrides in cases
+        ]
+
+    def compare(
+        self,
+        stream_block: Any,
+        data: List[Dict[str, Any]],
+        overrides: Dict[str, Any],
+        options: Dict[str, Any],
+    ) -> Tuple[Dict[bool, str], Dict[bool, float]]:
+        """
+        Render a stream with templates, then with compiled builders.
+
+        Args:
+            stream_block (StreamBlock): Stream block.
+            data (list[dict]): Raw stream data.
+            overrides (dict): Settings overridden while rendering.
+            options (dict): Command options.
+
+        Returns:
+            tuple[dict[bool, str], dict[bool, float]]: Outputs and median
+            render times in milliseconds, by compiled mode.
+        """
+
+        render = functools.partial(benchmark.render, stream_block, data)
+
+        outputs, timings = {}, {}
+        for enabled in (False, True):
+            with override_settings(
+                WAGTAIL_BLOCKS_CACHE=False,
+                WAGTAIL_BLOCKS_COMPILED_RENDER=enabled,
+                **overrides,
+            ):
+                outputs[enabled] = render()
+
+                durations = []
+                for _ in range(options["repeat"]):
+                    start = time.perf_counter()
+                    render()
+                    durations.append(time.perf_counter() - start)
+
+                timings[enabled] = statistics.median(durations) * 1000
+
+        return outputs, timings
+
+    def write_diff(self, expected: str, actual: str) -> None:
+        """
+        Write the differences between two outputs.
+
+        Args:
+            expected (str): Template output.
+            actual (str): Compiled output.
+        """
+
+        diff = difflib.unified_diff(
+            expected.splitlines(keepends=True),
+            actual.splitlines(keepends=True),
+            "template",
+            "compiled",
+        )
+        self.stdout.write("".join(diff), ending="")
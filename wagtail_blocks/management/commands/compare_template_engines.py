@@ -0,0 +1,300 @@
+"""Compare the Django and Jinja2 template sets, for equivalence and speed"""
+
+import difflib
+import re
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from django import forms
+from django.conf import settings
+from django.contrib.messages import constants as message_constants
+from django.contrib.messages.storage.base import Message
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.utils import translation
+from wagtail.models import Page
+
+from wagtail_blocks import benchmark
+
+DJANGO_BACKEND = "django.template.backends.django.DjangoTemplates"
+JINJA2_BACKEND = "django.template.backends.jinja2.Jinja2"
+
+# Jinja2 engine used when the project has none
+DEFAULT_JINJA2 = {
+    "BACKEND": JINJA2_BACKEND,
+    "APP_DIRS": True,
+    "OPTIONS": {
+        "extensions": [
+            "wagtail.jinja2tags.core",
+            "wagtail.images.jinja2tags.images",
+            "wagtail_blocks.jinja2tags.blocks",
+        ],
+    },
+}
+
+CSRF_RE = re.compile(r'(name="csrfmiddlewaretoken" value=")[^"]*"')
+SPACE_RE = re.compile(r"\s+")
+TAG_SPACE_RE = re.compile(r">\s+<")
+
+
+def normalize(html: str) -> str:
+    """
+    Normalize HTML, so differences that don't change the rendered page are ignored.
+
+    Whitespace, empty comments used as formatting markers, CSRF token masks and
+    equivalent character references, e.g. `&#39;` and `&#x27;`, are normalized.
+
+    Args:
+        html (str): HTML.
+
+    Returns:
+        str: Normalized HTML.
+    """
+
+    html = html.replace("<!---->", "")
+    html = html.replace("&#39;", "&#x27;").replace("&#34;", "&quot;")
+    html = CSRF_RE.sub(r'\1"', html)
+    html = TAG_SPACE_RE.sub("><", html)
+
+    return SPACE_RE.sub(" ", html).strip()
+
+
+class SampleForm(forms.Form):
+    """A form with errors, rendered by `form.html`"""
+
+    name = forms.CharField()
+    email = forms.EmailField()
+
+
+class Command(BaseCommand):
+    """
+    Render every block and component with Django templates, then with Jinja2 templates.
+
+    Outputs are compared after normalization, and the median render time
+    of both engines is reported. Blocks are rendered from the scenarios of
+    `benchmark_blocks` command, on fixtures which are rolled back afterward.
+    """
+
+    help = "Check that Jinja2 templates render like Django templates and compare their speed"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--size",
+            type=int,
+            default=10,
+            help="Number of blocks or items of each block scenario.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of timed renders, the median is reported.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        django_templates = [
+            engine
+            for engine in settings.TEMPLATES
+            if engine["BACKEND"] == DJANGO_BACKEND
+        ]
+        jinja2_templates = [
+            engine
+            for engine in settings.TEMPLATES
+            if engine["BACKEND"] == JINJA2_BACKEND
+        ] or [DEFAULT_JINJA2]
+
+        if not django_templates:
+            raise CommandError("A DjangoTemplates engine is required.")
+
+        engines = {
+            "django": django_templates,
+            # Templates missing from the Jinja2 set fall back to Django templates
+            "jinja2": jinja2_templates + django_templates,
+        }
+
+        with transaction.atomic():
+            fixtures = benchmark.create_fixtures(3)
+            try:
+                cases = self.get_cases(fixtures, options["size"])
+                results = [
+                    (name, self.compare(render, engines, options))
+                    for name, render in cases
+                ]
+            finally:
+                benchmark.delete_fixtures(fixtures)
+                transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"{'case':<32}{'equal':>7}{'django (ms)':>14}{'jinja2 (ms)':>14}{'speedup':>10}"
+        )
+
+        mismatches = []
+        for name, (outputs, timings) in results:
+            equal = outputs["django"] == outputs["jinja2"]
+            speedup = timings["django"] / timings["jinja2"] if timings["jinja2"] else 0
+            self.stdout.write(
+                f"{name:<32}{'yes' if equal else 'NO':>7}{timings['django']:>14.2f}"
+                f"{timings['jinja2']:>14.2f}{speedup:>9.1f}x"
+            )
+
+            if not equal:
+                mismatches.append(name)
+                if options["verbosity"] > 1:
+                    self.write_diff(outputs["django"], outputs["jinja2"])
+
+        if mismatches:
+            raise CommandError(f"Outputs differ: {', '.join(mismatches)}")
+
+        self.stdout.write(self.style.SUCCESS("Outputs are equivalent."))
+
+    def get_cases(
+        self, fixtures: benchmark.Fixtures, size: int
+    ) -> List[Tuple[str, Callable[[], str]]]:
+        """
+        Get the blocks and components to render.
+
+        Args:
+            fixtures (Fixtures): Images and documents.
+            size (int): Number of blocks or items of each block scenario.
+
+        Returns:
+            list[tuple[str, Callable]]: Case names and render functions.
+        """
+
+        stream_block = benchmark.get_stream_block()
+        cases: List[Tuple[str, Callable[[], str]]] = []
+
+        for name, build in benchmark.BLOCK_SCENARIOS.items():
+            data = benchmark.assign_ids(stream_block, build(fixtures, size))
+            cases.append(
+                (
+                    f"blocks/{name}",
+                    lambda data=data: benchmark.render(stream_block, data),
+                )
+            )
+
+        paginator = Paginator(range(100), 10)
+        form = SampleForm(data={"email": "invalid"})
+        messages = [
+            Message(level, f"Message {tag}")
+            for tag, level in [
+                ("info", message_constants.INFO),
+                ("success", message_constants.SUCCESS),
+                ("warning", message_constants.WARNING),
+                ("error", message_constants.ERROR),
+                ("debug", message_constants.DEBUG),
+            ]
+        ]
+        page = Page.objects.live().filter(depth__gt=2).order_by("path").first()
+
+        languages = {
+            "LANGUAGES": settings.LANGUAGES,
+            "LANGUAGE_CODE": translation.get_language(),
+            "redirect_to": "/",
+        }
+        contexts: List[Tuple[str, str, Dict[str, Any]]] = [
+            ("form", "form", {"form": form, "action": "/submit/"}),
+            ("languages", "languages", languages),
+            ("messages", "messages", {"messages": messages}),
+            (
+                "pagination",
+                "pagination",
+                {"is_paginated": True, "page_obj": paginator.page(3)},
+            ),
+            ("themes", "themes", {}),
+        ]
+        if page is not None:
+            contexts += [
+                ("breadcrumbs", "breadcrumbs", {"page": page}),
+                ("languages (page)", "languages", {**languages, "page": page}),
+                ("prev_next", "prev_next", {"page": page}),
+                ("tree", "tree", {"page": page.get_parent(), "depth": 3}),
+            ]
+        else:
+            self.stdout.write(self.style.WARNING("No live pages, skipping navigation."))
+
+        for name, template, context in contexts:
+            cases.append(
+                (
+                    f"components/{name}",
+                    lambda template=f"wagtail/components/{template}.html", context=context: (
+                        self.render(template, context)
+                    ),
+                )
+            )
+
+        return cases
+
+    def render(self, template_name: str, context: Dict[str, Any]) -> str:
+        """
+        Render a component template, with a new request every time.
+
+        Args:
+            template_name (str): Template name.
+            context (dict): Template context.
+
+        Returns:
+            str: HTML.
+        """
+
+        request = RequestFactory().get("/", {"q": "blocks", "page": 3})
+        return render_to_string(
+            template_name, {"request": request, **context}, request=request
+        )
+
+    def compare(
+        self,
+        render: Callable[[], str],
+        engines: Dict[str, List[Dict[str, Any]]],
+        options: Dict[str, Any],
+    ) -> Tuple[Dict[str, str], Dict[str, float]]:
+        """
+        Render a case with every engine.
+
+        Args:
+            render (Callable): Render function.
+            engines (dict[str, list[dict]]): `TEMPLATES` setting of each engine.
+            options (dict): Command options.
+
+        Returns:
+            tuple[dict[str, str], dict[str, float]]: Normalized outputs and
+            median render times in milliseconds, by engine.
+        """
+
+        outputs, timings = {}, {}
+        for name, templates in engines.items():
+            with override_settings(TEMPLATES=templates, WAGTAIL_BLOCKS_CACHE=False):
+                outputs[name] = normalize(render())
+
+                durations = []
+                for _ in range(options["repeat"]):
+                    start = time.perf_counter()
+                    render()
+                    durations.append(time.perf_counter() - start)
+
+                timings[name] = statistics.median(durations) * 1000
+
+        return outputs, timings
+
+    def write_diff(self, expected: str, actual: str) -> None:
+        """
+        Write the differences between two normalized outputs, one tag per line.
+
+        Args:
+            expected (str): Django output.
+            actual (str): Jinja2 output.
+        """
+
+        diff = difflib.unified_diff(
+            expected.replace("><", ">\n<").splitlines(),
+            actual.replace("><", ">\n<").splitlines(),
+            "django",
+            "jinja2",
+            lineterm="",
+        )
+        self.stdout.write("\n".join(diff))
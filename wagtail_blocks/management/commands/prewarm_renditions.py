@@ -0,0 +1,147 @@
+"""Generate the renditions used by image blocks ahead of the first visitor"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Set
+
+import django
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connections
+
+from wagtail_blocks import images, streams
+
+
+def init_worker() -> None:
+    """Set up Django in a worker process, required by the `spawn` start method."""
+
+    if not apps.ready:
+        django.setup()
+
+
+class Command(BaseCommand):
+    """
+    Scan `StreamField`s for image blocks and generate every missing rendition.
+
+    Only renditions whose filter specs are known are generated, images rendered
+    by a project template are left to be rendered on demand. Renditions that
+    already exist are skipped, so an interrupted run can be resumed by running
+    the command again.
+    """
+
+    help = "Generate the renditions used by image blocks in StreamFields"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--model",
+            action="append",
+            dest="models",
+            metavar="APP_LABEL.MODEL",
+            help="Only scan this model, can be repeated. All models by default.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of worker processes, 1 to generate renditions in-process.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of objects loaded from the database at once.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report missing renditions without generating them.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        self.verbosity = options["verbosity"]
+        try:
+            stream_models = streams.get_stream_models(options["models"])
+        except (LookupError, ValueError) as error:
+            raise CommandError(error) from error
+
+        wanted: Dict[int, Set[str]] = {}
+        for model, fields in stream_models.items():
+            instances = model._default_manager.iterator(
+                chunk_size=options["chunk_size"]
+            )
+
+            for pk, specs in images.collect_renditions(instances, fields).items():
+                wanted.setdefault(pk, set()).update(specs)
+
+        total = sum(len(specs) for specs in wanted.values())
+        missing = images.exclude_existing_renditions(wanted)
+        pending = sum(len(specs) for specs in missing.values())
+
+        self.stdout.write(
+            f"Found {total} renditions of {len(wanted)} images, "
+            f"{total - pending} already exist, {pending} missing."
+        )
+
+        if options["dry_run"] or not missing:
+            return
+
+        start = time.perf_counter()
+        created = self.generate(missing, max(options["workers"], 1))
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {created} renditions in {elapsed:.2f}s "
+                f"({created / elapsed if elapsed else 0:.1f} renditions/s)."
+            )
+        )
+
+    def generate(self, missing: Dict[int, Set[str]], workers: int) -> int:
+        """
+        Generate missing renditions, one task per image.
+
+        Args:
+            missing (dict[int, set[str]]): Missing filter specs by image id.
+            workers (int): Number of worker processes.
+
+        Returns:
+            int: Number of renditions generated.
+        """
+
+        created = 0
+
+        if workers == 1:
+            for done, (pk, specs) in enumerate(missing.items(), start=1):
+                created += images.generate_renditions(pk, specs)
+                self.report(done, len(missing), created)
+
+            return created
+
+        # Connections must not be shared with forked processes
+        connections.close_all()
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+            futures = [
+                pool.submit(images.generate_renditions, pk, sorted(specs))
+                for pk, specs in missing.items()
+            ]
+
+            for done, future in enumerate(as_completed(futures), start=1):
+                created += future.result()
+                self.report(done, len(futures), created)
+
+        return created
+
+    def report(self, done: int, total: int, created: int) -> None:
+        """
+        Report progress, when verbosity is 2 or higher.
+
+        Args:
+            done (int): Number of processed images.
+            total (int): Number of images to process.
+            created (int): Number of renditions generated so far.
+        """
+
+        if self.verbosity >= 2:
+            self.stdout.write(f"[{done}/{total}] {created} renditions generated")
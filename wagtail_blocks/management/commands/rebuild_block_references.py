@@ -0,0 +1,66 @@
+"""Index the images, documents and embeds used by the StreamFields of every page"""
+
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from wagtail.models import Page
+
+from wagtail_blocks import references, streams
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the reverse index used to invalidate rendered HTML when an object changes.
+
+    Pages are indexed when they are saved, run it after enabling
+    `WAGTAIL_BLOCKS_REFERENCE_INDEX` on a site with existing pages.
+    """
+
+    help = "Rebuild the index of objects used by blocks of pages"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--model",
+            action="append",
+            dest="models",
+            metavar="APP_LABEL.MODEL",
+            help="Only index pages of this model, can be repeated. All pages by default.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of pages loaded from the database at once.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            stream_models = streams.get_stream_models(options["models"])
+        except (LookupError, ValueError) as error:
+            raise CommandError(error) from error
+
+        pages = indexed = 0
+        done = set()
+        start = time.perf_counter()
+
+        for model in stream_models:
+            if not issubclass(model, Page):
+                continue
+
+            # Pages inheriting the fields are indexed with their own fields
+            queryset = model.objects.specific()
+            for page in queryset.iterator(chunk_size=options["chunk_size"]):
+                if page.pk in done:
+                    continue
+
+                done.add(page.pk)
+                indexed += references.update_page(page)
+                pages += 1
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexed {indexed} references of {pages} pages in {elapsed:.2f}s."
+            )
+        )
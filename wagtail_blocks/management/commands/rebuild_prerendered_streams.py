@@ -0,0 +1,85 @@
+"""Render and store the StreamFields of every live page, as when they were published"""
+
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from wagtail.models import Page
+
+from wagtail_blocks import prerender, streams
+
+
+class Command(BaseCommand):
+    """
+    Render the `StreamField`s of the live revision of every live page, and store them.
+
+    Run it after changing block templates, or after enabling `WAGTAIL_BLOCKS_PRERENDER`
+    on a site with pages published before.
+    """
+
+    help = "Rebuild the pre-rendered HTML of StreamFields of live pages"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--model",
+            action="append",
+            dest="models",
+            metavar="APP_LABEL.MODEL",
+            help="Only rebuild pages of this model, can be repeated. All pages by default.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=100,
+            help="Number of pages loaded from the database at once.",
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete every page's pre-rendered HTML stored in the database first.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        storage = prerender.get_storage()
+        if storage is None:
+            raise CommandError("WAGTAIL_BLOCKS_PRERENDER setting is not enabled.")
+
+        try:
+            stream_models = streams.get_stream_models(options["models"])
+        except (LookupError, ValueError) as error:
+            raise CommandError(error) from error
+
+        if options["clear"] and storage == "database":
+            from wagtail_blocks.models import PrerenderedStream
+
+            PrerenderedStream.objects.all().delete()
+
+        verbosity = options["verbosity"]
+        pages = fields = 0
+        done = set()
+        start = time.perf_counter()
+
+        for model in stream_models:
+            if not issubclass(model, Page):
+                continue
+
+            # Pages inheriting the fields are rendered with their own fields
+            queryset = model.objects.live().exclude(live_revision=None).specific()
+            for page in queryset.iterator(chunk_size=options["chunk_size"]):
+                if page.pk in done:
+                    continue
+
+                done.add(page.pk)
+                rendered = prerender.publish(page, page.live_revision_id)
+                pages += 1
+                fields += len(rendered)
+
+                if verbosity >= 2:
+                    self.stdout.write(f"[{pages}] {page} ({len(rendered)} fields)")
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rendered {fields} StreamFields of {pages} pages in {elapsed:.2f}s."
+            )
+        )
@@ -0,0 +1,129 @@
+"""Reindex the pages using blocks, a chunk of pages at a time"""
+
+import time
+from typing import Any, Iterator, List
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import models
+from wagtail.search.backends import get_search_backend, get_search_backends
+from wagtail.search.index import get_indexed_models
+
+from wagtail_blocks import search, streams
+
+
+class Command(BaseCommand):
+    """
+    Add the objects of searchable models with `StreamField`s to the search backends.
+
+    Objects are loaded a chunk at a time with keyset pagination, and each chunk
+    is released before the next one is loaded, so memory doesn't grow with the site.
+    Unlike `update_index`, indexes are not rebuilt, models are updated in place.
+    """
+
+    help = "Update the search index of models using blocks, in chunks"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--model",
+            action="append",
+            dest="models",
+            metavar="APP_LABEL.MODEL",
+            help="Only reindex this model, can be repeated. All models by default.",
+        )
+        parser.add_argument(
+            "--backend",
+            action="append",
+            dest="backends",
+            help="Only update this search backend, can be repeated. All by default.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=100,
+            help="Number of objects loaded and indexed at once.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Extract the text of blocks without updating search backends.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be at least 1.")
+
+        try:
+            selected = (
+                {apps.get_model(label) for label in options["models"]}
+                if options["models"]
+                else None
+            )
+        except (LookupError, ValueError) as error:
+            raise CommandError(error) from error
+
+        backends = (
+            [get_search_backend(name) for name in options["backends"]]
+            if options["backends"]
+            else list(get_search_backends())
+        )
+
+        objects = characters = 0
+        start = time.perf_counter()
+
+        for model in get_indexed_models():
+            fields = streams.get_stream_fields(model, inherited=True)
+            if not fields or (selected is not None and model not in selected):
+                continue
+
+            for chunk in self.iter_chunks(model, options["chunk_size"]):
+                if options["dry_run"]:
+                    characters += sum(
+                        len(text)
+                        for instance in chunk
+                        for field_name in fields
+                        for text in search.iter_stream_text(
+                            getattr(instance, field_name)
+                        )
+                    )
+                else:
+                    for backend in backends:
+                        backend.add_bulk(model, chunk)
+
+                objects += len(chunk)
+                if options["verbosity"] >= 2:
+                    self.stdout.write(f"{model._meta.label}: {objects} objects")
+
+        elapsed = time.perf_counter() - start
+        done = (
+            f"Extracted {characters} characters of" if options["dry_run"] else "Indexed"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"{done} {objects} objects in {elapsed:.2f}s.")
+        )
+
+    def iter_chunks(
+        self, model: type[models.Model], chunk_size: int
+    ) -> Iterator[List[models.Model]]:
+        """
+        Load the indexed objects of a model, a chunk at a time.
+
+        Args:
+            model (type[Model]): Indexed model.
+            chunk_size (int): Number of objects per chunk.
+
+        Yields:
+            list[Model]: Objects, ordered by primary key.
+        """
+
+        queryset = model.get_indexed_objects().order_by("pk")  # type: ignore
+        last_pk = None
+
+        while True:
+            remaining = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            chunk = list(remaining[:chunk_size])
+            if not chunk:
+                return
+
+            yield chunk
+            last_pk = chunk[-1].pk
@@ -0,0 +1,30 @@
+"""Middleware"""
+
+from typing import Callable
+
+from django.http import HttpRequest, HttpResponse
+
+from wagtail_blocks import instrumentation
+
+
+class ServerTimingMiddleware:
+    """
+    Add the render time of each block type to the `Server-Timing` header.
+
+    Only blocks rendered while `WAGTAIL_BLOCKS_INSTRUMENTATION` setting is enabled are reported.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        response = self.get_response(request)
+
+        # Template responses are rendered by now
+        timings = getattr(request, instrumentation.REGISTRY_ATTR, None)
+        if timings:
+            header = instrumentation.get_server_timing(timings)
+            existing = response.get("Server-Timing")
+            response["Server-Timing"] = f"{existing}, {header}" if existing else header
+
+        return response
@@ -0,0 +1,76 @@
+# Generated by Django 6.1.2 on 2026-10-18 07:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("wagtailcore", "0091_remove_revision_submitted_for_moderation"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PrerenderedStream",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "field_name",
+                    models.CharField(help_text="StreamField name", max_length=255),
+                ),
+                (
+                    "language",
+                    models.CharField(
+                        help_text="Language code of the locale used to render",
+                        max_length=100,
+                    ),
+                ),
+                ("html", models.TextField(help_text="Rendered HTML")),
+                (
+                    "assets",
+                    models.JSONField(
+                        default=list, help_text="Assets used by the blocks"
+                    ),
+                ),
+                ("rendered_at", models.DateTimeField(auto_now=True)),
+                (
+                    "page",
+                    models.ForeignKey(
+                        help_text="Rendered page",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="wagtailcore.page",
+                    ),
+                ),
+                (
+                    "revision",
+                    models.ForeignKey(
+                        help_text="Published revision",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="wagtailcore.revision",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Prerendered stream",
+                "verbose_name_plural": "Prerendered streams",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("revision", "field_name", "language"),
+                        name="unique_prerendered_stream",
+                    )
+                ],
+            },
+        ),
+    ]
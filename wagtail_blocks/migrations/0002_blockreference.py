@@ -0,0 +1,68 @@
+# Generated by Django 6.1.2 on 2026-10-18 07:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("wagtail_tw_blocks", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BlockReference",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "field_name",
+                    models.CharField(help_text="StreamField name", max_length=255),
+                ),
+                ("block_path", models.TextField(help_text="Content path of the block")),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("image", "Image"),
+                            ("document", "Document"),
+                            ("embed", "Embed"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "object_key",
+                    models.CharField(
+                        help_text="Object id, or hash of the URL of embeds",
+                        max_length=64,
+                    ),
+                ),
+                (
+                    "page",
+                    models.ForeignKey(
+                        help_text="Page using the object",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="wagtailcore.page",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Block reference",
+                "verbose_name_plural": "Block references",
+                "indexes": [
+                    models.Index(
+                        fields=["kind", "object_key"], name="wagtail_blocks_ref_object"
+                    )
+                ],
+            },
+        ),
+    ]
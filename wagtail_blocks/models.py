@@ -0,0 +1,85 @@
+"""Models"""
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class PrerenderedStream(models.Model):
+    """HTML of a page's `StreamField`, rendered when the page was published"""
+
+    page = models.ForeignKey(
+        "wagtailcore.Page",
+        on_delete=models.CASCADE,
+        related_name="+",
+        help_text=_("Rendered page"),
+    )
+    revision = models.ForeignKey(
+        "wagtailcore.Revision",
+        on_delete=models.CASCADE,
+        related_name="+",
+        help_text=_("Published revision"),
+    )
+    field_name = models.CharField(max_length=255, help_text=_("StreamField name"))
+    language = models.CharField(
+        max_length=100,
+        help_text=_("Language code of the locale used to render"),
+    )
+    html = models.TextField(help_text=_("Rendered HTML"))
+    assets = models.JSONField(default=list, help_text=_("Assets used by the blocks"))
+    rendered_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        """Meta data"""
+
+        verbose_name = _("Prerendered stream")
+        verbose_name_plural = _("Prerendered streams")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["revision", "field_name", "language"],
+                name="unique_prerendered_stream",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.page_id}:{self.revision_id}:{self.field_name}:{self.language}"
+
+
+class BlockReference(models.Model):
+    """An image, a document or an embed used by a block of a page's `StreamField`"""
+
+    IMAGE = "image"
+    DOCUMENT = "document"
+    EMBED = "embed"
+    KIND_CHOICES = [
+        (IMAGE, _("Image")),
+        (DOCUMENT, _("Document")),
+        (EMBED, _("Embed")),
+    ]
+
+    page = models.ForeignKey(
+        "wagtailcore.Page",
+        on_delete=models.CASCADE,
+        related_name="+",
+        help_text=_("Page using the object"),
+    )
+    field_name = models.CharField(max_length=255, help_text=_("StreamField name"))
+    block_path = models.TextField(help_text=_("Content path of the block"))
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_key = models.CharField(
+        max_length=64,
+        help_text=_("Object id, or hash of the URL of embeds"),
+    )
+
+    class Meta:
+        """Meta data"""
+
+        verbose_name = _("Block reference")
+        verbose_name_plural = _("Block references")
+        indexes = [
+            models.Index(
+                fields=["kind", "object_key"], name="wagtail_blocks_ref_object"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.kind}:{self.object_key} in {self.page_id}:{self.block_path}"
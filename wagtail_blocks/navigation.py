@@ -0,0 +1,452 @@
+"""Page navigation helpers used by template components"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from django.http import HttpRequest
+from wagtail.models import Page, Site
+
+from wagtail_blocks import cache
+
+VERSION_KEY = "wagtail_blocks:pages:version"
+TREE_KEY_PREFIX = "wagtail_blocks:tree"
+SIBLINGS_KEY_PREFIX = "wagtail_blocks:siblings"
+BREADCRUMBS_KEY_PREFIX = "wagtail_blocks:breadcrumbs"
+
+# Attribute used to store breadcrumbs resolved in bulk on a page
+BREADCRUMBS_ATTR = "_wagtail_blocks_breadcrumbs"
+
+
+@dataclass
+class TreeNode:
+    """A page in a navigation tree"""
+
+    id: int
+    title: str
+    url: Optional[str]
+    children: List["TreeNode"] = field(default_factory=list)
+
+
+@dataclass
+class PageLink:
+    """A link to a page"""
+
+    id: int
+    title: str
+    url: Optional[str]
+
+
+@dataclass
+class SiblingNavigation:
+    """Previous and next pages of a page"""
+
+    prev: Optional[PageLink] = None
+    next: Optional[PageLink] = None
+
+
+def get_version(section: Optional[str] = None) -> int:
+    """
+    Get the version of the page tree or one of its sections.
+
+    The version changes every time a page is published, unpublished, moved or deleted,
+    so it can be used to build cache keys that are invalidated by these events.
+
+    Args:
+        section (str | None): Path of the section, `None` for the whole tree.
+
+    Returns:
+        int: Page tree version.
+    """
+
+    backend = cache.get_backend()
+    if backend is None:
+        return 0
+
+    return backend.get_or_set(f"{VERSION_KEY}:{section or ''}", cache.new_version, None)
+
+
+def bump_version(section: Optional[str] = None) -> None:
+    """
+    Invalidate every cached structure that depends on the page tree.
+
+    Args:
+        section (str | None): Path of the section that changed, if known.
+    """
+
+    backend = cache.get_backend()
+    if backend is None:
+        return
+
+    keys = [f"{VERSION_KEY}:"]
+    if section:
+        keys.append(f"{VERSION_KEY}:{section}")
+
+    for key in keys:
+        try:
+            backend.incr(key)
+        except ValueError:
+            backend.set(key, cache.new_version(), None)
+
+
+def get_section(page: Page) -> str:
+    """
+    Get the section of a page, which is the path of its top-level ancestor (site root).
+
+    Args:
+        page (Page): Wagtail page.
+
+    Returns:
+        str: Section path.
+    """
+
+    return get_section_from_path(page.path)
+
+
+def get_section_from_path(path: str) -> str:
+    """
+    Get the section of a page path.
+
+    Args:
+        path (str): Page path.
+
+    Returns:
+        str: Section path.
+    """
+
+    return path[: Page.steplen * 2]
+
+
+def get_site(request: Optional[HttpRequest]) -> Optional[Site]:
+    """
+    Get the site of a request.
+
+    Args:
+        request (HttpRequest | None): Current request.
+
+    Returns:
+        Site | None: Site or `None` if there is no request.
+    """
+
+    return Site.find_for_request(request) if request is not None else None
+
+
+def load_tree(
+    page: Page,
+    request: Optional[HttpRequest] = None,
+    max_depth: Optional[int] = None,
+) -> List[TreeNode]:
+    """
+    Load the live, public subtree of a page using a single query.
+
+    Descendants are fetched in `path` order, so every parent is seen before its
+    children, and the nested structure is built in memory. Descendants of pages that
+    are not live or not public are skipped, like their parents.
+
+    Args:
+        page (Page): Root of the subtree, not included in the result.
+        request (HttpRequest | None): Current request, used to build page URLs.
+        max_depth (int | None): Maximum depth relative to `page`.
+
+    Returns:
+        list[TreeNode]: Children of `page`.
+    """
+
+    pages = Page.objects.descendant_of(page).live().public().order_by("path")
+    if max_depth is not None:
+        pages = pages.filter(depth__lte=page.depth + max_depth)
+
+    nodes: Dict[str, TreeNode] = {}
+    roots: List[TreeNode] = []
+
+    for descendant in pages:
+        node = TreeNode(
+            id=descendant.pk,
+            title=descendant.title,
+            url=descendant.get_url(request=request),
+        )
+        nodes[descendant.path] = node
+
+        if descendant.depth == page.depth + 1:
+            roots.append(node)
+            continue
+
+        parent = nodes.get(descendant.path[: -Page.steplen])
+        if parent is not None:
+            parent.children.append(node)
+
+    return roots
+
+
+def get_tree(
+    page: Page,
+    request: Optional[HttpRequest] = None,
+    max_depth: Optional[int] = None,
+) -> List[TreeNode]:
+    """
+    Get the live, public subtree of a page from the cache, loading it on miss.
+
+    Args:
+        page (Page): Root of the subtree.
+        request (HttpRequest | None): Current request, used to build page URLs.
+        max_depth (int | None): Maximum depth relative to `page`.
+
+    Returns:
+        list[TreeNode]: Children of `page`.
+    """
+
+    backend = cache.get_backend()
+    if backend is None:
+        return load_tree(page, request, max_depth)
+
+    site = get_site(request)
+    key = ":".join(
+        [
+            TREE_KEY_PREFIX,
+            str(get_version()),
+            str(page.pk),
+            str(max_depth or ""),
+            str(site.pk if site else ""),
+        ]
+    )
+
+    tree = backend.get(key)
+    if tree is None:
+        tree = load_tree(page, request, max_depth)
+        backend.set(key, tree, cache.get_timeout())
+
+    return tree
+
+
+def build_sibling_index(
+    section: str,
+    request: Optional[HttpRequest] = None,
+) -> Dict[int, SiblingNavigation]:
+    """
+    Compute the previous and next pages of every live page in a section, in a single pass.
+
+    A page links to its previous/next live sibling. When it has none,
+    it falls back to the previous/next page of its closest live ancestor,
+    up to the top of the section.
+
+    Args:
+        section (str): Section path.
+        request (HttpRequest | None): Current request, used to build page URLs.
+
+    Returns:
+        dict[int, SiblingNavigation]: Navigation of every page in the section.
+    """
+
+    pages = list(Page.objects.filter(path__startswith=section).live().order_by("path"))
+
+    siblings: Dict[str, List[Page]] = {}
+    for page in pages:
+        siblings.setdefault(page.path[: -Page.steplen], []).append(page)
+
+    index: Dict[str, SiblingNavigation] = {}
+    for group in siblings.values():
+        group_links = [
+            PageLink(page.pk, page.title, page.get_url(request=request))
+            for page in group
+        ]
+
+        for position, page in enumerate(group):
+            index[page.path] = SiblingNavigation(
+                prev=group_links[position - 1] if position > 0 else None,
+                next=group_links[position + 1] if position < len(group) - 1 else None,
+            )
+
+    # The section root has no siblings inside the section
+    if section in index:
+        index[section] = SiblingNavigation()
+
+    # Pages are visited in path order, so ancestors are always resolved first
+    for page in pages:
+        navigation = index[page.path]
+        ancestor_path = page.path[: -Page.steplen]
+
+        while len(ancestor_path) >= len(section):
+            ancestor = index.get(ancestor_path)
+
+            if ancestor is not None:
+                navigation.prev = navigation.prev or ancestor.prev
+                navigation.next = navigation.next or ancestor.next
+                break
+
+            ancestor_path = ancestor_path[: -Page.steplen]
+
+    return {page.pk: index[page.path] for page in pages}
+
+
+def get_sibling_navigation(
+    page: Page,
+    request: Optional[HttpRequest] = None,
+) -> SiblingNavigation:
+    """
+    Get the previous and next pages of a page from the section's cached index.
+
+    Args:
+        page (Page): Wagtail page.
+        request (HttpRequest | None): Current request, used to build page URLs.
+
+    Returns:
+        SiblingNavigation: Previous and next pages.
+    """
+
+    if page.depth <= 1:
+        return SiblingNavigation()
+
+    section = get_section(page)
+    backend = cache.get_backend()
+
+    if backend is None:
+        index = build_sibling_index(section, request)
+    else:
+        site = get_site(request)
+        key = ":".join(
+            [
+                SIBLINGS_KEY_PREFIX,
+                section,
+                str(get_version(section)),
+                str(site.pk if site else ""),
+            ]
+        )
+
+        index = backend.get(key)
+        if index is None:
+            index = build_sibling_index(section, request)
+            backend.set(key, index, cache.get_timeout())
+
+    return index.get(page.pk) or SiblingNavigation()
+
+
+def get_ancestor_paths(page: Page) -> List[str]:
+    """
+    Decode the paths of the ancestors of a page from its materialized path.
+
+    The tree root is excluded, like the page itself.
+
+    Args:
+        page (Page): Wagtail page.
+
+    Returns:
+        list[str]: Ancestor paths, from the top-level ancestor down to the parent.
+    """
+
+    return [
+        page.path[:end] for end in range(Page.steplen * 2, len(page.path), Page.steplen)
+    ]
+
+
+def resolve_links(
+    paths: Iterable[str],
+    request: Optional[HttpRequest] = None,
+) -> Dict[str, PageLink]:
+    """
+    Resolve page paths to links using the shared cache, querying only the missing ones.
+
+    Args:
+        paths (Iterable[str]): Page paths.
+        request (HttpRequest | None): Current request, used to build page URLs.
+
+    Returns:
+        dict[str, PageLink]: Links by path.
+    """
+
+    paths = set(paths)
+    backend = cache.get_backend()
+    site = get_site(request)
+
+    versions: Dict[str, int] = {}
+
+    def get_key(path: str) -> str:
+        section = get_section_from_path(path)
+        if section not in versions:
+            versions[section] = get_version(section)
+
+        return ":".join(
+            [
+                BREADCRUMBS_KEY_PREFIX,
+                str(versions[section]),
+                str(site.pk if site else ""),
+                path,
+            ]
+        )
+
+    keys = {get_key(path): path for path in paths} if backend is not None else {}
+    links: Dict[str, PageLink] = {
+        keys[key]: link
+        for key, link in (backend.get_many(keys) if keys else {}).items()
+    }
+
+    missing = paths - set(links)
+    if missing:
+        resolved = {
+            page.path: PageLink(page.pk, page.title, page.get_url(request=request))
+            for page in Page.objects.filter(path__in=missing)
+        }
+        links.update(resolved)
+
+        if backend is not None:
+            backend.set_many(
+                {get_key(path): link for path, link in resolved.items()},
+                cache.get_timeout(),
+            )
+
+    return links
+
+
+def load_breadcrumbs(
+    pages: Iterable[Page],
+    request: Optional[HttpRequest] = None,
+) -> Dict[int, List[PageLink]]:
+    """
+    Resolve the breadcrumbs of many pages at once.
+
+    The resolved breadcrumbs are also stored on each page,
+    so `get_breadcrumbs` does not need to resolve them again.
+
+    Args:
+        pages (Iterable[Page]): Wagtail pages.
+        request (HttpRequest | None): Current request, used to build page URLs.
+
+    Returns:
+        dict[int, list[PageLink]]: Breadcrumbs by page id.
+    """
+
+    pages = list(pages)
+    ancestors = {page.pk: get_ancestor_paths(page) for page in pages}
+    links = resolve_links(
+        {path for paths in ancestors.values() for path in paths},
+        request,
+    )
+
+    breadcrumbs = {}
+    for page in pages:
+        breadcrumbs[page.pk] = [
+            links[path] for path in ancestors[page.pk] if path in links
+        ]
+        setattr(page, BREADCRUMBS_ATTR, breadcrumbs[page.pk])
+
+    return breadcrumbs
+
+
+def get_breadcrumbs(
+    page: Page,
+    request: Optional[HttpRequest] = None,
+) -> List[PageLink]:
+    """
+    Get the breadcrumbs of a page, usually without querying the database.
+
+    Args:
+        page (Page): Wagtail page.
+        request (HttpRequest | None): Current request, used to build page URLs.
+
+    Returns:
+        list[PageLink]: Links to the ancestors of the page, excluding the tree root.
+    """
+
+    breadcrumbs = getattr(page, BREADCRUMBS_ATTR, None)
+    if breadcrumbs is None:
+        breadcrumbs = load_breadcrumbs([page], request)[page.pk]
+
+    return breadcrumbs
@@ -0,0 +1,308 @@
+"""Prefetch of everything a stream renders: embeds, renditions and documents"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.utils.timezone import now
+from wagtail import blocks
+from wagtail.embeds.blocks import EmbedBlock, EmbedValue
+from wagtail.embeds.embeds import get_embed_hash, get_finder_for_embed
+from wagtail.embeds.exceptions import EmbedException
+from wagtail.embeds.models import Embed
+
+from wagtail_blocks import documents, embeds, images, streams
+
+# URL, maximum width and maximum height of an embed
+EmbedKey = Tuple[str, Optional[int], Optional[int]]
+
+
+@dataclass
+class StreamPrefetchResult:
+    """Statistics of a stream prefetch"""
+
+    embeds: int = 0
+    thumbnails: int = 0
+    fetched: int = 0
+    documents: int = 0
+    renditions: images.PrefetchResult = field(default_factory=images.PrefetchResult)
+
+
+def is_concurrent() -> bool:
+    """
+    Whether `prefetch_stream` runs I/O concurrently.
+
+    Returns:
+        bool: `WAGTAIL_BLOCKS_CONCURRENT_PREFETCH` setting, `False` by default.
+    """
+
+    return getattr(settings, "WAGTAIL_BLOCKS_CONCURRENT_PREFETCH", False)
+
+
+def is_embed_block(block: blocks.Block) -> bool:
+    """
+    Whether the value of a block is an embed.
+
+    Args:
+        block (Block): Block definition.
+
+    Returns:
+        bool: `True` for `EmbedBlock`.
+    """
+
+    return isinstance(block, EmbedBlock)
+
+
+def collect_embeds(
+    stream_value: Any,
+) -> Tuple[Dict[EmbedKey, List[EmbedValue]], List[EmbedKey]]:
+    """
+    Find the embeds and the facade thumbnails of a stream.
+
+    Traversing the stream loads its lazy children, which queries the database,
+    so it is done before fetching anything concurrently.
+
+    Args:
+        stream_value (StreamValue): Stream value.
+
+    Returns:
+        tuple[dict, list[tuple]]: Embed values by URL and size,
+        and URLs of the projects whose facade shows a thumbnail.
+    """
+
+    values: Dict[EmbedKey, List[EmbedValue]] = {}
+    thumbnails: Dict[EmbedKey, None] = {}
+    fetch_thumbnails = getattr(settings, "WAGTAIL_BLOCKS_FACADE_THUMBNAILS", False)
+
+    for node in streams.walk_stream(stream_value):
+        if node.value is None:
+            continue
+
+        if is_embed_block(node.block):
+            key = (node.value.url, node.value.max_width, node.value.max_height)
+            values.setdefault(key, []).append(node.value)
+
+        elif (
+            fetch_thumbnails
+            and isinstance(node.block, embeds.FacadeMixin)
+            and node.block.get_facade_mode()
+        ):
+            url = node.block.get_facade_url(node.value)
+            if url:
+                thumbnails[(url, None, None)] = None
+
+    return values, list(thumbnails)
+
+
+def load_embeds(keys: Iterable[EmbedKey]) -> Dict[EmbedKey, Optional[Embed]]:
+    """
+    Load the embeds stored by Wagtail, using a single query.
+
+    Args:
+        keys (Iterable[tuple]): URLs and sizes.
+
+    Returns:
+        dict[tuple, Embed]: Embeds which are not expired, by URL and size.
+    """
+
+    hashes = {get_embed_hash(*key): key for key in keys}
+    if not hashes:
+        return {}
+
+    return {
+        hashes[embed.hash]: embed
+        for embed in Embed.objects.exclude(cache_until__lte=now()).filter(
+            hash__in=hashes.keys()
+        )
+    }
+
+
+def find_embed(key: EmbedKey) -> Optional[Dict[str, Any]]:
+    """
+    Ask the embed finders for an embed, without using the database.
+
+    Args:
+        key (tuple): URL and size.
+
+    Returns:
+        dict | None: Embed data or `None` if the embed failed.
+    """
+
+    try:
+        return get_finder_for_embed(*key)
+    except EmbedException:
+        return None
+
+
+def store_embed(key: EmbedKey, embed_dict: Dict[str, Any]) -> Embed:
+    """
+    Store an embed found by `find_embed`, like Wagtail's `get_embed` does.
+
+    Args:
+        key (tuple): URL and size.
+        embed_dict (dict): Embed data.
+
+    Returns:
+        Embed: Stored embed.
+    """
+
+    url, max_width, _ = key
+    embed_dict = dict(embed_dict)
+
+    for name in ["width", "height"]:
+        try:
+            embed_dict[name] = int(embed_dict[name])
+        except (KeyError, TypeError, ValueError):
+            embed_dict[name] = None
+
+    embed_dict["html"] = embed_dict.get("html") or ""
+    embed_dict["thumbnail_url"] = embed_dict.get("thumbnail_url") or ""
+
+    embed, _ = Embed.objects.update_or_create(
+        hash=get_embed_hash(*key),
+        defaults=dict(url=url, max_width=max_width, **embed_dict),
+    )
+    return embed
+
+
+def attach_embeds(
+    values: Dict[EmbedKey, List[EmbedValue]],
+    found: Dict[EmbedKey, Optional[Embed]],
+) -> None:
+    """
+    Render embeds into the values using them, so renders don't fetch them again.
+
+    Args:
+        values (dict[tuple, list[EmbedValue]]): Embed values by URL and size.
+        found (dict[tuple, Embed | None]): Embeds, `None` when they failed.
+    """
+
+    for key, same in values.items():
+        embed = found.get(key)
+        html = (
+            render_to_string("wagtailembeds/embed_frontend.html", {"embed": embed})
+            if embed is not None
+            else ""
+        )
+
+        # `html` is a cached property of embed values
+        for value in same:
+            value.html = html
+
+
+async def aprefetch_stream(stream_value: Any) -> StreamPrefetchResult:
+    """
+    Fetch embeds, facade thumbnails, renditions and document metadata of a stream, concurrently.
+
+    Embed providers are queried in parallel threads, which don't use the database.
+    Stored embeds, renditions and documents are loaded with the caller's
+    connection while providers are queried. Rendering the stream afterward
+    doesn't query embed providers.
+
+    Args:
+        stream_value (StreamValue): Stream value, e.g. the value of a page's `StreamField`.
+
+    Returns:
+        StreamPrefetchResult: Prefetch statistics.
+    """
+
+    result = StreamPrefetchResult()
+    if not stream_value:
+        return result
+
+    values, thumbnails = await sync_to_async(collect_embeds)(stream_value)
+    found = await sync_to_async(load_embeds)([*values, *thumbnails])
+    missing = [key for key in dict.fromkeys([*values, *thumbnails]) if key not in found]
+
+    fetched = await asyncio.gather(
+        sync_to_async(images.prefetch_renditions)(stream_value),
+        sync_to_async(documents.prefetch_documents)(stream_value),
+        *[sync_to_async(find_embed, thread_sensitive=False)(key) for key in missing],
+    )
+
+    for key, embed_dict in zip(missing, fetched[2:]):
+        found[key] = (
+            await sync_to_async(store_embed)(key, embed_dict)
+            if embed_dict is not None
+            else None
+        )
+
+    await sync_to_async(attach_embeds)(values, found)
+
+    result.renditions = fetched[0]
+    result.documents = len(fetched[1])
+    result.embeds = len(values)
+    result.thumbnails = len(thumbnails)
+    result.fetched = len(missing)
+
+    return result
+
+
+def prefetch_stream(
+    stream_value: Any, concurrent: Optional[bool] = None
+) -> StreamPrefetchResult:
+    """
+    Fetch embeds, facade thumbnails, renditions and document metadata of a stream.
+
+    When concurrent, `aprefetch_stream` is run, otherwise everything is fetched
+    one after the other. Must not be called from a running event loop,
+    use `aprefetch_stream` instead.
+
+    Args:
+        stream_value (StreamValue): Stream value.
+        concurrent (bool | None): Whether to run I/O concurrently,
+            `WAGTAIL_BLOCKS_CONCURRENT_PREFETCH` setting by default.
+
+    Returns:
+        StreamPrefetchResult: Prefetch statistics.
+    """
+
+    if concurrent is None:
+        concurrent = is_concurrent()
+
+    if concurrent:
+        return async_to_sync(aprefetch_stream)(stream_value)
+
+    result = StreamPrefetchResult()
+    if not stream_value:
+        return result
+
+    values, thumbnails = collect_embeds(stream_value)
+    found = load_embeds([*values, *thumbnails])
+    missing = [key for key in dict.fromkeys([*values, *thumbnails]) if key not in found]
+
+    result.renditions = images.prefetch_renditions(stream_value)
+    result.documents = len(documents.prefetch_documents(stream_value))
+
+    for key in missing:
+        embed_dict = find_embed(key)
+        found[key] = store_embed(key, embed_dict) if embed_dict is not None else None
+
+    attach_embeds(values, found)
+
+    result.embeds = len(values)
+    result.thumbnails = len(thumbnails)
+    result.fetched = len(missing)
+
+    return result
+
+
+async def arender_stream(
+    stream_value: Any, context: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Prefetch a stream concurrently, then render it, e.g. from an async view.
+
+    Args:
+        stream_value (StreamValue): Stream value.
+        context (dict | None): Parent template context.
+
+    Returns:
+        str: HTML, like `{% include_block stream_value %}`.
+    """
+
+    await aprefetch_stream(stream_value)
+    return await sync_to_async(stream_value.render_as_block)(context=context)
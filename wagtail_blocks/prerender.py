@@ -0,0 +1,321 @@
+"""Render-on-publish of StreamFields, stored by revision and language"""
+
+from typing import Any, Dict, List, NamedTuple, Optional, Set
+
+from django.conf import settings
+from django.db.models import Q
+from django.http import HttpRequest
+from django.test import RequestFactory
+from django.utils import translation
+from django.utils.safestring import SafeString, mark_safe
+from wagtail.coreutils import get_supported_content_language_variant
+from wagtail.models import Page
+
+from wagtail_blocks import assets, cache, streaming, streams
+
+KEY_PREFIX = "wagtail_blocks:prerender"
+
+
+class Rendered(NamedTuple):
+    """HTML of a `StreamField` and the assets its blocks use"""
+
+    html: str
+    assets: List[str]
+
+
+def get_storage() -> Optional[str]:
+    """
+    Get where pre-rendered `StreamField`s are stored.
+
+    Returns:
+        str | None: `"database"` or `"cache"`, from `WAGTAIL_BLOCKS_PRERENDER` setting,
+        `None` when render-on-publish is disabled.
+    """
+
+    storage = getattr(settings, "WAGTAIL_BLOCKS_PRERENDER", None)
+    if storage is True:
+        return "database"
+
+    if storage == "cache" and cache.get_backend() is None:
+        return None
+
+    return storage or None
+
+
+def get_language(language_code: Optional[str] = None) -> str:
+    """
+    Get the content language pre-rendered HTML is stored under.
+
+    Args:
+        language_code (str | None): Language code, the active language by default.
+
+    Returns:
+        str: Supported content language, e.g. `"en"` for `"en-us"`.
+    """
+
+    try:
+        return get_supported_content_language_variant(
+            language_code or translation.get_language()
+        )
+    except LookupError:
+        return language_code or settings.LANGUAGE_CODE
+
+
+def get_key(revision_id: int, field_name: str, language: str) -> str:
+    """
+    Get the cache key of a pre-rendered `StreamField`.
+
+    Args:
+        revision_id (int): Revision id.
+        field_name (str): `StreamField` name.
+        language (str): Content language.
+
+    Returns:
+        str: Cache key.
+    """
+
+    return f"{KEY_PREFIX}:{revision_id}:{field_name}:{language}"
+
+
+def get_request(page: Page) -> HttpRequest:
+    """
+    Build a request to the front-end URL of a page, to render it outside of a request.
+
+    Args:
+        page (Page): Page.
+
+    Returns:
+        HttpRequest: Request collecting the assets used by blocks.
+    """
+
+    url_parts = page.get_url_parts()
+    if url_parts is None:
+        request = RequestFactory().get("/")
+    else:
+        _, root_url, page_path = url_parts
+        request = RequestFactory().get(
+            page_path,
+            secure=root_url.startswith("https://"),
+            HTTP_HOST=root_url.split("://", 1)[-1],
+        )
+
+    request.is_preview = False
+    setattr(request, assets.COLLECT_ATTR, True)
+    return request
+
+
+def render_field(page: Page, field_name: str) -> Rendered:
+    """
+    Render a `StreamField` of a page, in the language of its locale.
+
+    Blocks are rendered with `page`, `self` and `request` in their context,
+    like `{% include_block page.body %}` in a page template. Blocks which depend
+    on the visitor, e.g. on `request.user`, must not be pre-rendered.
+
+    Args:
+        page (Page): Specific page.
+        field_name (str): `StreamField` name.
+
+    Returns:
+        Rendered: HTML and the names of the assets it uses.
+    """
+
+    context = {"page": page, "self": page, "request": get_request(page)}
+
+    with translation.override(page.locale.language_code):
+        html = getattr(page, field_name).render_as_block(context=context)
+
+    return Rendered(str(html), list(assets.get_registry(context) or {}))
+
+
+def store(
+    page: Page,
+    revision_id: int,
+    language: str,
+    rendered: Dict[str, Rendered],
+) -> None:
+    """
+    Store the pre-rendered `StreamField`s of a revision.
+
+    Args:
+        page (Page): Page.
+        revision_id (int): Revision id.
+        language (str): Content language.
+        rendered (dict[str, Rendered]): Rendered HTML by field name.
+    """
+
+    if get_storage() == "cache":
+        cache.get_backend().set_many(  # type: ignore
+            {
+                get_key(revision_id, field_name, language): entry._asdict()
+                for field_name, entry in rendered.items()
+            },
+            cache.get_timeout(),
+        )
+        return
+
+    from wagtail_blocks.models import PrerenderedStream
+
+    PrerenderedStream.objects.bulk_create(
+        [
+            PrerenderedStream(
+                page_id=page.pk,
+                revision_id=revision_id,
+                field_name=field_name,
+                language=language,
+                html=entry.html,
+                assets=entry.assets,
+            )
+            for field_name, entry in rendered.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["revision", "field_name", "language"],
+        update_fields=["html", "assets", "rendered_at"],
+    )
+
+
+def load(revision_id: int, field_name: str, language: str) -> Optional[Rendered]:
+    """
+    Load a pre-rendered `StreamField`.
+
+    Args:
+        revision_id (int): Revision id.
+        field_name (str): `StreamField` name.
+        language (str): Content language.
+
+    Returns:
+        Rendered | None: HTML and assets, or `None` if it wasn't pre-rendered.
+    """
+
+    storage = get_storage()
+    if storage is None:
+        return None
+
+    if storage == "cache":
+        entry = cache.get_backend().get(get_key(revision_id, field_name, language))  # type: ignore
+        return Rendered(**entry) if entry else None
+
+    from wagtail_blocks.models import PrerenderedStream
+
+    entry = (
+        PrerenderedStream.objects.filter(
+            revision_id=revision_id, field_name=field_name, language=language
+        )
+        .values_list("html", "assets")
+        .first()
+    )
+    return Rendered(*entry) if entry else None
+
+
+def publish(page: Page, revision_id: int) -> Dict[str, Rendered]:
+    """
+    Render and store the `StreamField`s of a published revision.
+
+    HTML stored in the database for older revisions of the page is deleted.
+    Cached HTML of older revisions expires with the cache timeout.
+
+    Args:
+        page (Page): Specific page, as published.
+        revision_id (int): Published revision id.
+
+    Returns:
+        dict[str, Rendered]: Rendered HTML by field name.
+    """
+
+    rendered = {
+        field_name: render_field(page, field_name)
+        for field_name in streams.get_stream_fields(type(page), inherited=True)
+    }
+    if not rendered:
+        return rendered
+
+    store(page, revision_id, get_language(page.locale.language_code), rendered)
+
+    if get_storage() == "database":
+        delete(page, exclude_revision_id=revision_id)
+
+    return rendered
+
+
+def delete(page: Page, exclude_revision_id: Optional[int] = None) -> None:
+    """
+    Delete the HTML stored in the database for a page, e.g. when it is unpublished.
+
+    Args:
+        page (Page): Page.
+        exclude_revision_id (int | None): Keep the HTML of this revision.
+    """
+
+    from wagtail_blocks.models import PrerenderedStream
+
+    entries = PrerenderedStream.objects.filter(page_id=page.pk)
+    if exclude_revision_id is not None:
+        entries = entries.exclude(revision_id=exclude_revision_id)
+
+    entries.delete()
+
+
+def invalidate(fields: Dict[int, Set[str]]) -> None:
+    """
+    Delete the stored HTML of some `StreamField`s, which are rendered live until published again.
+
+    Args:
+        fields (dict[int, set[str]]): `StreamField` names by page id.
+    """
+
+    storage = get_storage()
+    if storage is None or not fields:
+        return
+
+    if storage == "cache":
+        pages = Page.objects.filter(pk__in=fields, live_revision__isnull=False)
+        cache.get_backend().delete_many(  # type: ignore
+            [
+                get_key(revision_id, field_name, get_language(language_code))
+                for pk, revision_id, language_code in pages.values_list(
+                    "pk", "live_revision_id", "locale__language_code"
+                )
+                for field_name in fields[pk]
+            ]
+        )
+        return
+
+    from wagtail_blocks.models import PrerenderedStream
+
+    query = Q()
+    for page_id, field_names in fields.items():
+        query |= Q(page_id=page_id, field_name__in=field_names)
+
+    PrerenderedStream.objects.filter(query).delete()
+
+
+def render(context: Dict[str, Any], page: Page, field_name: str = "body") -> SafeString:
+    """
+    Render a `StreamField` of a page from the HTML stored when it was published.
+
+    The field is rendered live when the HTML wasn't stored, e.g. in previews
+    or when render-on-publish is disabled.
+
+    Args:
+        context (dict): Parent template context, flattened.
+        page (Page): Page being served.
+        field_name (str): `StreamField` name.
+
+    Returns:
+        SafeString: HTML.
+    """
+
+    request = context.get("request")
+    revision_id = getattr(page, "live_revision_id", None)
+
+    if (
+        get_storage() is not None
+        and revision_id is not None
+        and page.live
+        and not getattr(request, "is_preview", False)
+    ):
+        entry = load(revision_id, field_name, get_language())
+        if entry is not None:
+            return mark_safe(entry.html + assets.use(context, entry.assets))
+
+    return streaming.render_stream(context, getattr(page, field_name))
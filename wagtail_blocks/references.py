@@ -0,0 +1,237 @@
+"""Reverse index of the images, documents and embeds used by blocks of pages"""
+
+import hashlib
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Set
+
+from django.conf import settings
+from django.db import transaction
+from wagtail import blocks
+from wagtail.embeds.blocks import EmbedBlock
+from wagtail.models import Page
+
+from wagtail_blocks import cache, documents, images, streams
+
+VERSION_KEY = "wagtail_blocks:references:version"
+
+
+class Reference(NamedTuple):
+    """An object used by a block"""
+
+    kind: str
+    key: str
+    path: List[str]
+
+
+def is_enabled() -> bool:
+    """
+    Whether references of blocks are indexed and used to invalidate rendered HTML.
+
+    Returns:
+        bool: `WAGTAIL_BLOCKS_REFERENCE_INDEX` setting, `False` by default.
+    """
+
+    return getattr(settings, "WAGTAIL_BLOCKS_REFERENCE_INDEX", False)
+
+
+def get_url_key(url: str) -> str:
+    """
+    Get the key of an embed URL.
+
+    Args:
+        url (str): Embed URL.
+
+    Returns:
+        str: Hash of the URL.
+    """
+
+    return hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+
+
+def iter_references(
+    block: blocks.Block,
+    value: Any,
+    path: Optional[List[str]] = None,
+) -> Iterator[Reference]:
+    """
+    Find every image, document and embed used in a block value.
+
+    Args:
+        block (Block): Block definition.
+        value (Any): Block value.
+        path (list[str] | None): Path of `value`.
+
+    Yields:
+        Reference: Kind, key and path of every object.
+    """
+
+    from wagtail_blocks.models import BlockReference
+
+    for node in streams.walk(block, value, path):
+        if node.value is None:
+            continue
+
+        if images.is_image_block(node.block):
+            yield Reference(BlockReference.IMAGE, str(node.value.pk), node.path)
+
+        elif documents.is_document_block(node.block):
+            yield Reference(BlockReference.DOCUMENT, str(node.value.pk), node.path)
+
+        elif isinstance(node.block, EmbedBlock):
+            yield Reference(
+                BlockReference.EMBED, get_url_key(node.value.url), node.path
+            )
+
+
+def update_page(page: Page) -> int:
+    """
+    Index the objects used by the `StreamField`s of a page, replacing its former references.
+
+    Args:
+        page (Page): Specific page.
+
+    Returns:
+        int: Number of references.
+    """
+
+    from wagtail_blocks.models import BlockReference
+
+    entries = [
+        BlockReference(
+            page_id=page.pk,
+            field_name=field_name,
+            block_path=".".join(reference.path),
+            kind=reference.kind,
+            object_key=reference.key,
+        )
+        for field_name in streams.get_stream_fields(type(page), inherited=True)
+        if getattr(page, field_name)
+        for reference in iter_references(
+            getattr(page, field_name).stream_block,
+            getattr(page, field_name),
+            [field_name],
+        )
+    ]
+
+    with transaction.atomic():
+        BlockReference.objects.filter(page_id=page.pk).delete()
+        BlockReference.objects.bulk_create(entries)
+
+    return len(entries)
+
+
+def find_pages(kind: str, key: str) -> Dict[int, Set[str]]:
+    """
+    Find the pages using an object.
+
+    Args:
+        kind (str): `"image"`, `"document"` or `"embed"`.
+        key (str): Object id, or key of an embed URL.
+
+    Returns:
+        dict[int, set[str]]: Names of the `StreamField`s using the object, by page id.
+    """
+
+    from wagtail_blocks.models import BlockReference
+
+    pages: Dict[int, Set[str]] = {}
+    for page_id, field_name in BlockReference.objects.filter(
+        kind=kind, object_key=key
+    ).values_list("page_id", "field_name"):
+        pages.setdefault(page_id, set()).add(field_name)
+
+    return pages
+
+
+def get_version_key(kind: str, key: str) -> str:
+    """
+    Get the cache key of the version of an object.
+
+    Args:
+        kind (str): Object kind.
+        key (str): Object key.
+
+    Returns:
+        str: Cache key.
+    """
+
+    return f"{VERSION_KEY}:{kind}:{key}"
+
+
+def get_versions(block: blocks.Block, value: Any) -> str:
+    """
+    Get the versions of the objects used by a block value, for its cache key.
+
+    A version changes when its object is saved or deleted, so fragments
+    using the object are rendered again while other fragments are kept.
+
+    Args:
+        block (Block): Block definition.
+        value (Any): Block value.
+
+    Returns:
+        str: Versions, empty if the index is disabled or the value uses no objects.
+    """
+
+    backend = cache.get_backend()
+    if backend is None or not is_enabled():
+        return ""
+
+    keys = sorted(
+        {
+            get_version_key(reference.kind, reference.key)
+            for reference in iter_references(block, value)
+        }
+    )
+    if not keys:
+        return ""
+
+    versions = backend.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            versions[key] = backend.get_or_set(key, cache.new_version, None)
+
+    return ",".join(str(versions[key]) for key in keys)
+
+
+def bump_version(kind: str, key: str) -> None:
+    """
+    Invalidate every cached fragment using an object.
+
+    Args:
+        kind (str): Object kind.
+        key (str): Object key.
+    """
+
+    backend = cache.get_backend()
+    if backend is None:
+        return
+
+    version_key = get_version_key(kind, key)
+    try:
+        backend.incr(version_key)
+    except ValueError:
+        backend.set(version_key, cache.new_version(), None)
+
+
+def invalidate(kind: str, key: str) -> Dict[int, Set[str]]:
+    """
+    Invalidate the cached fragments and pre-rendered `StreamField`s using an object.
+
+    Args:
+        kind (str): `"image"`, `"document"` or `"embed"`.
+        key (str): Object id, or key of an embed URL.
+
+    Returns:
+        dict[int, set[str]]: Invalidated `StreamField` names, by page id.
+    """
+
+    from wagtail_blocks import prerender
+
+    # Fragments are cached by version, whether or not the index knows their pages
+    bump_version(kind, key)
+
+    pages = find_pages(kind, key)
+    if pages:
+        prerender.invalidate(pages)
+
+    return pages
@@ -0,0 +1,157 @@
+"""Search-index text extraction for blocks"""
+
+import functools
+from typing import Any, Iterator, List, Set
+
+from django.conf import settings
+from django.utils.encoding import force_str
+from wagtail import blocks
+from wagtail.rich_text import get_text_for_indexing
+
+from wagtail_blocks import streams
+
+# Number of stripped rich texts kept per process
+RICH_TEXT_CACHE_SIZE = 4096
+
+
+def get_excluded() -> Set[str]:
+    """
+    Get the block types left out of the search index.
+
+    Returns:
+        set[str]: Block class names, e.g. `"CodeBlock"` or `"EmbedBlock"`,
+        from `WAGTAIL_BLOCKS_SEARCH_EXCLUDE` setting.
+    """
+
+    return set(getattr(settings, "WAGTAIL_BLOCKS_SEARCH_EXCLUDE", []))
+
+
+def is_searchable(block: blocks.Block, excluded: Set[str]) -> bool:
+    """
+    Whether the text of a block is indexed.
+
+    Args:
+        block (Block): Block definition.
+        excluded (set[str]): Excluded block class names.
+
+    Returns:
+        bool: `searchable` `Meta` option of the block if set,
+        otherwise whether its class is not excluded.
+    """
+
+    searchable = getattr(block.meta, "searchable", None)
+    if searchable is not None:
+        return bool(searchable)
+
+    return type(block).__name__ not in excluded
+
+
+@functools.lru_cache(maxsize=RICH_TEXT_CACHE_SIZE)
+def strip_rich_text(source: str) -> str:
+    """
+    Strip the tags of a rich text, once per process for the same source.
+
+    Args:
+        source (str): Rich text HTML.
+
+    Returns:
+        str: Plain text.
+    """
+
+    return get_text_for_indexing(source)
+
+
+def has_default_extraction(block: blocks.Block) -> bool:
+    """
+    Whether the searchable content of a container block is the one of its children.
+
+    Args:
+        block (Block): Block definition.
+
+    Returns:
+        bool: `False` when the block overrides `get_searchable_content`,
+        e.g. `ImageBlock`, so its own extraction is used.
+    """
+
+    method = type(block).get_searchable_content
+    return method in (
+        blocks.StructBlock.get_searchable_content,
+        blocks.StreamBlock.get_searchable_content,
+        blocks.ListBlock.get_searchable_content,
+        SearchMixin.get_searchable_content,
+    )
+
+
+def iter_text(block: blocks.Block, value: Any, excluded: Set[str]) -> Iterator[str]:
+    """
+    Extract the searchable text of a block value, depth-first.
+
+    Unlike `get_searchable_content`, nested lists are not built and joined
+    at every level, excluded blocks are skipped with their children,
+    and missing values are skipped rather than indexed as `"None"`.
+
+    Args:
+        block (Block): Block definition.
+        value (Any): Block value.
+        excluded (set[str]): Excluded block class names.
+
+    Yields:
+        str: Text, in the order of `get_searchable_content`.
+    """
+
+    if value is None or not getattr(block, "search_index", True):
+        return
+
+    if not is_searchable(block, excluded):
+        return
+
+    if isinstance(block, blocks.RichTextBlock):
+        yield strip_rich_text(force_str(value.source))
+        return
+
+    if isinstance(
+        block, (blocks.StructBlock, blocks.StreamBlock, blocks.ListBlock)
+    ) and has_default_extraction(block):
+        for child in streams.iter_children(block, value):
+            yield from iter_text(child.block, child.value, excluded)
+        return
+
+    yield from block.get_searchable_content(value)
+
+
+def iter_stream_text(stream_value: Any) -> Iterator[str]:
+    """
+    Extract the searchable text of a stream, e.g. the value of a page's `StreamField`.
+
+    Args:
+        stream_value (StreamValue): Stream value.
+
+    Yields:
+        str: Text.
+    """
+
+    if stream_value:
+        yield from iter_text(stream_value.stream_block, stream_value, get_excluded())
+
+
+class SearchMixin:
+    """
+    A mixin extracting the searchable content of a block with `iter_text`.
+
+    Block types listed in `WAGTAIL_BLOCKS_SEARCH_EXCLUDE` setting, or blocks
+    setting `searchable = False` `Meta` option, are not indexed.
+    """
+
+    def get_searchable_content(self, value: Any) -> List[str]:
+        excluded = get_excluded()
+        if not getattr(self, "search_index", True) or not is_searchable(
+            self,  # type: ignore
+            excluded,
+        ):
+            return []
+
+        return [
+            text
+            for child in streams.iter_children(self, value)  # type: ignore
+            for text in iter_text(child.block, child.value, excluded)
+        ]
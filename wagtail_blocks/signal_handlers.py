@@ -0,0 +1,135 @@
+"""Signal handlers"""
+
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from wagtail.documents import get_document_model
+from wagtail.embeds.models import Embed
+from wagtail.images import get_image_model
+from wagtail.models import Page
+from wagtail.signals import page_published, page_unpublished, post_page_move
+
+from wagtail_blocks import images, locales, navigation, prerender, references, streams
+
+
+def invalidate_page_structures(sender, instance=None, **kwargs) -> None:
+    """Invalidate cached page structures when the page tree changes."""
+
+    if not isinstance(instance, Page):
+        return
+
+    navigation.bump_version(navigation.get_section(instance))
+
+    # A moved page also changes the section it was moved from
+    parent_page_before = kwargs.get("parent_page_before")
+    if parent_page_before is not None:
+        navigation.bump_version(navigation.get_section(parent_page_before))
+
+
+def invalidate_page_translations(sender, instance=None, **kwargs) -> None:
+    """Invalidate the cached translations of the translation group of a changed page."""
+
+    if not isinstance(instance, Page):
+        return
+
+    translation_keys = [instance.translation_key]
+
+    # A moved page also changes the URLs of its descendants
+    if kwargs.get("parent_page_before") is not None:
+        translation_keys += instance.get_descendants().values_list(
+            "translation_key", flat=True
+        )
+
+    locales.bump_versions(translation_keys)
+
+
+def prewarm_page_renditions(sender, instance=None, **kwargs) -> None:
+    """Generate the renditions of a published page, once the transaction is committed."""
+
+    if instance is None or not getattr(
+        settings, "WAGTAIL_BLOCKS_PREWARM_ON_PUBLISH", False
+    ):
+        return
+
+    transaction.on_commit(partial(images.prewarm_renditions, [instance.specific]))
+
+
+def prerender_page_streams(sender, instance=None, revision=None, **kwargs) -> None:
+    """
+    Render and store the StreamFields of a published page, once the transaction is committed.
+
+    Render errors are logged without failing the publish request,
+    the page is rendered live until it is published again.
+    """
+
+    if instance is None or revision is None or prerender.get_storage() is None:
+        return
+
+    transaction.on_commit(
+        partial(prerender.publish, instance.specific, revision.pk), robust=True
+    )
+
+
+def delete_prerendered_streams(sender, instance=None, **kwargs) -> None:
+    """Delete the stored StreamFields of an unpublished page."""
+
+    if instance is None or prerender.get_storage() != "database":
+        return
+
+    prerender.delete(instance)
+
+
+def index_page_references(sender, instance=None, update_fields=None, **kwargs) -> None:
+    """Index the images, documents and embeds used by the StreamFields of a saved page."""
+
+    if not isinstance(instance, Page) or not references.is_enabled():
+        return
+
+    fields = streams.get_stream_fields(type(instance), inherited=True)
+    if not fields or (
+        update_fields is not None and not set(update_fields) & set(fields)
+    ):
+        return
+
+    references.update_page(instance)
+
+
+def invalidate_object_references(sender, instance=None, **kwargs) -> None:
+    """Invalidate the rendered HTML using a changed image, document or embed."""
+
+    if instance is None or not references.is_enabled():
+        return
+
+    from wagtail_blocks.models import BlockReference
+
+    if isinstance(instance, Embed):
+        kind, key = BlockReference.EMBED, references.get_url_key(instance.url)
+    elif isinstance(instance, get_image_model()):
+        kind, key = BlockReference.IMAGE, str(instance.pk)
+    else:
+        kind, key = BlockReference.DOCUMENT, str(instance.pk)
+
+    transaction.on_commit(partial(references.invalidate, kind, key))
+
+
+def register_signal_handlers() -> None:
+    """Connect signal handlers"""
+
+    page_published.connect(invalidate_page_structures)
+    page_published.connect(invalidate_page_translations)
+    page_published.connect(prewarm_page_renditions)
+    page_published.connect(prerender_page_streams)
+    page_unpublished.connect(invalidate_page_structures)
+    page_unpublished.connect(invalidate_page_translations)
+    page_unpublished.connect(delete_prerendered_streams)
+    post_page_move.connect(invalidate_page_structures)
+    post_page_move.connect(invalidate_page_translations)
+    post_delete.connect(invalidate_page_structures)
+    post_delete.connect(invalidate_page_translations)
+    post_save.connect(index_page_references)
+
+    for model in [get_image_model(), get_document_model(), Embed]:
+        post_save.connect(invalidate_object_references, sender=model)
+        post_delete.connect(invalidate_object_references, sender=model)
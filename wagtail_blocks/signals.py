@@ -0,0 +1,7 @@
+"""Signals"""
+
+from django.dispatch import Signal
+
+# Sent after a block is rendered, when `WAGTAIL_BLOCKS_INSTRUMENTATION` setting is enabled.
+# Arguments: `block`, `timing` (a `Timing`) and `request` (may be `None`).
+block_rendered = Signal()
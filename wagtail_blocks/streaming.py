@@ -0,0 +1,202 @@
+"""Streaming render of StreamFields, one block at a time"""
+
+import re
+import uuid
+from typing import Any, Dict, Iterator, NamedTuple, Optional
+
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.template.response import SimpleTemplateResponse
+from django.utils import translation
+from django.utils.html import format_html
+from django.utils.safestring import SafeString, mark_safe
+from wagtail.blocks import StreamValue
+
+from wagtail_blocks import assets
+
+REGISTRY_ATTR = "_wagtail_blocks_streams"
+
+# Placeholders rendered in place of streamed `StreamField`s
+PLACEHOLDER = "<!--wagtail-blocks-stream:{}-->"
+PLACEHOLDER_RE = re.compile(r"<!--wagtail-blocks-stream:([0-9a-f]{32})-->")
+
+
+class Placeholder(NamedTuple):
+    """A `StreamField` rendered after the rest of the page"""
+
+    stream_value: Any
+    context: Dict[str, Any]
+    flush_after: int
+
+
+def iter_blocks(
+    stream_value: Any,
+    context: Optional[Dict[str, Any]] = None,
+    flush_after: int = 0,
+) -> Iterator[str]:
+    """
+    Render a `StreamValue` one block at a time, e.g. for `StreamingHttpResponse`.
+
+    Joined chunks are identical to `{% include_block stream_value %}`.
+    Streams whose block has a template are rendered as a single chunk.
+
+    Args:
+        stream_value (StreamValue): Stream value.
+        context (dict | None): Parent template context.
+        flush_after (int): Number of leading blocks, e.g. above the fold,
+            rendered together in the first chunk.
+
+    Yields:
+        str: HTML of one or more blocks.
+    """
+
+    stream_block = stream_value.stream_block
+    if stream_block.get_template(stream_value, context=context):
+        yield stream_block.render(stream_value, context=context)
+        return
+
+    buffer = []
+    for index, child in enumerate(stream_value):
+        # Wrap each block like the stream block does, its markup depends on Wagtail
+        html = format_html(
+            "{}{}",
+            "\n" if index else "",
+            stream_block.render_basic(
+                StreamValue(stream_block, [child]), context=context
+            ),
+        )
+
+        if index < flush_after:
+            buffer.append(html)
+            continue
+
+        if buffer:
+            yield "".join(buffer)
+            buffer = []
+
+        yield html
+
+    if buffer:
+        yield "".join(buffer)
+
+
+def is_streaming(request: Optional[HttpRequest]) -> bool:
+    """
+    Whether a request is served by `StreamingPageMixin`.
+
+    Args:
+        request (HttpRequest | None): Request.
+
+    Returns:
+        bool: Whether `StreamField`s are rendered as placeholders.
+    """
+
+    return getattr(request, REGISTRY_ATTR, None) is not None
+
+
+def render_stream(
+    context: Dict[str, Any],
+    stream_value: Any,
+    flush_after: int = 0,
+) -> SafeString:
+    """
+    Render a `StreamValue`, or a placeholder streamed afterward when the page is streamed.
+
+    Args:
+        context (dict): Parent template context, flattened.
+        stream_value (StreamValue): Stream value.
+        flush_after (int): Number of leading blocks sent in the first chunk.
+
+    Returns:
+        SafeString: HTML or placeholder.
+    """
+
+    if stream_value is None:
+        return mark_safe("")
+
+    request = context.get("request")
+    if not is_streaming(request):
+        return mark_safe(stream_value.render_as_block(context=context))
+
+    key = uuid.uuid4().hex
+    getattr(request, REGISTRY_ATTR)[key] = Placeholder(
+        stream_value, context, flush_after
+    )
+
+    return mark_safe(PLACEHOLDER.format(key))
+
+
+def iter_page(
+    html: str,
+    placeholders: Dict[str, Placeholder],
+    language: Optional[str] = None,
+) -> Iterator[str]:
+    """
+    Stream a page rendered with placeholders.
+
+    The page up to the first placeholder is sent right away, then its leading
+    blocks in one chunk and the other blocks one at a time. Assets collected
+    while rendering streamed blocks are rendered after them, as `render_assets`
+    tag was rendered with the rest of the page.
+
+    Args:
+        html (str): Page HTML, with placeholders.
+        placeholders (dict[str, Placeholder]): Streams by placeholder key.
+        language (str | None): Language active while rendering blocks.
+
+    Yields:
+        str: HTML chunks.
+    """
+
+    parts = PLACEHOLDER_RE.split(html)
+    yield parts[0]
+
+    with translation.override(language):
+        for index in range(1, len(parts), 2):
+            placeholder = placeholders.get(parts[index])
+            if placeholder is None:
+                yield PLACEHOLDER.format(parts[index])
+            else:
+                yield from iter_blocks(
+                    placeholder.stream_value,
+                    placeholder.context,
+                    placeholder.flush_after,
+                )
+                yield assets.render_pending(placeholder.context)
+
+            yield parts[index + 1]
+
+
+class StreamingPageMixin:
+    """
+    A mixin for pages streaming their `StreamField`s, rendered by `stream_blocks` tag.
+
+    The page template is rendered first, with placeholders in place of streams,
+    then blocks are rendered while the response is sent, so the time to first byte
+    and the memory used don't grow with the length of the page.
+    Previews and responses which aren't template responses are not streamed.
+    """
+
+    def serve(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        if getattr(request, "is_preview", False):
+            return super().serve(request, *args, **kwargs)  # type: ignore
+
+        placeholders: Dict[str, Placeholder] = {}
+        setattr(request, REGISTRY_ATTR, placeholders)
+        try:
+            response = super().serve(request, *args, **kwargs)  # type: ignore
+            if not isinstance(response, SimpleTemplateResponse):
+                return response
+
+            html = response.rendered_content
+        finally:
+            delattr(request, REGISTRY_ATTR)
+
+        streaming_response = StreamingHttpResponse(
+            iter_page(html, placeholders, translation.get_language()),
+            status=response.status_code,
+        )
+        for header, value in response.items():
+            streaming_response[header] = value
+
+        streaming_response.cookies = response.cookies
+        return streaming_response
@@ -0,0 +1,140 @@
+"""Helpers to traverse `StreamField` values"""
+
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+from django.apps import apps
+from django.db import models
+from wagtail import blocks
+from wagtail.fields import StreamField
+
+
+class Node(NamedTuple):
+    """A block value found while traversing a stream"""
+
+    path: List[str]
+    block: blocks.Block
+    value: Any
+
+
+def iter_children(
+    block: blocks.Block,
+    value: Any,
+    path: Optional[List[str]] = None,
+) -> Iterator[Node]:
+    """
+    Iterate over the direct children of a block value.
+
+    Paths follow Wagtail's content path format: stream children and list items
+    are identified by their id, struct children by their name.
+
+    Args:
+        block (Block): Block definition of `value`.
+        value (Any): Block value.
+        path (list[str] | None): Path of `value`.
+
+    Yields:
+        Node: Path, block definition and value of every child.
+    """
+
+    path = path or []
+    if value is None:
+        return
+
+    if isinstance(block, blocks.StreamBlock):
+        for child in value:
+            yield Node([*path, str(child.id)], child.block, child.value)
+
+    elif isinstance(block, blocks.ListBlock):
+        for child in value.bound_blocks:
+            yield Node([*path, str(child.id)], block.child_block, child.value)
+
+    elif isinstance(block, blocks.StructBlock) and isinstance(
+        value, blocks.StructValue
+    ):
+        for name, child_block in block.child_blocks.items():
+            yield Node([*path, name], child_block, value.get(name))
+
+
+def walk(
+    block: blocks.Block,
+    value: Any,
+    path: Optional[List[str]] = None,
+) -> Iterator[Node]:
+    """
+    Traverse a block value depth-first, yielding every nested block value.
+
+    Args:
+        block (Block): Block definition of `value`.
+        value (Any): Block value.
+        path (list[str] | None): Path of `value`.
+
+    Yields:
+        Node: Path, block definition and value of every node, including `value` itself.
+    """
+
+    path = path or []
+    yield Node(path, block, value)
+
+    for child in iter_children(block, value, path):
+        yield from walk(child.block, child.value, child.path)
+
+
+def walk_stream(stream_value: Any, path: Optional[List[str]] = None) -> Iterator[Node]:
+    """
+    Traverse a `StreamValue`, e.g. the value of a page's `StreamField`.
+
+    Args:
+        stream_value (StreamValue): Stream value.
+        path (list[str] | None): Path of the stream, usually the field name.
+
+    Yields:
+        Node: Path, block definition and value of every node.
+    """
+
+    yield from walk(stream_value.stream_block, stream_value, path)
+
+
+def get_stream_fields(model: type[models.Model], inherited: bool = False) -> List[str]:
+    """
+    Get the names of the `StreamField`s declared on a model.
+
+    Args:
+        model (type[Model]): Django model.
+        inherited (bool): Include fields declared on concrete parent models.
+
+    Returns:
+        list[str]: Field names.
+    """
+
+    return [
+        field.name
+        for field in model._meta.get_fields()
+        if isinstance(field, StreamField) and (inherited or field.model is model)
+    ]
+
+
+def get_stream_models(
+    labels: Optional[List[str]] = None,
+) -> Dict[type[models.Model], List[str]]:
+    """
+    Get every installed model declaring `StreamField`s.
+
+    Args:
+        labels (list[str] | None): Only include these models, e.g. `["blog.BlogPage"]`.
+
+    Returns:
+        dict[type[Model], list[str]]: `StreamField` names by model.
+
+    Raises:
+        LookupError: If a label doesn't match an installed model.
+    """
+
+    selected = [apps.get_model(label) for label in labels] if labels else None
+
+    stream_models = {}
+    for model in apps.get_models():
+        fields = get_stream_fields(model)
+        if fields and (selected is None or model in selected):
+            stream_models[model] = fields
+
+    return stream_models
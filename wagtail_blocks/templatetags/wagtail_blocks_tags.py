@@ -0,0 +1,454 @@
+"""Template tags for wagtail_blocks components"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from django import template
+from django.templatetags.static import static
+from django.utils import translation
+from django.utils.html import format_html
+from django.utils.safestring import SafeString, mark_safe
+from wagtail.models import Page
+
+from wagtail_blocks import (
+    assets,
+    css,
+    documents,
+    images,
+    locales,
+    navigation,
+    prefetch,
+    prerender,
+    streaming,
+    themes,
+)
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def page_tree(
+    context: Dict[str, Any],
+    page: Page,
+    depth: Optional[int] = None,
+) -> List[navigation.TreeNode]:
+    """
+    Get the live, public subtree of a page, loaded with a single query.
+
+    Usage:
+        {% page_tree page depth=2 as nodes %}
+
+    Args:
+        context (dict): Template context.
+        page (Page): Root of the subtree.
+        depth (int | None): Maximum depth relative to `page`.
+
+    Returns:
+        list[TreeNode]: Children of `page`.
+    """
+
+    if page is None:
+        return []
+
+    # Missing template variables resolve to an empty string
+    return navigation.get_tree(
+        page, context.get("request"), int(depth) if depth else None
+    )
+
+
+@register.simple_tag(takes_context=True)
+def sibling_navigation(
+    context: Dict[str, Any],
+    page: Page,
+) -> navigation.SiblingNavigation:
+    """
+    Get the previous and next pages of a page from a precomputed index.
+
+    Usage:
+        {% sibling_navigation page as sibling_nav %}
+
+    Args:
+        context (dict): Template context.
+        page (Page): Wagtail page.
+
+    Returns:
+        SiblingNavigation: Previous and next pages.
+    """
+
+    if page is None:
+        return navigation.SiblingNavigation()
+
+    return navigation.get_sibling_navigation(page, context.get("request"))
+
+
+@register.simple_tag(takes_context=True)
+def page_translations(
+    context: Dict[str, Any],
+    page: Page,
+) -> List[locales.TranslationLink]:
+    """
+    Get the live translations of a page, cached per translation group.
+
+    Usage:
+        {% page_translations page as translations %}
+
+    Args:
+        context (dict): Template context.
+        page (Page): Wagtail page.
+
+    Returns:
+        list[TranslationLink]: Live translations, excluding `page`.
+    """
+
+    if page is None:
+        return []
+
+    return locales.get_translations(page, context.get("request"))
+
+
+@register.simple_tag
+def language_options() -> SafeString:
+    """
+    Render the options of the `LANGUAGES` setting for the active language, once per process.
+
+    Usage:
+        {% language_options %}
+
+    Returns:
+        SafeString: HTML.
+    """
+
+    return locales.render_language_options(translation.get_language())
+
+
+@register.simple_tag(takes_context=True)
+def breadcrumbs(context: Dict[str, Any], page: Page) -> List[navigation.PageLink]:
+    """
+    Get the breadcrumbs of a page, decoded from its materialized path.
+
+    Usage:
+        {% breadcrumbs page as links %}
+
+    Args:
+        context (dict): Template context.
+        page (Page): Wagtail page.
+
+    Returns:
+        list[PageLink]: Links to the ancestors of the page.
+    """
+
+    if page is None:
+        return []
+
+    return navigation.get_breadcrumbs(page, context.get("request"))
+
+
+@register.simple_tag(takes_context=True)
+def load_breadcrumbs(context: Dict[str, Any], pages: Iterable[Page]) -> str:
+    """
+    Resolve the breadcrumbs of many pages at once, e.g. in list views.
+
+    Usage:
+        {% load_breadcrumbs object_list %}
+
+    Args:
+        context (dict): Template context.
+        pages (Iterable[Page]): Wagtail pages.
+
+    Returns:
+        str: Empty string.
+    """
+
+    navigation.load_breadcrumbs(pages or [], context.get("request"))
+    return ""
+
+
+@register.simple_tag
+def prefetch_renditions(stream_value: Any) -> images.PrefetchResult:
+    """
+    Fetch or create every rendition used by the image blocks of a stream, in bulk.
+
+    Usage:
+        {% prefetch_renditions page.body as result %}
+
+    Args:
+        stream_value (StreamValue): Stream value.
+
+    Returns:
+        PrefetchResult: Prefetch statistics.
+    """
+
+    if not stream_value:
+        return images.PrefetchResult()
+
+    return images.prefetch_renditions(stream_value)
+
+
+@register.simple_tag
+def prefetch_documents(stream_value: Any) -> str:
+    """
+    Load the uploader and file size of every document in a stream, in bulk.
+
+    Usage:
+        {% prefetch_documents page.body %}
+
+    Args:
+        stream_value (StreamValue): Stream value.
+
+    Returns:
+        str: Empty string, documents are updated in place.
+    """
+
+    if stream_value:
+        documents.prefetch_documents(stream_value)
+
+    return ""
+
+
+@register.simple_tag
+def prefetch_stream(stream_value: Any) -> prefetch.StreamPrefetchResult:
+    """
+    Fetch the embeds, renditions and documents of a stream, concurrently
+    when `WAGTAIL_BLOCKS_CONCURRENT_PREFETCH` is set.
+
+    Usage:
+        {% prefetch_stream page.body as result %}
+
+    Args:
+        stream_value (StreamValue): Stream value.
+
+    Returns:
+        StreamPrefetchResult: Prefetch statistics.
+    """
+
+    return prefetch.prefetch_stream(stream_value)
+
+
+@register.simple_tag
+def block_image(image: Any, eager: bool = False, **attrs: Any) -> SafeString:
+    """
+    Render an image of an image block, responsive when `WAGTAIL_BLOCKS_RESPONSIVE_IMAGES` is set.
+
+    Usage:
+        {% block_image item eager=forloop.first class="w-full" %}
+
+    Args:
+        image (AbstractImage): Image.
+        eager (bool): Whether the image should be loaded eagerly.
+        attrs (dict): Extra HTML attributes of the `<img>` tag.
+
+    Returns:
+        SafeString: HTML.
+    """
+
+    if not image:
+        return mark_safe("")
+
+    return images.render_image(image, eager=eager, attrs=attrs)
+
+
+@register.simple_tag
+def block_styles(*sources: Any) -> SafeString:
+    """
+    Render a stylesheet containing only the CSS rules used by some streams and templates.
+
+    Usage:
+        {% block_styles page.body "wagtail/components/breadcrumbs.html" %}
+
+    Args:
+        sources (list[StreamValue | str]): Stream values or template names.
+
+    Returns:
+        SafeString: `<style>` or `<link>` tag.
+    """
+
+    classes = css.get_templates_classes(
+        source for source in sources if isinstance(source, str)
+    )
+    for source in sources:
+        if source and not isinstance(source, str):
+            classes.update(css.get_stream_classes(source))
+
+    return css.render_styles(classes)
+
+
+@register.simple_tag
+def get_themes() -> List[themes.Theme]:
+    """
+    Get the themes shown by the theme switcher.
+
+    Usage:
+        {% get_themes as themes %}
+
+    Returns:
+        list[Theme]: Themes.
+    """
+
+    return themes.get_themes()
+
+
+@register.simple_tag
+def theme_urls() -> Dict[str, str]:
+    """
+    Get the stylesheet URLs loaded by the theme switcher, when themes are loaded lazily.
+
+    Usage:
+        {% theme_urls as urls %}
+
+    Returns:
+        dict[str, str]: Stylesheet URLs by theme name, empty if themes are not split.
+    """
+
+    return themes.get_theme_urls() if themes.is_lazy() else {}
+
+
+@register.simple_tag
+def theme_stylesheet(name: str = "") -> SafeString:
+    """
+    Link the stylesheet of wagtail_blocks, or the stylesheet of a theme.
+
+    When themes are loaded lazily, the core stylesheet doesn't include
+    the rules of most themes. Otherwise, the full stylesheet is linked.
+
+    Usage:
+        {% theme_stylesheet %}
+        {% theme_stylesheet "retro" %}
+
+    Args:
+        name (str): Theme name, empty for the core stylesheet.
+
+    Returns:
+        SafeString: `<link>` tag or empty string.
+    """
+
+    if not themes.is_lazy():
+        if name:
+            return mark_safe("")
+
+        url = static(css.get_stylesheet_path())
+    else:
+        url = themes.get_stylesheet_url(name)
+
+    if not url:
+        return mark_safe("")
+
+    return format_html('<link rel="stylesheet" href="{}" />', url)
+
+
+@register.simple_tag(takes_context=True)
+def use_asset(context: Dict[str, Any], *names: str) -> SafeString:
+    """
+    Register scripts or styles used by a template, rendered once per page.
+
+    Usage:
+        {% use_asset "form" %}
+
+    Args:
+        context (dict): Template context.
+        names (list[str]): Asset names.
+
+    Returns:
+        SafeString: Assets rendered in place, unless they are collected.
+    """
+
+    return assets.use(context, names)
+
+
+@register.simple_tag(takes_context=True)
+def render_assets(
+    context: Dict[str, Any], position: Optional[str] = None
+) -> SafeString:
+    """
+    Render the assets registered while rendering the page, once each.
+
+    Usage:
+        {% render_assets %}
+
+    Args:
+        context (dict): Template context.
+        position (str | None): Only render `"head"` or `"body"` assets.
+
+    Returns:
+        SafeString: HTML.
+    """
+
+    return assets.render_pending(context, position)
+
+
+@register.simple_tag(takes_context=True)
+def asset_hints(context: Dict[str, Any], *streams: Any) -> SafeString:
+    """
+    Render `preconnect` hints for the blocks of some streams, in the head.
+
+    When assets are collected, their styles are rendered as well.
+
+    Usage:
+        {% asset_hints page.body %}
+
+    Args:
+        context (dict): Template context.
+        streams (list[StreamValue]): Stream values.
+
+    Returns:
+        SafeString: HTML.
+    """
+
+    names = [
+        name
+        for stream_value in streams
+        if stream_value
+        for name in assets.get_stream_assets(stream_value)
+    ]
+
+    html = assets.render_hints(names)
+    if assets.is_collected(context):
+        assets.use(context, names)
+        html += assets.render_pending(context, "head")
+
+    return mark_safe(html)
+
+
+@register.simple_tag(takes_context=True)
+def stream_blocks(context: Any, stream_value: Any, flush_after: int = 0) -> SafeString:
+    """
+    Render a `StreamField` like `include_block`, streamed block by block
+    when the page uses `StreamingPageMixin`.
+
+    Usage:
+        {% stream_blocks page.body flush_after=3 %}
+
+    Args:
+        context (Context): Template context.
+        stream_value (StreamValue): Stream value.
+        flush_after (int): Number of leading blocks, e.g. above the fold,
+            sent in the first chunk.
+
+    Returns:
+        SafeString: HTML or a placeholder replaced while streaming.
+    """
+
+    flat = context.flatten() if hasattr(context, "flatten") else context.get_all()
+    return streaming.render_stream(dict(flat), stream_value, flush_after)
+
+
+@register.simple_tag(takes_context=True)
+def prerendered_stream(
+    context: Any, page: Page, field_name: str = "body"
+) -> SafeString:
+    """
+    Render a `StreamField` from the HTML stored when the page was published,
+    or live when it wasn't stored.
+
+    Usage:
+        {% prerendered_stream page "body" %}
+
+    Args:
+        context (Context): Template context.
+        page (Page): Page being served.
+        field_name (str): `StreamField` name.
+
+    Returns:
+        SafeString: HTML.
+    """
+
+    flat = context.flatten() if hasattr(context, "flatten") else context.get_all()
+    return prerender.render(dict(flat), page, field_name)
@@ -0,0 +1,69 @@
+"""Tests of the rendered fragment cache"""
+
+import re
+from typing import List
+
+from django.http import HttpRequest
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from wagtail_blocks import cache
+from wagtail_blocks.blocks import AccordionBlock
+
+NAME_RE = re.compile(r'name="([^"]+)"')
+
+
+@override_settings(WAGTAIL_BLOCKS_CACHE=True)
+class CacheMixinTestCase(SimpleTestCase):
+    """Rendering of blocks using `CacheMixin`"""
+
+    def setUp(self) -> None:
+        cache.fragment_cache.clear()
+        cache.fragment_cache.reset_stats()
+        cache.get_backend().clear()  # type: ignore
+
+        self.block = AccordionBlock()
+        self.value = self.block.to_python(
+            {"style": "", "items": [{"title": "Title", "content": "<p>Content</p>"}]}
+        )
+
+    def render_names(self, request: HttpRequest, times: int = 2) -> List[str]:
+        """Render the same accordion several times in a request, return its input names."""
+
+        return [
+            name
+            for _ in range(times)
+            for name in set(
+                NAME_RE.findall(self.block.render(self.value, {"request": request}))
+            )
+        ]
+
+    def test_names_are_unique_on_hits(self) -> None:
+        names = self.render_names(RequestFactory().get("/"))
+
+        with override_settings(WAGTAIL_BLOCKS_CACHE=False):
+            expected = self.render_names(RequestFactory().get("/"))
+
+        self.assertEqual(names, expected)
+        self.assertEqual(names[1], f"{names[0]}-2")
+        self.assertEqual(cache.fragment_cache.stats["memory_hits"], 1)
+
+    def test_names_are_unique_on_backend_hits(self) -> None:
+        self.render_names(RequestFactory().get("/"), times=1)
+        cache.fragment_cache.clear()
+
+        names = self.render_names(RequestFactory().get("/"), times=3)
+
+        self.assertEqual(names[1:], [f"{names[0]}-2", f"{names[0]}-3"])
+        self.assertEqual(cache.fragment_cache.stats["backend_hits"], 1)
+
+    def test_previews_are_not_cached(self) -> None:
+        request = RequestFactory().get("/")
+        request.is_preview = True  # type: ignore
+
+        self.render_names(request)
+
+        self.assertEqual(
+            cache.fragment_cache.stats["memory_hits"]
+            + cache.fragment_cache.stats["misses"],
+            0,
+        )
@@ -0,0 +1,109 @@
+"""Tests of the compiled render of simple blocks"""
+
+import shutil
+import tempfile
+from typing import Any, Dict, List
+
+from django.test import TestCase, override_settings
+
+from wagtail_blocks import benchmark
+
+# Characters escaped by templates, used in every field of the escaping cases
+UNSAFE = "<script>alert(\"x\")</script> & 'quotes'"
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def build_escaping(size: int) -> List[Dict[str, Any]]:
+    """
+    Build blocks whose fields contain characters escaped by templates.
+
+    Args:
+        size (int): Number of blocks of each type.
+
+    Returns:
+        list[dict]: Raw stream data.
+    """
+
+    ide = {
+        "title": UNSAFE,
+        "url": f"https://example.com/?a=1&b={UNSAFE}",
+        "slug_hash": UNSAFE,
+        "user": UNSAFE,
+        "id": UNSAFE,
+        "name": UNSAFE,
+        "code": UNSAFE,
+    }
+    data: List[Dict[str, Any]] = []
+    for i in range(size):
+        data += [
+            {
+                "type": "alert",
+                "value": {"level": "error", "style": "", "message": f"<p>{i}</p>"},
+            },
+            {"type": "code", "value": {"language": "auto", "code": UNSAFE}},
+            {"type": "code", "value": {"language": "python", "code": UNSAFE}},
+            {"type": "code_pen", "value": ide},
+            {"type": "code_sandbox", "value": ide},
+            {"type": "stack_blitz", "value": ide},
+            {"type": "expo_snack", "value": ide},
+        ]
+
+    return data
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, WAGTAIL_BLOCKS_CACHE=False)
+class CompiledRenderTestCase(TestCase):
+    """Compiled builders render exactly like templates"""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.fixtures = benchmark.create_fixtures(2)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self) -> None:
+        self.stream_block = benchmark.get_stream_block()
+
+    def assertRendersIdentically(
+        self, data: List[Dict[str, Any]], **overrides: Any
+    ) -> None:
+        """Render raw stream data with templates, then compiled, and compare."""
+
+        data = benchmark.assign_ids(self.stream_block, data)
+        outputs = []
+        for enabled in (False, True):
+            with self.settings(WAGTAIL_BLOCKS_COMPILED_RENDER=enabled, **overrides):
+                outputs.append(benchmark.render(self.stream_block, data))
+
+        self.assertEqual(outputs[0], outputs[1])
+
+    def test_scenarios(self) -> None:
+        scenarios = ["alert", "code", "diff", "code_pen", "code_sandbox"]
+        for name in [*scenarios, "stack_blitz", "expo_snack"]:
+            with self.subTest(name):
+                build = benchmark.BLOCK_SCENARIOS[name]
+                self.assertRendersIdentically(build(self.fixtures, 2))
+
+    def test_highlighted(self) -> None:
+        self.assertRendersIdentically(
+            benchmark.build_code(self.fixtures, 2), WAGTAIL_BLOCKS_HIGHLIGHT=True
+        )
+
+    def test_escaping(self) -> None:
+        self.assertRendersIdentically(build_escaping(2))
+
+    def test_escaping_highlighted(self) -> None:
+        self.assertRendersIdentically(build_escaping(2), WAGTAIL_BLOCKS_HIGHLIGHT=True)
+
+    def test_embeds_facade(self) -> None:
+        self.assertRendersIdentically(build_escaping(2), WAGTAIL_BLOCKS_FACADE="click")
+
+    def test_responsive_images(self) -> None:
+        self.assertRendersIdentically(
+            benchmark.build_diff(self.fixtures, 2),
+            WAGTAIL_BLOCKS_RESPONSIVE_IMAGES=True,
+        )
@@ -0,0 +1,23 @@
+"""Tests of the per-page stylesheet"""
+
+from django.test import SimpleTestCase, override_settings
+
+from wagtail_blocks import css
+from wagtail_blocks.blocks import CodePenBlock
+
+
+class BlockClassesTestCase(SimpleTestCase):
+    """Classes used to render a block value"""
+
+    def setUp(self) -> None:
+        self.block = CodePenBlock()
+        self.value = self.block.to_python({"slug_hash": "abc", "user": "user"})
+
+    def test_facade_includes_embed_classes(self) -> None:
+        expected = css.get_block_classes(self.block, self.value)
+
+        with override_settings(WAGTAIL_BLOCKS_FACADE="click"):
+            classes = css.get_block_classes(self.block, self.value)
+
+        self.assertTrue({"codepen", "sr-only"} <= expected)
+        self.assertTrue(expected <= classes)
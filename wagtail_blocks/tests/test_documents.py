@@ -0,0 +1,46 @@
+"""Tests of the document metadata helpers"""
+
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from wagtail.documents import get_document_model
+
+from wagtail_blocks import documents
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class BackfillFileSizesTestCase(TestCase):
+    """File sizes stored for documents uploaded without one"""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        document_model = get_document_model()
+        cls.document = document_model.objects.create(
+            title="Document", file=ContentFile(b"%PDF-1.4\n", name="document.pdf")
+        )
+        cls.missing = document_model.objects.create(
+            title="Missing", file=ContentFile(b"%PDF-1.4\n", name="missing.pdf")
+        )
+        cls.missing.file.storage.delete(cls.missing.file.name)
+        document_model.objects.update(file_size=None)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def test_sizes_are_stored(self) -> None:
+        document_model = get_document_model()
+        loaded = list(document_model.objects.order_by("pk"))
+
+        with self.assertLogs(documents.logger, "WARNING"):
+            self.assertEqual(documents.backfill_file_sizes(loaded), 1)
+
+        self.assertEqual(loaded[0].file_size, len(b"%PDF-1.4\n"))
+        self.assertIsNone(loaded[1].file_size)
+        self.document.refresh_from_db()
+        self.assertEqual(self.document.file_size, len(b"%PDF-1.4\n"))
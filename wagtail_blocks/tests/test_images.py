@@ -0,0 +1,48 @@
+"""Tests of the responsive images of image blocks"""
+
+import io
+import re
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from PIL import Image
+from wagtail.images import get_image_model
+
+from wagtail_blocks import cache, images
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, WAGTAIL_BLOCKS_RESPONSIVE_IMAGES=True)
+class RenderImageTestCase(TestCase):
+    """Responsive images rendered as `<picture>`"""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        buffer = io.BytesIO()
+        Image.new("RGB", (800, 450), (32, 96, 160)).save(buffer, "PNG")
+        cls.image = get_image_model().objects.create(
+            title="Small image",
+            file=ContentFile(buffer.getvalue(), name="small.png"),
+        )
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self) -> None:
+        # Renditions are cached by image id, which other tests may have used
+        cache.get_backend().clear()  # type: ignore
+
+    def test_srcset_widths_are_unique(self) -> None:
+        html = images.render_image(self.image)
+        srcsets = re.findall(r'srcset="([^"]*)"', html)
+
+        self.assertEqual(len(srcsets), 3)
+        for srcset in srcsets:
+            with self.subTest(srcset):
+                widths = re.findall(r" (\d+)w", srcset)
+                self.assertEqual(widths, ["640", "800"])
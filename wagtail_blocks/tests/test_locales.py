@@ -0,0 +1,50 @@
+"""Tests of the cached translations of the language switch"""
+
+from django.test import TestCase
+from wagtail.models import Locale, Page
+
+from wagtail_blocks import cache, locales
+
+
+class TranslationsTestCase(TestCase):
+    """Translations cached per translation group"""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        home = Page.objects.get(depth=2)
+        cls.page = home.add_child(instance=Page(title="Page", slug="page"))
+        cls.other = home.add_child(instance=Page(title="Other", slug="other"))
+
+        Locale.objects.create(language_code="fr")
+        cls.translation = cls.page.copy_for_translation(
+            Locale.objects.get(language_code="fr"), copy_parents=True
+        )
+        cls.translation.save_revision().publish()
+
+    def setUp(self) -> None:
+        cache.get_backend().clear()  # type: ignore
+
+    def get_ids(self, page: Page) -> list:
+        """Get the ids of the cached translations of a page."""
+
+        return [link.id for link in locales.get_translations(page)]
+
+    def test_translations_are_cached(self) -> None:
+        self.assertEqual(self.get_ids(self.page), [self.translation.pk])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_ids(self.page), [self.translation.pk])
+
+    def test_other_groups_keep_their_cache(self) -> None:
+        self.get_ids(self.page)
+        self.other.save_revision().publish()
+
+        with self.assertNumQueries(0):
+            self.get_ids(self.page)
+
+    def test_unpublished_translation_is_removed(self) -> None:
+        self.get_ids(self.page)
+        self.translation.refresh_from_db()
+        self.translation.unpublish()
+
+        self.assertEqual(self.get_ids(self.page), [])
@@ -0,0 +1,61 @@
+"""Tests of the cached page tree"""
+
+from django.test import TestCase
+from wagtail.models import Page
+
+from wagtail_blocks import cache, navigation
+
+
+class TreeTestCase(TestCase):
+    """Page tree cached until a page is published, unpublished or moved"""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.home = Page.objects.get(depth=2)
+        cls.section = cls.home.add_child(instance=Page(title="Section", slug="section"))
+        cls.other = cls.home.add_child(instance=Page(title="Other", slug="other"))
+        cls.child = cls.section.add_child(instance=Page(title="Child", slug="child"))
+
+    def setUp(self) -> None:
+        cache.get_backend().clear()  # type: ignore
+
+    def get_titles(self, page: Page) -> list:
+        """Get the titles of the children of a page in the cached tree."""
+
+        return [node.title for node in navigation.get_tree(page)]
+
+    def test_tree_is_cached(self) -> None:
+        self.assertEqual(self.get_titles(self.home), ["Section", "Other"])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_titles(self.home), ["Section", "Other"])
+
+    def test_published_page_invalidates_tree(self) -> None:
+        self.get_titles(self.section)
+        self.section.add_child(instance=Page(title="New", slug="new", live=False))
+
+        page = Page.objects.get(slug="new")
+        page.save_revision().publish()
+
+        self.assertEqual(self.get_titles(self.section), ["Child", "New"])
+
+    def test_unpublished_page_invalidates_tree(self) -> None:
+        self.get_titles(self.section)
+        self.child.refresh_from_db()
+        self.child.unpublish()
+
+        self.assertEqual(self.get_titles(self.section), [])
+
+    def test_moved_page_invalidates_tree(self) -> None:
+        self.get_titles(self.section)
+        self.child.refresh_from_db()
+        self.child.move(self.other, pos="last-child")
+
+        self.assertEqual(self.get_titles(self.section), [])
+        self.assertEqual(self.get_titles(self.other), ["Child"])
+
+    def test_evicted_version_is_not_reused(self) -> None:
+        version = navigation.get_version()
+        cache.get_backend().delete(f"{navigation.VERSION_KEY}:")  # type: ignore
+
+        self.assertNotEqual(navigation.get_version(), version)
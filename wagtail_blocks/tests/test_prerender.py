@@ -0,0 +1,56 @@
+"""Tests of the render-on-publish of StreamFields"""
+
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from wagtail.models import Page
+
+from wagtail_blocks import cache, prerender
+
+
+class PrerenderTestCase(TestCase):
+    """StreamFields rendered on publish"""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        home = Page.objects.get(depth=2)
+        cls.page = home.add_child(instance=Page(title="Page", slug="page"))
+        cls.page.save_revision().publish()
+
+    def setUp(self) -> None:
+        cache.get_backend().clear()  # type: ignore
+        self.page.refresh_from_db()
+
+    def test_stored_html_is_served(self) -> None:
+        rendered = {"body": prerender.Rendered("<p>Stored</p>", [])}
+
+        for storage in ["database", "cache"]:
+            with (
+                self.subTest(storage),
+                override_settings(WAGTAIL_BLOCKS_PRERENDER=storage),
+            ):
+                prerender.store(
+                    self.page,
+                    self.page.live_revision_id,
+                    prerender.get_language(),
+                    rendered,
+                )
+
+                self.assertEqual(
+                    prerender.render({}, self.page, "body"), "<p>Stored</p>"
+                )
+
+    @override_settings(WAGTAIL_BLOCKS_PRERENDER="database")
+    def test_render_errors_do_not_fail_publish(self) -> None:
+        with (
+            mock.patch.object(prerender, "publish", side_effect=ValueError),
+            self.assertLogs("django.test", "ERROR"),
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            self.page.save_revision().publish()
+
+        self.page.refresh_from_db()
+        self.assertTrue(self.page.live)
+        self.assertIsNone(
+            prerender.load(self.page.live_revision_id, "body", prerender.get_language())
+        )
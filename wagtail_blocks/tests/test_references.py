@@ -0,0 +1,69 @@
+"""Tests of the invalidation of rendered HTML using changed objects"""
+
+import shutil
+import tempfile
+
+from django.test import TestCase, override_settings
+
+from wagtail_blocks import benchmark, cache, references
+from wagtail_blocks.blocks import DiffBlock
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    WAGTAIL_BLOCKS_CACHE=True,
+    WAGTAIL_BLOCKS_REFERENCE_INDEX=True,
+)
+class InvalidationTestCase(TestCase):
+    """Fragments invalidated when an image they use is saved"""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.fixtures = benchmark.create_fixtures(3)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self) -> None:
+        cache.fragment_cache.clear()
+        cache.fragment_cache.reset_stats()
+        cache.get_backend().clear()  # type: ignore
+
+        self.block = DiffBlock()
+        self.value = self.block.to_python(
+            benchmark.build_diff(self.fixtures, 1)[0]["value"]
+        )
+
+    def save_image(self, index: int) -> None:
+        """Save an image, and run the handlers waiting for the commit."""
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.fixtures.images[index].save()
+
+    def test_saved_image_invalidates_fragments(self) -> None:
+        self.block.render(self.value)
+        self.block.render(self.value)
+        self.assertEqual(cache.fragment_cache.stats["memory_hits"], 1)
+
+        self.save_image(0)
+        self.block.render(self.value)
+
+        self.assertEqual(cache.fragment_cache.stats["misses"], 2)
+
+    def test_other_images_keep_their_fragments(self) -> None:
+        versions = references.get_versions(self.block, self.value)
+        self.save_image(2)
+
+        self.assertEqual(references.get_versions(self.block, self.value), versions)
+
+    def test_evicted_versions_are_not_reused(self) -> None:
+        versions = references.get_versions(self.block, self.value)
+        cache.get_backend().clear()  # type: ignore
+
+        self.save_image(0)
+
+        self.assertNotEqual(references.get_versions(self.block, self.value), versions)
@@ -0,0 +1,58 @@
+"""Tests of the search-index text extraction of blocks"""
+
+import shutil
+import tempfile
+from typing import Any, List
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from wagtail import blocks
+
+from wagtail_blocks import benchmark, search
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def get_default_content(self: blocks.Block, value: Any) -> List[str]:
+    """Searchable content extracted by Wagtail, as if `SearchMixin` wasn't used."""
+
+    return super(search.SearchMixin, self).get_searchable_content(value)  # type: ignore
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class IterStreamTextTestCase(TestCase):
+    """Searchable text extracted in a single pass"""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.fixtures = benchmark.create_fixtures(2)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self) -> None:
+        self.stream_block = benchmark.get_stream_block()
+        self.data = benchmark.build_mixed(self.fixtures, 2)
+        self.stream_value = self.stream_block.to_python(self.data)
+
+    def test_text_matches_wagtail(self) -> None:
+        with mock.patch.object(
+            search.SearchMixin, "get_searchable_content", get_default_content
+        ):
+            expected = self.stream_block.get_searchable_content(self.stream_value)
+
+        # Wagtail indexes missing values, e.g. optional IDE fields, as "None"
+        expected = [text for text in expected if text != "None"]
+        self.assertTrue(expected)
+        self.assertEqual(list(search.iter_stream_text(self.stream_value)), expected)
+
+    def test_excluded_blocks_are_skipped(self) -> None:
+        code = next(
+            data["value"]["code"] for data in self.data if data["type"] == "code"
+        )
+        self.assertIn(code, search.iter_stream_text(self.stream_value))
+
+        with self.settings(WAGTAIL_BLOCKS_SEARCH_EXCLUDE=["CodeBlock"]):
+            self.assertNotIn(code, search.iter_stream_text(self.stream_value))
@@ -0,0 +1,57 @@
+"""Tests of the streaming render of StreamFields"""
+
+import shutil
+import tempfile
+from typing import Any, Dict
+
+from django.test import RequestFactory, TestCase, override_settings
+
+from wagtail_blocks import benchmark, streaming
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    ROOT_URLCONF="wagtail_blocks.tests.urls",
+    WAGTAIL_BLOCKS_CACHE=False,
+)
+class IterBlocksTestCase(TestCase):
+    """Streamed blocks render like `{% include_block %}`"""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.fixtures = benchmark.create_fixtures(2)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self) -> None:
+        stream_block = benchmark.get_stream_block()
+        data = benchmark.assign_ids(
+            stream_block, benchmark.build_mixed(self.fixtures, 2)
+        )
+        self.stream_value = stream_block.to_python(data)
+
+    def get_context(self) -> Dict[str, Any]:
+        """Get a context with a new request, so input names are registered again."""
+
+        return {"request": RequestFactory().get("/")}
+
+    def test_chunks_are_identical(self) -> None:
+        expected = self.stream_value.render_as_block(context=self.get_context())
+
+        for flush_after in (0, 3, len(self.stream_value)):
+            with self.subTest(flush_after=flush_after):
+                chunks = list(
+                    streaming.iter_blocks(
+                        self.stream_value, self.get_context(), flush_after
+                    )
+                )
+
+                self.assertEqual("".join(chunks), expected)
+                self.assertEqual(
+                    len(chunks), len(self.stream_value) - max(flush_after - 1, 0)
+                )
@@ -0,0 +1,52 @@
+"""Tests of the Jinja2 template set"""
+
+import importlib.util
+import unittest
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from wagtail.models import Page
+
+from wagtail_blocks.management.commands import compare_template_engines
+
+
+@unittest.skipUnless(importlib.util.find_spec("jinja2"), "Jinja2 is not installed")
+@override_settings(ROOT_URLCONF="wagtail_blocks.tests.urls")
+class TemplateEnginesTestCase(TestCase):
+    """Jinja2 templates render like Django templates"""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        home = Page.objects.get(depth=2)
+        section = home.add_child(instance=Page(title="Section", slug="section"))
+        section.add_child(instance=Page(title="Child", slug="child"))
+
+    def test_outputs_are_equivalent(self) -> None:
+        stdout = StringIO()
+        call_command("compare_template_engines", size=2, repeat=1, stdout=stdout)
+
+        self.assertIn("Outputs are equivalent.", stdout.getvalue())
+
+    def test_languages_without_i18n_urls(self) -> None:
+        command = compare_template_engines.Command()
+        django_templates = [
+            engine
+            for engine in settings.TEMPLATES
+            if engine["BACKEND"] == compare_template_engines.DJANGO_BACKEND
+        ]
+        engines = {
+            "django": django_templates,
+            "jinja2": [compare_template_engines.DEFAULT_JINJA2, *django_templates],
+        }
+        context = {"LANGUAGES": [("en", "English")], "LANGUAGE_CODE": "en"}
+
+        outputs, _ = command.compare(
+            lambda: command.render("wagtail/components/languages.html", context),
+            engines,
+            {"repeat": 1},
+        )
+
+        self.assertIn('action=""', outputs["jinja2"])
+        self.assertEqual(outputs["django"], outputs["jinja2"])
@@ -0,0 +1,11 @@
+"""URL configuration of the tests, without `django.conf.urls.i18n`"""
+
+from django.urls import include, path
+from wagtail import urls as wagtail_urls
+from wagtail.documents import urls as wagtaildocs_urls
+
+urlpatterns = [
+    path("blocks/", include("wagtail_blocks.urls")),
+    path("documents/", include(wagtaildocs_urls)),
+    path("", include(wagtail_urls)),
+]
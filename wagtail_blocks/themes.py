@@ -0,0 +1,201 @@
+"""Theme registry and theme-split stylesheets"""
+
+import functools
+import hashlib
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.urls import reverse
+
+from wagtail_blocks import constants, css
+
+# Themes kept in the core stylesheet: the default theme and the `prefers-color-scheme: dark` one
+CORE_THEMES = ["default", "light", "dark"]
+
+THEME_RE = re.compile(r"\[data-theme=([\w-]+)\]|theme-controller\[value=([\w-]+)\]")
+
+
+class Theme(NamedTuple):
+    """A daisyUI theme"""
+
+    name: str
+    label: str
+
+
+class Stylesheet(NamedTuple):
+    """A theme-split stylesheet and its content hash"""
+
+    css: str
+    digest: str
+
+
+def get_themes() -> List[Theme]:
+    """
+    Get the themes shown by the theme switcher.
+
+    Returns:
+        list[Theme]: Themes of `WAGTAIL_BLOCKS_THEMES` setting, all daisyUI themes by default.
+    """
+
+    labels = dict(constants.THEMES)
+    names = getattr(settings, "WAGTAIL_BLOCKS_THEMES", None) or list(labels)
+
+    return [Theme(name, labels.get(name, name.title())) for name in names]
+
+
+def is_lazy() -> bool:
+    """
+    Whether themes are loaded lazily by the theme switcher.
+
+    Returns:
+        bool: `True` if `WAGTAIL_BLOCKS_THEME_CSS` setting is `"lazy"`.
+    """
+
+    return getattr(settings, "WAGTAIL_BLOCKS_THEME_CSS", None) == "lazy"
+
+
+def get_rule_theme(rule: css.Rule) -> Optional[str]:
+    """
+    Get the theme a style rule belongs to.
+
+    Args:
+        rule (Rule): CSS rule.
+
+    Returns:
+        str | None: Theme name, if every selector of the rule targets the same theme.
+    """
+
+    if rule.body is None:
+        return None
+
+    names = set()
+    for selector in css.split_selectors(rule.prelude):
+        match = THEME_RE.search(selector)
+        if match is None:
+            return None
+
+        names.add(match.group(1) or match.group(2))
+
+    return names.pop() if len(names) == 1 else None
+
+
+def split_rules(
+    rules: List[css.Rule],
+) -> Tuple[List[css.Rule], Dict[str, List[css.Rule]]]:
+    """
+    Split the rules of a stylesheet into core rules and theme rules.
+
+    Grouping at-rules, e.g. `@layer`, are kept in every part they have rules in.
+
+    Args:
+        rules (list[Rule]): Rules.
+
+    Returns:
+        tuple[list[Rule], dict[str, list[Rule]]]: Core rules and rules by theme.
+    """
+
+    core: List[css.Rule] = []
+    themes: Dict[str, List[css.Rule]] = {}
+
+    for rule in rules:
+        if rule.children is not None:
+            children, children_themes = split_rules(rule.children)
+            if children:
+                core.append(rule._replace(children=children))
+
+            for name, theme_rules in children_themes.items():
+                themes.setdefault(name, []).append(rule._replace(children=theme_rules))
+
+            continue
+
+        name = get_rule_theme(rule)
+        if name is None or name in CORE_THEMES:
+            core.append(rule)
+        else:
+            themes.setdefault(name, []).append(rule)
+
+    return core, themes
+
+
+def get_digest(stylesheet: str) -> str:
+    """
+    Get the content hash of a stylesheet, used in its URL.
+
+    Args:
+        stylesheet (str): Stylesheet.
+
+    Returns:
+        str: Hexadecimal digest.
+    """
+
+    return hashlib.blake2b(stylesheet.encode(), digest_size=8).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def get_split_rules() -> Tuple[List[css.Rule], Dict[str, List[css.Rule]]]:
+    """
+    Split the full stylesheet, once per process.
+
+    Returns:
+        tuple[list[Rule], dict[str, list[Rule]]]: Core rules and rules by theme.
+    """
+
+    return split_rules(css.get_rules())
+
+
+@functools.lru_cache(maxsize=None)
+def get_stylesheets() -> Dict[str, Stylesheet]:
+    """
+    Serialize the core stylesheet and the stylesheet of every theme, once per process.
+
+    Returns:
+        dict[str, Stylesheet]: Stylesheets by theme name, the core one under `""`.
+    """
+
+    core, themes = get_split_rules()
+    stylesheets = {"": css.serialize(core)}
+    stylesheets.update({name: css.serialize(rules) for name, rules in themes.items()})
+
+    return {
+        name: Stylesheet(stylesheet, get_digest(stylesheet))
+        for name, stylesheet in stylesheets.items()
+    }
+
+
+def get_stylesheet_url(name: str = "") -> Optional[str]:
+    """
+    Get the URL of a theme-split stylesheet, which changes with its content.
+
+    Args:
+        name (str): Theme name, empty for the core stylesheet.
+
+    Returns:
+        str | None: Stylesheet URL or `None` if the theme has no rules of its own.
+    """
+
+    stylesheet = get_stylesheets().get(name)
+    if stylesheet is None:
+        return None
+
+    return reverse(
+        "wagtail_blocks_theme_css",
+        kwargs={"name": name or "core", "digest": stylesheet.digest},
+    )
+
+
+def get_theme_urls() -> Dict[str, str]:
+    """
+    Get the stylesheet URL of every theme of the theme switcher.
+
+    Returns:
+        dict[str, str]: Stylesheet URLs by theme name, themes in the core stylesheet excluded.
+    """
+
+    urls = {}
+    for theme in get_themes():
+        url = get_stylesheet_url(theme.name) if theme.name not in CORE_THEMES else None
+        if url:
+            urls[theme.name] = url
+
+    return urls
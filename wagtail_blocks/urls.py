@@ -0,0 +1,13 @@
+"""URL configuration"""
+
+from django.urls import path
+
+from wagtail_blocks import views
+
+urlpatterns = [
+    path(
+        "css/<slug:name>.<slug:digest>.css",
+        views.theme_css,
+        name="wagtail_blocks_theme_css",
+    ),
+]
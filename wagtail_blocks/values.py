@@ -1,14 +1,23 @@
 """Custom `StructValue` classes"""
 
+import hashlib
+import json
 import math
 import random
-from typing import Any, Dict, List, Literal, Optional, override
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, override
 
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils.http import urlencode
-from wagtail.blocks import StructValue
+from wagtail.blocks import Block, StructValue
+
+from wagtail_blocks import highlight
 
 NUMBER_OF_BYTES = 5
 
+# Attribute used to store the names already used while rendering a request
+NAME_REGISTRY_ATTR = "_wagtail_blocks_names"
+
 
 AlertLevel = Literal["info", "success", "warning", "error"]
 AlertIcon = Literal[
@@ -30,6 +39,79 @@ def rand_str(n: int) -> str:
     return random.randbytes(n).hex()
 
 
+def content_hash(block: Block, value: Any) -> str:
+    """
+    Generate a stable hash of a block value.
+
+    The value is converted to its JSON-serializable representation,
+    so two values with the same content always produce the same hash.
+
+    Args:
+        block (Block): The block definition of the value.
+        value (Any): Block value.
+
+    Returns:
+        str: Hex digest of the value.
+    """
+
+    data = json.dumps(
+        block.get_prep_value(value),
+        cls=DjangoJSONEncoder,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+
+    return hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
+
+
+def get_name_registry(context: Optional[Dict[str, Any]]) -> Optional[Dict[str, str]]:
+    """
+    Get the input names already used while rendering the current page.
+
+    The registry is stored on the request, so it is shared by every block
+    rendered in the same request regardless of how the context is copied.
+
+    Args:
+        context (dict | None): Template context.
+
+    Returns:
+        dict[str, str] | None: Names the used names were derived from, by used name,
+        in rendering order, or `None` if there is no request in the context.
+    """
+
+    request = (context or {}).get("request")
+    if request is None:
+        return None
+
+    registry = getattr(request, NAME_REGISTRY_ATTR, None)
+    if registry is None:
+        registry = {}
+        setattr(request, NAME_REGISTRY_ATTR, registry)
+
+    return registry
+
+
+def register_name(registry: Dict[str, str], name: str) -> str:
+    """
+    Register a name, appending a counter if it is already used.
+
+    Args:
+        registry (dict[str, str]): Name registry of the current page.
+        name (str): Name.
+
+    Returns:
+        str: Unique name, e.g. `"accordion-5903ce934b-2"` for the second use.
+    """
+
+    unique_name, counter = name, 1
+    while unique_name in registry:
+        counter += 1
+        unique_name = f"{name}-{counter}"
+
+    registry[unique_name] = name
+    return unique_name
+
+
 class NameMixin:
     """A mixin that provides a `name` property."""
 
@@ -46,6 +128,65 @@ class NameMixin:
 
         return f"{self.prefix}-{rand_str(NUMBER_OF_BYTES)}"
 
+    def get_stable_name(
+        self,
+        value: Dict[str, Any],
+        parent_context: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Deterministic `name` used in input names.
+
+        The name is derived from the block id, the content hash of the value
+        and its position in the stream. Collisions on the same page are
+        resolved by appending a counter, in rendering order.
+
+        Args:
+            value (dict): Block value.
+            parent_context (dict | None): Parent template context.
+
+        Returns:
+            str: Stable name.
+        """
+
+        context = parent_context or {}
+        forloop = context.get("forloop") or {}
+        seed = "|".join(
+            [
+                str(context.get("id") or ""),
+                content_hash(self, value),  # type: ignore
+                str(forloop.get("counter0", "")),
+            ]
+        )
+        digest = hashlib.blake2b(seed.encode(), digest_size=NUMBER_OF_BYTES)
+        name = f"{self.prefix}-{digest.hexdigest()}"
+
+        registry = get_name_registry(context)
+        if registry is None:
+            return name
+
+        return register_name(registry, name)
+
+    def get_input_name(
+        self,
+        value: Dict[str, Any],
+        parent_context: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Get the `name` used in input names based on `WAGTAIL_BLOCKS_INPUT_NAMES` setting.
+
+        Args:
+            value (dict): Block value.
+            parent_context (dict | None): Parent template context.
+
+        Returns:
+            str: `name` used in input names.
+        """
+
+        if getattr(settings, "WAGTAIL_BLOCKS_INPUT_NAMES", "stable") == "random":
+            return self.input_name
+
+        return self.get_stable_name(value, parent_context)
+
     @override
     def get_context(  # type: ignore
         self,
@@ -54,11 +195,109 @@ class NameMixin:
     ) -> Dict[str, Any]:
         return {
             **super().get_context(value, parent_context),  # type: ignore
-            "name": self.input_name,
+            "name": self.get_input_name(value, parent_context),
+        }
+
+
+class computed:
+    """
+    A derived property of a `ComputedValue`, computed once per value.
+
+    Like `cached_property`, the result is stored in the instance `__dict__`,
+    so later accesses are plain attribute lookups and nothing is allocated
+    for fields that are never used. Results are discarded when the value is mutated.
+    Fields declared with `precompute=True` are computed when the value is created,
+    e.g. by `to_python` or `bulk_to_python`, they should be cheap.
+    """
+
+    def __init__(
+        self, func: Optional[Callable[[Any], Any]] = None, *, precompute: bool = False
+    ):
+        self.func = func
+        self.precompute = precompute
+        self.name = func.__name__ if func else ""
+        self.__doc__ = func.__doc__ if func else None
+
+    def __call__(self, func: Callable[[Any], Any]) -> "computed":
+        # Used as `@computed(precompute=True)`
+        return computed(func, precompute=self.precompute)
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if instance is None:
+            return self
+
+        result = instance.__dict__[self.name] = self.func(instance)  # type: ignore
+        return result
+
+
+class ComputedValue(StructValue):
+    """A `StructValue` with `computed` fields, invalidated when the value is mutated."""
+
+    computed_fields: Tuple[str, ...] = ()
+    precomputed_fields: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+
+        fields = {
+            name: attr
+            for klass in reversed(cls.__mro__)
+            for name, attr in vars(klass).items()
+            if isinstance(attr, computed)
         }
+        cls.computed_fields = tuple(fields)
+        cls.precomputed_fields = tuple(
+            name for name, field in fields.items() if field.precompute
+        )
+
+    def __init__(self, block: Block, *args: Any) -> None:
+        super().__init__(block, *args)
+
+        for name in self.precomputed_fields:
+            getattr(self, name)
+
+    def invalidate(self) -> None:
+        """Discard the results of computed fields."""
 
+        for name in self.computed_fields:
+            self.__dict__.pop(name, None)
 
-class AlertValue(StructValue):
+    def __setitem__(self, key: str, value: Any) -> None:
+        super().__setitem__(key, value)
+        self.invalidate()
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self.invalidate()
+
+    def pop(self, *args: Any) -> Any:
+        result = super().pop(*args)
+        self.invalidate()
+        return result
+
+    def popitem(self, last: bool = True) -> Tuple[str, Any]:
+        result = super().popitem(last)
+        self.invalidate()
+        return result
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        result = super().setdefault(key, default)
+        self.invalidate()
+        return result
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        super().update(*args, **kwargs)
+        self.invalidate()
+
+    def clear(self) -> None:
+        super().clear()
+        self.invalidate()
+
+
+class AlertValue(ComputedValue):
     """`StructValue` for `AlertBlock`"""
 
     def get_icon(self, level: Optional[AlertLevel]) -> AlertIcon:
@@ -88,7 +327,7 @@ class AlertValue(StructValue):
             case _:
                 return "question-mark-circle"
 
-    @property
+    @computed(precompute=True)
     def icon(self) -> str:
         """
         Get `AlertBlock` icon.
@@ -100,10 +339,10 @@ class AlertValue(StructValue):
         return self.get_icon(self.get("level"))
 
 
-class CarouselValue(StructValue):
+class CarouselValue(ComputedValue):
     """`StructValue` for `CarouselBlock`"""
 
-    @property
+    @computed(precompute=True)
     def item_count(self) -> int:
         """
         Get the number of items in `CarouselBlock`.
@@ -115,7 +354,22 @@ class CarouselValue(StructValue):
         return len(self.get("items", []))
 
 
-class DocumentValue(StructValue):
+class CodeValue(ComputedValue):
+    """`StructValue` for `CodeBlock`"""
+
+    @computed
+    def highlighted(self) -> Optional[highlight.Highlighted]:
+        """
+        Get server-side highlighted code.
+
+        Returns:
+            Highlighted | None: Highlighted code or `None` if highlighting is disabled.
+        """
+
+        return highlight.highlight(self.get("language"), self.get("code") or "")
+
+
+class DocumentValue(ComputedValue):
     """`StructValue` for `DocumentBlock`"""
 
     def get_doc_size(self, size_bytes: int) -> str:
@@ -154,7 +408,7 @@ class DocumentValue(StructValue):
 
         return f"{scaled_size} {unit_label}"
 
-    @property
+    @computed
     def doc_size(self) -> str:
         """
         Calculate and return the size of document in a human-readable format.
@@ -164,16 +418,28 @@ class DocumentValue(StructValue):
         """
 
         doc = self.get("document")
-        return self.get_doc_size(doc.file_size if doc else 0)
+        return self.get_doc_size((doc.get_file_size() if doc else None) or 0)
+
+    @computed
+    def file_extension(self) -> str:
+        """
+        Get the extension of the document, in upper case.
+
+        Returns:
+            str: Document extension, e.g. "PDF".
+        """
+
+        doc = self.get("document")
+        return doc.file_extension.upper() if doc else ""
 
 
-class AttributeValue(StructValue):
+class AttributeValue(ComputedValue):
     """Add an `self.attributes` to Value class"""
 
     prefix: str = ""
     exclude: List[str] = ["self"]
 
-    @property
+    @computed
     def attributes(self) -> str:
         """
         Get HTML attributes the embed.
@@ -201,12 +467,12 @@ class ExpoSnackValue(AttributeValue):
     prefix = "snack-"
 
 
-class StackBlitzValue(StructValue):
+class StackBlitzValue(ComputedValue):
     """`StructValue` for `StackBlitzBlock`"""
 
     exclude = ["self", "title", "url"]
 
-    @property
+    @computed
     def params(self) -> str:
         """
         Get URL parameters.
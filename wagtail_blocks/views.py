@@ -0,0 +1,40 @@
+"""Views"""
+
+from django.http import Http404, HttpRequest, HttpResponse, HttpResponseRedirect
+from django.utils.cache import patch_cache_control
+
+from wagtail_blocks import themes
+
+# One year, stylesheet URLs change with their content
+MAX_AGE = 60 * 60 * 24 * 365
+
+
+def theme_css(request: HttpRequest, name: str, digest: str) -> HttpResponse:
+    """
+    Serve the core stylesheet or the stylesheet of a theme.
+
+    Responses are cached for a year, since the URL contains a hash of the content.
+    Outdated URLs are redirected to the current one.
+
+    Args:
+        request (HttpRequest): Current request.
+        name (str): Theme name, `core` for the core stylesheet.
+        digest (str): Content hash.
+
+    Returns:
+        HttpResponse: Stylesheet.
+    """
+
+    key = "" if name == "core" else name
+    stylesheet = themes.get_stylesheets().get(key)
+
+    if stylesheet is None:
+        raise Http404
+
+    if digest != stylesheet.digest:
+        return HttpResponseRedirect(themes.get_stylesheet_url(key))
+
+    response = HttpResponse(stylesheet.css, content_type="text/css; charset=utf-8")
+    patch_cache_control(response, public=True, max_age=MAX_AGE, immutable=True)
+
+    return response